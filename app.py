@@ -3,37 +3,203 @@ AI-Powered Document Extraction Web Application
 Simple web interface - Always uses AI for intelligent extraction
 """
 
-from flask import Flask, render_template, request, send_file, jsonify
+from flask import Flask, render_template, request, send_file, jsonify, Response, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from werkzeug.utils import secure_filename
 import os
 from dotenv import load_dotenv
 from extract_data_ai import AIDocumentExtractor
+from extract_data_enhanced import EnhancedDocumentExtractor
+from hybrid_extract import merge_entries
+from engine_race import race_engines, DEADLINE, AI_FAILED
+from llm_cache import cache_from_env
+from chunk_store import ChunkStore
+from groq_client import get_shared_client
+from job_queue import JobStore, JobQueue, TERMINAL_EVENTS, PARTIAL_EVENT
+from result_store import ResultStore
+from entry_store import EntryStore
+from entries import category_counts, json_default
+from excel_export import write_entries_xlsx, entry_rows
+from metrics import METRICS, timed
+from demo_cache import DemoResultCache
+from hashing import file_sha256
 import tempfile
-from datetime import datetime
+import json
+import time
+import uuid
+import threading
+from io import BytesIO
 
 # Load environment variables
 load_dotenv()
 
+
+class EntryJSONProvider(DefaultJSONProvider):
+    """jsonify() also accepts Entry / EntryBatch results"""
+
+    @staticmethod
+    def default(o):
+        try:
+            return json_default(o)
+        except TypeError:
+            return DefaultJSONProvider.default(o)
+
+
 app = Flask(__name__)
+app.json = EntryJSONProvider(app)
 app.secret_key = 'ai-document-extraction-secret-key-2024'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 app.config['UPLOAD_FOLDER'] = tempfile.gettempdir()
 
 ALLOWED_EXTENSIONS = {'pdf'}
 
+# Process-wide Groq response cache so repeated uploads of the same document cost no API calls
+llm_cache = cache_from_env(os.path.join(tempfile.gettempdir(), 'groq_response_cache.sqlite3'))
+
+# Per-chunk results, so a re-uploaded revision only sends its changed chunks to Groq
+chunk_store = ChunkStore(
+    os.getenv('CHUNK_STORE_PATH') or os.path.join(tempfile.gettempdir(), 'extraction_chunks.sqlite3'),
+    ttl_seconds=float(os.getenv('CHUNK_STORE_TTL_SECONDS', str(30 * 24 * 3600)))
+)
+
+# Extraction runs in background jobs; state lives in SQLite so any worker can answer /jobs/<id>
+job_store = JobStore(os.getenv('JOB_DB_PATH') or os.path.join(tempfile.gettempdir(), 'extraction_jobs.sqlite3'),
+                     ttl_seconds=float(os.getenv('JOB_TTL_SECONDS', str(24 * 3600))))
+job_queue = JobQueue(job_store, workers=int(os.getenv('JOB_WORKERS', '2')))
+
+# Finished workbooks are built in memory and kept here (bounded, with TTL) instead of loose files in /tmp
+result_store = ResultStore(
+    os.getenv('RESULT_DB_PATH') or os.path.join(tempfile.gettempdir(), 'extraction_results.sqlite3'),
+    max_bytes=int(os.getenv('RESULT_STORE_MAX_BYTES', str(256 * 1024 * 1024))),
+    ttl_seconds=float(os.getenv('RESULT_TTL_SECONDS', '3600'))
+)
+
+# Every extraction's entries, kept and full-text indexed for /api/documents, /api/entries and /api/search
+entry_store = EntryStore(
+    os.getenv('ENTRY_DB_PATH') or os.path.join(tempfile.gettempdir(), 'extracted_entries.sqlite3')
+)
+
+# Upload engines: 'ai' waits for the full Groq pipeline; 'race' answers with the rule engine first
+ENGINES = ('ai', 'race')
+UPLOAD_ENGINE = os.getenv('UPLOAD_ENGINE', 'ai')
+RACE_DEADLINE_SECONDS = float(os.getenv('RACE_DEADLINE_SECONDS', '20'))
+
+# Identical uploads share one job; a queued/running job older than this is assumed lost with its worker
+JOB_COALESCE_SECONDS = float(os.getenv('JOB_COALESCE_SECONDS', '1800'))
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+def result_available(result):
+    """A finished job can be shared while its workbook is still in the result store"""
+    # A race the AI lost is not shared: the next upload races again against a now-warm cache
+    if not result or result.get('race_outcome') in (DEADLINE, AI_FAILED):
+        return False
+    return result_store.exists(result['download_url'].rsplit('/', 1)[-1])
+
+
 @app.route('/')
 def index():
     """Main page with upload form"""
     return render_template('index.html')
 
 
+def save_workbook(data):
+    """Build the workbook in memory, keep it in the result store and return its download URL"""
+    buffer = BytesIO()
+    write_entries_xlsx(entry_rows(data), buffer)
+    result_id = result_store.put(buffer.getvalue())
+    print(f"  ✓ Excel created: {result_id} ({buffer.tell()} bytes)")
+    return f'/download/{result_id}'
+
+
+def process_upload(input_path, filename, api_key, content_key=None, engine='ai', deadline=None, progress=None):
+    """Run the extraction for one uploaded PDF (executed by a background job)"""
+    try:
+        print(f"\n🔄 Processing {filename}...")
+        
+        # A raced AI run that misses its deadline keeps going; its events must not reach the finished job
+        settled = threading.Event()
+        def ai_progress(event, data):
+            if progress and not settled.is_set():
+                progress(event, data)
+        
+        # Process with AI; stage events feed the job's progress stream
+        extractor = AIDocumentExtractor(input_path, cache=llm_cache, progress_callback=ai_progress,
+                                        client=get_shared_client(api_key), chunk_store=chunk_store)
+        
+        # Extract text
+        print("  📄 Extracting text from PDF...")
+        text = extractor.extract_text_from_pdf()
+        print(f"  ✓ Extracted {len(text)} characters")
+        
+        outcome = None
+        if engine == 'race':
+            # Rules answer in milliseconds and are published as a provisional result; the AI result upgrades it
+            print(f"  🏁 Racing rules against AI (deadline {deadline:.0f}s)...")
+            rules = EnhancedDocumentExtractor(input_path)
+            rules.raw_text = text
+            
+            def publish(entries):
+                if progress:
+                    progress(PARTIAL_EVENT, {
+                        'success': True,
+                        'provisional': True,
+                        'engine': 'regex',
+                        'total_entries': len(entries),
+                        'categories': category_counts(entries),
+                        'download_url': save_workbook(entries)
+                    })
+            
+            data, outcome = race_engines(rules.identify_key_value_pairs, extractor.analyze_document_with_ai,
+                                         deadline, merge_entries, publish)
+            settled.set()
+            print(f"  ✓ Race outcome: {outcome}, {len(data)} entries")
+        else:
+            # AI Analysis
+            print("  🤖 AI analyzing document...")
+            data = extractor.analyze_document_with_ai()
+            print(f"  ✓ AI extracted {len(data)} entries")
+        
+        if not data or len(data) == 0:
+            raise ValueError('No data extracted. Please check your PDF content.')
+        
+        # Export to Excel
+        print("  📊 Creating Excel file...")
+        download_url = save_workbook(data)
+        if progress:
+            progress('excel_written', {'rows': len(data)})
+        METRICS.inc('extracted_entries_total', len(data))
+        document_id = entry_store.add_document(
+            filename, data, engine=engine, content_sha256=content_key, doc_type=extractor.doc_type,
+            metadata={'model': extractor.MODEL, 'characters': len(text), 'chunks': extractor.chunk_report,
+                      'race_outcome': outcome}
+        )
+        
+        result = {
+            'success': True,
+            'engine': engine,
+            'total_entries': len(data),
+            'categories': category_counts(data),
+            'chunks_total': extractor.chunk_report['total'],
+            'chunks_reused': extractor.chunk_report['reused'],
+            'document_id': document_id,
+            'download_url': download_url
+        }
+        if outcome:
+            result['race_outcome'] = outcome
+        return result
+    
+    finally:
+        # Clean up input file
+        if os.path.exists(input_path):
+            os.remove(input_path)
+
+
 @app.route('/upload', methods=['POST'])
 def upload_file():
-    """Handle PDF upload and process with AI extraction"""
+    """Accept a PDF upload and queue it for AI extraction"""
     if 'file' not in request.files:
         return jsonify({'error': 'No file part'}), 400
     
@@ -43,79 +209,187 @@ def upload_file():
         return jsonify({'error': 'No selected file'}), 400
     
     if file and allowed_file(file.filename):
-        # Save uploaded file
-        filename = secure_filename(file.filename)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        input_path = os.path.join(app.config['UPLOAD_FOLDER'], f'input_{timestamp}_{filename}')
-        output_path = os.path.join(app.config['UPLOAD_FOLDER'], f'output_{timestamp}.xlsx')
+        # 'race' publishes the rule result at once and upgrades it with the AI result until the deadline
+        engine = request.form.get('engine') or UPLOAD_ENGINE
+        if engine not in ENGINES:
+            return jsonify({'error': f"Unknown engine '{engine}'; expected one of {', '.join(ENGINES)}"}), 400
+        try:
+            deadline = min(max(float(request.form.get('deadline') or RACE_DEADLINE_SECONDS), 0.0), 600.0)
+        except ValueError:
+            return jsonify({'error': 'deadline must be a number of seconds'}), 400
         
-        file.save(input_path)
+        # Get API key
+        api_key = os.getenv('GROQ_API_KEY')
+        if not api_key or api_key.strip() == '':
+            return jsonify({'error': 'API key not configured. Please set GROQ_API_KEY in .env file'}), 500
         
-        try:
-            # Get API key
-            api_key = os.getenv('GROQ_API_KEY')
-            if not api_key or api_key.strip() == '':
-                return jsonify({'error': 'API key not configured. Please set GROQ_API_KEY in .env file'}), 500
-            
-            print(f"\n🔄 Processing {filename}...")
-            
-            # Process with AI
-            extractor = AIDocumentExtractor(input_path, groq_api_key=api_key)
-            
-            # Extract text
-            print("  📄 Extracting text from PDF...")
-            text = extractor.extract_text_from_pdf()
-            print(f"  ✓ Extracted {len(text)} characters")
-            
-            # AI Analysis
-            print("  🤖 AI analyzing document...")
-            data = extractor.analyze_document_with_ai()
-            print(f"  ✓ AI extracted {len(data)} entries")
-            
-            if not data or len(data) == 0:
-                return jsonify({'error': 'No data extracted. Please check your PDF content.'}), 500
-            
-            # Export to Excel
-            print("  📊 Creating Excel file...")
-            extractor.export_to_excel(output_path)
-            print(f"  ✓ Excel created: {output_path}")
-            
-            # Get statistics
-            categories = {}
-            for entry in data:
-                cat = entry.get('Category', 'Uncategorized')
-                categories[cat] = categories.get(cat, 0) + 1
-            
-            return jsonify({
-                'success': True,
-                'total_entries': len(data),
-                'categories': categories,
-                'download_url': f'/download/{os.path.basename(output_path)}'
-            })
+        # Save uploaded file
+        filename = secure_filename(file.filename)
+        input_path = os.path.join(app.config['UPLOAD_FOLDER'], f'input_{uuid.uuid4().hex}_{filename}')
         
-        except Exception as e:
-            print(f"  ❌ Error: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({'error': f'Extraction failed: {str(e)}'}), 500
+        with timed('upload_save'):
+            file.save(input_path)
+            content_key = file_sha256(input_path)
         
-        finally:
-            # Clean up input file
-            if os.path.exists(input_path):
-                os.remove(input_path)
+        # Same bytes and engine settings as a queued, running or recently finished job: share it instead of
+        # extracting again. Races with another deadline would publish at other times, so they are not shared
+        coalesce_key = content_key if engine == 'ai' else f'{content_key}:{engine}:{deadline:g}'
+        job_id, shared = job_queue.submit_coalesced(
+            coalesce_key, filename, process_upload, input_path, filename, api_key, content_key, engine, deadline,
+            inflight_seconds=JOB_COALESCE_SECONDS, reusable=result_available
+        )
+        if shared:
+            os.remove(input_path)
+            METRICS.inc('uploads_coalesced_total', job=shared)
+            print(f"  ♻️  {filename} matches job {job_id} ({shared}), sharing its extraction")
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'status': 'done' if shared == 'done' else 'queued',
+            'coalesced': bool(shared),
+            'status_url': f'/jobs/{job_id}',
+            'events_url': f'/jobs/{job_id}/events'
+        }), 202
     
     return jsonify({'error': 'Invalid file type. Only PDF files are allowed.'}), 400
 
 
-@app.route('/download/<filename>')
-def download_file(filename):
-    """Download the generated Excel file"""
-    file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-    if os.path.exists(file_path):
-        return send_file(file_path, as_attachment=True, download_name='Extracted_Data.xlsx')
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Report the state of a queued extraction job, with the results once it is done"""
+    job = job_store.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    response = {
+        'job_id': job['id'],
+        'status': job['status'],
+        'filename': job['filename']
+    }
+    if job['status'] == 'done':
+        response.update(job['result'])
+    elif job['status'] == 'running' and job['result']:
+        # Provisional (raced) result, replaced when the job finishes
+        response.update(job['result'])
+    elif job['status'] == 'failed':
+        response['success'] = False
+        response['error'] = f"Extraction failed: {job['error']}"
+    return jsonify(response)
+
+
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    """Server-sent event stream of a job's real progress, ending with a done or failed event"""
+    if job_store.get(job_id) is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    # EventSource resends the last id it saw when it reconnects
+    last_id = request.headers.get('Last-Event-ID') or request.args.get('after') or 0
+    try:
+        last_id = int(last_id)
+    except ValueError:
+        last_id = 0
+    
+    def stream():
+        after = last_id
+        last_sent = time.time()
+        while True:
+            for event in job_store.events_since(job_id, after):
+                after = event['id']
+                last_sent = time.time()
+                yield f"id: {event['id']}\nevent: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+                if event['event'] in TERMINAL_EVENTS:
+                    return
+            
+            # Comment line keeps proxies from closing an idle stream
+            if time.time() - last_sent > 15:
+                last_sent = time.time()
+                yield ": keep-alive\n\n"
+            time.sleep(0.25)
+    
+    return Response(stream_with_context(stream()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@app.route('/download/<result_id>')
+def download_file(result_id):
+    """Download a generated Excel file from the result store"""
+    data = result_store.get(result_id)
+    if data is not None:
+        return send_file(BytesIO(data), as_attachment=True, download_name='Extracted_Data.xlsx',
+                         mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
     return jsonify({'error': 'File not found'}), 404
 
 
+def _int_arg(name, default, maximum=None):
+    try:
+        value = max(0, int(request.args.get(name, default)))
+    except ValueError:
+        value = default
+    return min(value, maximum) if maximum else value
+
+
+@app.route('/api/documents')
+def list_documents():
+    """Stored documents, newest first (?name=, ?limit=, ?offset=)"""
+    documents = entry_store.list_documents(_int_arg('limit', 50, 500), _int_arg('offset', 0),
+                                           name=request.args.get('name'))
+    return jsonify({'documents': documents})
+
+
+@app.route('/api/documents/<int:document_id>')
+def get_document(document_id):
+    """One stored document with its entries"""
+    document = entry_store.get_document(document_id)
+    if document is None:
+        return jsonify({'error': 'Document not found'}), 404
+    return jsonify(document)
+
+
+@app.route('/api/entries')
+def find_entries():
+    """Exact, case-insensitive lookup across documents (?key=, ?value=, ?category=)"""
+    filters = {name: request.args.get(name) for name in ('key', 'value', 'category')}
+    if not any(filters.values()):
+        return jsonify({'error': 'Give at least one of key, value, category'}), 400
+    entries = entry_store.find_entries(limit=_int_arg('limit', 100, 1000), offset=_int_arg('offset', 0), **filters)
+    return jsonify({'entries': entries})
+
+
+@app.route('/api/search')
+def search_entries():
+    """Full-text search over every stored entry (?q=), best matches first"""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'Missing q parameter'}), 400
+    return jsonify({'entries': entry_store.search(query, limit=_int_arg('limit', 50, 1000))})
+
+
+@app.route('/metrics')
+def metrics():
+    """Per-stage latency histograms and pipeline counters in Prometheus text format"""
+    return Response(METRICS.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+
+def extract_demo(pdf_path):
+    """Full AI extraction of the demo document (runs on the demo cache's background thread)"""
+    extractor = AIDocumentExtractor(pdf_path, cache=llm_cache, client=get_shared_client(os.getenv('GROQ_API_KEY')))
+    extractor.extract_text_from_pdf()
+    return extractor.analyze_document_with_ai()
+
+
+# The demo is extracted once per (file hash, model), not per page view
+demo_cache = DemoResultCache(
+    os.getenv('DEMO_PDF_PATH', 'Data Input.pdf'),
+    os.getenv('DEMO_CACHE_DIR') or os.path.join(tempfile.gettempdir(), 'demo_results'),
+    AIDocumentExtractor.MODEL,
+    extract_demo
+)
+# Every gunicorn worker starts a refresh; a file lock in the cache directory lets only the first one extract
+if os.getenv('GROQ_API_KEY') and os.getenv('DEMO_PRECOMPUTE', '1') != '0':
+    demo_cache.refresh()
+
+
 @app.route('/demo')
 def demo():
     """Demo page with sample data"""
@@ -124,9 +398,13 @@ def demo():
         if not api_key:
             return "Demo requires API key. Please set GROQ_API_KEY in .env file", 500
         
-        extractor = AIDocumentExtractor("Data Input.pdf", groq_api_key=api_key)
-        text = extractor.extract_text_from_pdf()
-        data = extractor.analyze_document_with_ai()
+        # Only the very first view waits for the extraction; later views render the cached result
+        result = demo_cache.get(wait=float(os.getenv('DEMO_WAIT_SECONDS', '60')))
+        if result is None:
+            if demo_cache.error:
+                return f"Error loading demo: {demo_cache.error}", 500
+            return "Demo is being prepared, please refresh in a moment", 503, {'Retry-After': '10'}
+        data = result['entries']
         
         categories = {}
         for entry in data:
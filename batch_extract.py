@@ -0,0 +1,300 @@
+"""
+Batch Document Extraction
+Non-interactive entry point for extracting whole directories of PDFs with a worker pool
+
+Usage:
+    python batch_extract.py "contracts/**/*.pdf" scans/ --jobs 8 --engine regex --output-dir out/
+    python batch_extract.py inbox/ --engine ai --merged merged.xlsx --checkpoint nightly.ckpt
+    python batch_extract.py inbox/ --output-dir out/ --metrics-json stages.json
+    python batch_extract.py inbox/ --engine ai --store entries.sqlite3
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Any, Iterable
+from dotenv import load_dotenv
+
+from hashing import file_sha256
+from entries import EntryBatch, json_default
+from entry_store import EntryStore
+from excel_export import HEADERS, entry_rows, write_entries_xlsx
+from metrics import METRICS
+from pdf_text import count_pdf_pages
+
+
+def collect_pdfs(inputs: Iterable[str]) -> List[str]:
+    """Expand files, directories (recursively) and glob patterns into a sorted list of PDF paths"""
+    found = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = glob.glob(os.path.join(item, '**', '*.pdf'), recursive=True)
+            matches += glob.glob(os.path.join(item, '**', '*.PDF'), recursive=True)
+        elif os.path.isfile(item):
+            matches = [item]
+        else:
+            matches = glob.glob(item, recursive=True)
+        found.update(os.path.abspath(path) for path in matches if path.lower().endswith('.pdf'))
+    return sorted(found)
+
+
+def document_fingerprint(path: str, engine: str, output_path: str = None) -> str:
+    """Identity of a document run for checkpointing: path, size, modification time, engine and workbook path"""
+    stat = os.stat(path)
+    return f"{path}|{stat.st_size}|{int(stat.st_mtime)}|{engine}|{output_path or ''}"
+
+
+def output_names(paths: List[str]) -> Dict[str, str]:
+    """Per-document workbook names; stems shared by several inputs get a short path hash"""
+    stems = {}
+    for path in paths:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        stems.setdefault(stem, []).append(path)
+
+    names = {}
+    for stem, group in stems.items():
+        for path in group:
+            if len(group) == 1:
+                names[path] = f"{stem}.xlsx"
+            else:
+                digest = hashlib.sha1(path.encode('utf-8')).hexdigest()[:8]
+                names[path] = f"{stem}_{digest}.xlsx"
+    return names
+
+
+class Checkpoint:
+    """Append-only JSON-lines record of finished documents, so a restarted run skips them"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done = {}
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A crash mid-write leaves a truncated last line; that document is simply redone
+                        continue
+                    self.done[record['fingerprint']] = record
+
+    def is_done(self, fingerprint: str, need_entries: bool = False) -> bool:
+        """Checkpoints written before entries were always kept cannot feed a merged workbook"""
+        record = self.done.get(fingerprint)
+        return record is not None and (not need_entries or 'entries' in record)
+
+    def record(self, record: Dict[str, Any]):
+        self.done[record['fingerprint']] = record
+        if not self.path:
+            return
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write(json.dumps(record, ensure_ascii=False, default=json_default) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+
+def _init_worker():
+    """Documents are already spread across processes; keep page extraction in-process"""
+    os.environ["PDF_EXTRACT_WORKERS"] = "1"
+    load_dotenv()
+
+
+def process_document(path: str, engine: str, output_path: str = None) -> Dict[str, Any]:
+    """Worker: extract one PDF and optionally write its workbook"""
+    # Workers are reused across documents; each result carries only its own document's metrics
+    METRICS.reset()
+    start = time.perf_counter()
+    pages = count_pdf_pages(path)
+
+    if engine == 'ai':
+        from extract_data_ai import AIDocumentExtractor
+        extractor = AIDocumentExtractor(path)
+        extractor.extract_text_from_pdf()
+        data = extractor.analyze_document_with_ai()
+    elif engine == 'hybrid':
+        from hybrid_extract import HybridDocumentExtractor
+        extractor = HybridDocumentExtractor(path)
+        extractor.extract_text_from_pdf()
+        data = extractor.analyze_document()
+    else:
+        from extract_data_enhanced import EnhancedDocumentExtractor
+        extractor = EnhancedDocumentExtractor(path)
+        extractor.extract_text_from_pdf()
+        data = extractor.identify_key_value_pairs()
+
+    if output_path:
+        extractor.export_to_excel(output_path)
+
+    return {
+        'path': path,
+        'pages': pages,
+        'sha256': file_sha256(path),
+        'doc_type': getattr(extractor, 'doc_type', None),
+        # Columnar: far smaller to pickle back to the parent and to hold for the merged workbook
+        'entries': EntryBatch(data),
+        'output': output_path,
+        'seconds': time.perf_counter() - start,
+        'metrics': METRICS.snapshot()
+    }
+
+
+def write_merged_workbook(records: Iterable[Dict[str, Any]], output_path: str) -> int:
+    """Stream every document's entries into one sheet with a leading Document column"""
+    def rows():
+        for record in records:
+            document = os.path.basename(record['path'])
+            for row in entry_rows(record['entries']):
+                yield [document] + row
+
+    return write_entries_xlsx(rows(), output_path, headers=['Document'] + HEADERS,
+                              widths=(30, 22, 40, 35, 70))
+
+
+def _store_document(store: EntryStore, engine: str, record: Dict[str, Any]):
+    """Write a finished document to the entry store under its full path, so copies elsewhere stay apart"""
+    store.add_document(record['path'], record['entries'], engine=engine, content_sha256=record['sha256'],
+                       doc_type=record.get('doc_type'),
+                       metadata={'path': record['path'], 'pages': record['pages'], 'seconds': record['seconds']})
+
+
+def run_batch(paths: List[str], engine: str, jobs: int, output_dir: str = None,
+              merged_path: str = None, checkpoint_path: str = None, metrics_path: str = None,
+              store_path: str = None) -> int:
+    """Process documents in a pool; returns the number of failed documents"""
+    checkpoint = Checkpoint(checkpoint_path)
+    # Written from this process only, so workers never contend for the SQLite write lock
+    store = EntryStore(store_path) if store_path else None
+    names = output_names(paths)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    todo = []
+    fingerprints = {}
+    for path in paths:
+        output_path = os.path.join(output_dir, names[path]) if output_dir else None
+        fingerprints[path] = document_fingerprint(path, engine, output_path)
+        if not checkpoint.is_done(fingerprints[path], need_entries=bool(merged_path or store)):
+            todo.append((path, output_path))
+
+    skipped = len(paths) - len(todo)
+    print(f"📂 {len(paths)} documents found, {skipped} already done, {len(todo)} to process")
+
+    # --store added on a resumed run: documents finished earlier are filled in from the checkpoint
+    if store is not None and skipped:
+        backfilled = 0
+        pending = {path for path, _ in todo}
+        for path in paths:
+            if path in pending:
+                continue
+            record = checkpoint.done[fingerprints[path]]
+            sha256 = record.get('sha256') or file_sha256(path)
+            if not store.has_document(path, sha256, engine):
+                _store_document(store, engine, dict(record, sha256=sha256))
+                backfilled += 1
+        if backfilled:
+            print(f"✓ Entry store: added {backfilled} documents from the checkpoint")
+    print(f"⚙️  Engine: {engine}, jobs: {jobs}")
+
+    failures = 0
+    done_docs = 0
+    done_pages = 0
+    started = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as executor:
+        futures = {}
+        for path, output_path in todo:
+            futures[executor.submit(process_document, path, engine, output_path)] = path
+
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                failures += 1
+                print(f"  ❌ {os.path.basename(path)}: {e}")
+                continue
+            METRICS.merge(result['metrics'])
+            # Entries are always kept: a run resumed with --merged or --store rebuilds them from the checkpoint
+            record = {
+                'fingerprint': fingerprints[path],
+                'path': path,
+                'pages': result['pages'],
+                'entry_count': len(result['entries']),
+                'output': result['output'],
+                'seconds': round(result['seconds'], 3),
+                'sha256': result['sha256'],
+                'doc_type': result['doc_type'],
+                'entries': result['entries']
+            }
+            if store is not None:
+                _store_document(store, engine, record)
+            checkpoint.record(record)
+
+            done_docs += 1
+            done_pages += result['pages']
+            elapsed = max(time.perf_counter() - started, 1e-9)
+            print(f"  [{done_docs + failures}/{len(todo)}] {os.path.basename(path)}: "
+                  f"{len(result['entries'])} entries, {result['pages']} pages | "
+                  f"{done_docs / elapsed:.2f} docs/s, {done_pages / elapsed:.1f} pages/s")
+
+    elapsed = time.perf_counter() - started
+    print(f"\n✓ Processed {done_docs} documents ({done_pages} pages) in {elapsed:.1f}s")
+    if failures:
+        print(f"⚠️  {failures} documents failed and will be retried on the next run")
+
+    if merged_path:
+        records = [checkpoint.done[fingerprints[path]] for path in paths
+                   if checkpoint.is_done(fingerprints[path], need_entries=True)]
+        rows = write_merged_workbook(records, merged_path)
+        print(f"✓ Merged workbook: {merged_path} ({rows} rows from {len(records)} documents)")
+
+    if store is not None:
+        stats = store.stats()
+        print(f"✓ Entry store: {store_path} ({stats['documents']} documents, {stats['entries']} entries)")
+
+    if metrics_path:
+        with open(metrics_path, 'w', encoding='utf-8') as file:
+            json.dump(METRICS.summary(), file, indent=2)
+        print(f"✓ Stage timings: {metrics_path}")
+
+    return failures
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Extract structured data from many PDFs in parallel")
+    parser.add_argument('inputs', nargs='+', help="PDF files, directories or glob patterns")
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument('--engine', choices=['regex', 'ai', 'hybrid'], default='regex')
+    parser.add_argument('--output-dir', help="write one workbook per document into this directory")
+    parser.add_argument('--merged', help="write all entries into a single workbook")
+    parser.add_argument('--checkpoint', help="resumable progress file (JSON lines)")
+    parser.add_argument('--metrics-json', help="write per-stage timing summary (count, mean, p50, p95) here")
+    parser.add_argument('--store', help="also write every document's entries into this SQLite entry store")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    if not args.output_dir and not args.merged and not args.store:
+        parser.error("choose --output-dir, --merged and/or --store")
+    if args.engine in ('ai', 'hybrid') and not os.getenv("GROQ_API_KEY"):
+        parser.error(f"--engine {args.engine} requires GROQ_API_KEY")
+
+    paths = collect_pdfs(args.inputs)
+    if not paths:
+        print("❌ No PDF files matched")
+        return 1
+
+    failures = run_batch(paths, args.engine, max(1, args.jobs), args.output_dir,
+                         args.merged, args.checkpoint, args.metrics_json, args.store)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
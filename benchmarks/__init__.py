@@ -0,0 +1,4 @@
+"""
+Performance benchmarks for the document extraction pipeline
+Run individual scripts from the repository root, e.g. `python -m benchmarks.bench_pdf_extraction`
+"""
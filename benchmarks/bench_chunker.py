@@ -0,0 +1,115 @@
+"""
+Benchmark: legacy '. '-splitting chunker vs the token-aware TokenChunker on 1 MB+ texts
+Usage: python -m benchmarks.bench_chunker [--megabytes 1 4] [--budget 1500]
+Chunk count is the number of extraction API calls a document costs.
+"""
+
+import random
+import argparse
+
+from chunking import TokenChunker, estimate_tokens
+from pdf_text import extract_pdf_text
+from benchmarks.bench_pdf_extraction import time_call
+
+
+def legacy_split(text: str, max_length: int = 6000):
+    """The character-based splitter AIDocumentExtractor used before chunking.py"""
+    if len(text) <= max_length:
+        return [text]
+
+    chunks = []
+    sentences = text.split('. ')
+    current_chunk = ""
+
+    for sentence in sentences:
+        if len(current_chunk) + len(sentence) < max_length:
+            current_chunk += sentence + ". "
+        else:
+            if current_chunk:
+                chunks.append(current_chunk.strip())
+            current_chunk = sentence + ". "
+
+    if current_chunk:
+        chunks.append(current_chunk.strip())
+
+    return chunks
+
+
+def synthetic_report(size: int, seed: int = 7) -> str:
+    """Sectioned prose: headings, paragraphs of varied sentences, occasional tables without full stops"""
+    rng = random.Random(seed)
+    words = ("revenue contract clause employee invoice amount quarterly analysis department policy "
+             "agreement payment schedule delivery obligation termination renewal liability").split()
+    parts = []
+    total = 0
+    section = 0
+    while total < size:
+        section += 1
+        parts.append(f"Section {section} Overview  \n")
+        for _ in range(rng.randint(2, 6)):
+            sentences = []
+            for _ in range(rng.randint(3, 9)):
+                sentence = " ".join(rng.choice(words) for _ in range(rng.randint(6, 28)))
+                sentences.append(sentence.capitalize() + rng.choice(['.', '.', '.', ';', '?']))
+            parts.append(" ".join(sentences) + "  \n \n")
+        if section % 4 == 0:
+            rows = [f"{rng.choice(words)} | {rng.randint(1, 99999)} | {rng.choice(words)}" for _ in range(60)]
+            parts.append("  \n".join(rows) + "  \n \n")
+        total = sum(len(part) for part in parts)
+    return "".join(parts)
+
+
+def describe(chunks, budget: int):
+    tokens = [estimate_tokens(chunk) for chunk in chunks]
+    return {
+        'calls': len(chunks),
+        'max_tokens': max(tokens),
+        'over_budget': sum(1 for count in tokens if count > budget),
+        'fill': sum(min(count, budget) for count in tokens) / (budget * len(chunks))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--megabytes', type=float, nargs='+', default=[1, 4])
+    parser.add_argument('--budget', type=int, default=1500, help="token budget per chunk")
+    parser.add_argument('--max-length', type=int, default=6000, help="legacy character limit per chunk")
+    parser.add_argument('--source', default='Data Input.pdf')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    resume = extract_pdf_text(args.source)
+    chunker = TokenChunker(args.budget)
+
+    print(f"{'text':>12} {'MB':>5} {'method':>7} {'calls':>6} {'max tok':>8} {'over':>5} "
+          f"{'fill':>6} {'time (s)':>9}")
+    for megabytes in args.megabytes:
+        size = int(megabytes * 1024 * 1024)
+        texts = {
+            'pdf-resume': (resume * (size // len(resume) + 1))[:size],
+            'report': synthetic_report(size),
+            # Tables and lists rarely contain '. ', which the legacy splitter depends on
+            'line-items': "".join(f"Item {i} | SKU-{i:06d} | qty {i % 40} | USD {i * 7 % 9999}  \n"
+                                  for i in range(size // 40))[:size]
+        }
+        for name, text in texts.items():
+            results = {}
+            for method, fn in (('legacy', lambda: legacy_split(text, args.max_length)),
+                               ('token', lambda: chunker.split(text))):
+                seconds = time_call(fn, args.repeat)
+                stats = describe(fn(), args.budget)
+                results[method] = stats
+                print(f"{name:>12} {megabytes:>5g} {method:>7} {stats['calls']:>6} {stats['max_tokens']:>8} "
+                      f"{stats['over_budget']:>5} {stats['fill']:>6.1%} {seconds:>9.3f}")
+            saved = results['legacy']['calls'] - results['token']['calls']
+            if results['legacy']['over_budget']:
+                # Fewer legacy calls here only means chunks too large for the model to accept
+                print(f"{'':>12} {'':>5} {'':>7} legacy chunks overflow the budget "
+                      f"({results['legacy']['over_budget']} -> {results['token']['over_budget']})")
+            else:
+                print(f"{'':>12} {'':>5} {'saved':>7} {saved:>6} calls "
+                      f"({saved / results['legacy']['calls']:.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark: a fresh Groq client per request vs the shared pooled client
+Usage: python -m benchmarks.bench_client_pool [--requests 200] [--threads 8] [--latency 0.02]
+Requests go to a local mock_groq_server, which counts the TCP connections it accepts.
+"""
+
+import time
+import argparse
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+from groq import Groq
+
+from groq_client import build_client
+from mock_groq_server import MockGroqServer, start_mock_server
+
+
+def _complete(client: Groq):
+    client.chat.completions.create(
+        model="llama-3.3-70b-versatile",
+        messages=[{"role": "user", "content": "ping"}],
+        max_tokens=1
+    )
+
+
+def run(server: MockGroqServer, make_client, requests: int, threads: int):
+    """Per-request latencies (including client construction), wall time and connections opened"""
+    server.reset()
+
+    def one(_):
+        start = time.perf_counter()
+        _complete(make_client())
+        return time.perf_counter() - start
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        latencies = list(executor.map(one, range(requests)))
+    return latencies, time.perf_counter() - started, server.stats['connections']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.02, help="mock server think time (s)")
+    args = parser.parse_args()
+
+    server = start_mock_server(latency=str(args.latency))
+
+    # Before: every extractor built its own client (new pool, new connections)
+    fresh = lambda: Groq(api_key="bench", base_url=server.base_url)
+    shared_client = build_client("bench", server.base_url, pool_size=args.threads)
+    shared = lambda: shared_client
+
+    _complete(shared_client)  # warm the pool, as a long-running server would be
+
+    print(f"{'client':>8} {'mean (ms)':>10} {'p50 (ms)':>9} {'p95 (ms)':>9} {'req/s':>8} {'conns':>6}")
+    for name, factory in (('fresh', fresh), ('shared', shared)):
+        latencies, wall, connections = run(server, factory, args.requests, args.threads)
+        latencies.sort()
+        p95 = latencies[int(0.95 * (len(latencies) - 1))]
+        print(f"{name:>8} {statistics.mean(latencies) * 1000:>10.2f} "
+              f"{statistics.median(latencies) * 1000:>9.2f} {p95 * 1000:>9.2f} "
+              f"{args.requests / wall:>8.1f} {connections:>6}")
+
+    shared_client.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Benchmark: fuzzy de-duplication of extracted entries (speed, scaling, precision/recall) vs exact matching
+Usage: python -m benchmarks.bench_dedup [--entries 100000] [--duplicate-rate 0.3] [--sibling-rate 0.05]
+Synthetic facts are restated the way overlapping chunks restate them: reordered keys, other date and
+number formats, case, whitespace and punctuation changes, dropped filler words. Sibling facts share a
+value and all but one key word with an earlier fact (PMP vs AWS Certification Year) and must survive.
+"""
+
+import time
+import random
+import argparse
+
+from dedup import EntryDeduplicator, key_tokens
+
+KEY_WORDS = ['Date', 'Birth', 'Joining', 'Salary', 'Company', 'Role', 'Degree', 'University', 'City', 'Score',
+             'Project', 'Manager', 'Certification', 'Budget', 'Revenue', 'Contract', 'Invoice', 'Policy', 'Team',
+             'Office', 'Phone', 'Email', 'Summary', 'Objective', 'Award', 'Language', 'Skill', 'Tool', 'Client']
+QUALIFIERS = ['Current', 'Previous', 'First', 'Second', 'Primary', 'Annual', 'Total', 'Expected', 'Final', 'Home']
+MONTHS = ['January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September', 'October',
+          'November', 'December']
+# Distinct facts that a loose matcher would merge: same value, keys one content word apart
+NEGATIVE_PAIRS = [
+    (('PMP Certification Year', '2021'), ('AWS Certification Year', '2021')),
+    (('Python Proficiency Rating', '9/10'), ('Cloud Proficiency Rating', '9/10')),
+    (('Current Role Start Year', '2021'), ('PMP Certification Year', '2021')),
+    (('Willing to Relocate', 'Yes'), ('Willing to Travel', 'Yes')),
+    (('Skill 1', 'Python'), ('Skill 2', 'Python')),
+    (('Current Salary', '1,200,000'), ('Previous Salary', '1200000')),
+]
+TEXT_WORDS = ['data', 'analysis', 'delivered', 'platform', 'migration', 'customers', 'reporting', 'pipeline',
+              'quarterly', 'growth', 'regional', 'operations', 'forecast', 'automated', 'dashboards', 'team',
+              'reduced', 'costs', 'improved', 'accuracy', 'launched', 'product', 'across', 'markets']
+
+
+def base_fact(rng: random.Random, n: int):
+    """(key, value, kind) of one distinct fact; n keeps keys distinct"""
+    key = f"{rng.choice(QUALIFIERS)} {rng.choice(KEY_WORDS)} of {rng.choice(KEY_WORDS)} {n}"
+    kind = rng.choice(['date', 'number', 'text', 'short'])
+    if kind == 'date':
+        value = (rng.randint(1960, 2025), rng.randint(1, 12), rng.randint(1, 28))
+    elif kind == 'number':
+        value = rng.randint(1000, 10 ** 8)
+    elif kind == 'text':
+        value = ' '.join(rng.choice(TEXT_WORDS) for _ in range(rng.randint(6, 14)))
+    else:
+        value = rng.choice(TEXT_WORDS).title()
+    return key, value, kind
+
+
+def render(rng: random.Random, key: str, value, kind: str, variant: bool):
+    """Entry dict for a fact; variants restate it differently"""
+    if kind == 'date':
+        year, month, day = value
+        formats = [f"{MONTHS[month - 1]} {day}, {year}", f"{year}-{month:02d}-{day:02d}",
+                   f"{day} {MONTHS[month - 1]} {year}", f"{MONTHS[month - 1][:3]} {day} {year}"]
+        text = rng.choice(formats) if variant else formats[0]
+    elif kind == 'number':
+        text = rng.choice([f"{value:,}", str(value), f"{value}.00"]) if variant else f"{value:,}"
+    elif kind == 'text':
+        words = value.split()
+        if variant:
+            if rng.random() < 0.5 and len(words) > 8:
+                del words[rng.randrange(len(words))]
+            text = ' '.join(words)
+            text = rng.choice([text.capitalize(), text + '.', text.upper(), '  ' + text.replace(' ', '  ')])
+        else:
+            text = ' '.join(words).capitalize()
+    else:
+        text = value.lower() if variant and rng.random() < 0.5 else value
+    if variant:
+        words = key.split()
+        # 'Current Salary of Team 12' -> 'Team Salary 12 Current' and similar reorderings
+        words = [word for word in words if word != 'of']
+        rng.shuffle(words)
+        key = ' '.join(words)
+    return {'Category': 'Synthetic', 'Key': key, 'Value': text, 'Comments': ''}
+
+
+def sibling_key(rng: random.Random, key: str, used: set) -> str:
+    """The key with one word replaced: a different field of the same shape, unlike any key in used"""
+    while True:
+        words = key.split()
+        index = rng.choice([i for i, word in enumerate(words) if word.isalpha() and word != 'of'])
+        pool = QUALIFIERS if words[index] in QUALIFIERS else KEY_WORDS
+        words[index] = rng.choice([word for word in pool if word not in words])
+        # 'Team of City' and 'City of Team' are the same words; such a sibling would be a restatement
+        if key_tokens(' '.join(words)) not in used:
+            return ' '.join(words)
+
+
+def make_entries(count: int, duplicate_rate: float, seed: int, sibling_rate: float = 0.05):
+    """Entries plus the fact id of each (entries with the same id are duplicates)"""
+    rng = random.Random(seed)
+    entries, labels, facts = [], [], []
+    used = set()
+    while len(entries) < count:
+        roll = rng.random()
+        if facts and roll < sibling_rate:
+            # A new fact with an earlier fact's value, under a key one word apart
+            key, value, kind = facts[rng.randrange(max(0, len(facts) - 200), len(facts))]
+            fact_id = len(facts)
+            facts.append((sibling_key(rng, key, used), value, kind))
+            used.add(key_tokens(facts[fact_id][0]))
+            entries.append(render(rng, facts[fact_id][0], value, kind, False))
+        elif facts and roll < sibling_rate + duplicate_rate:
+            # Restate a recent fact, as an overlapping chunk would
+            fact_id = rng.randrange(max(0, len(facts) - 200), len(facts))
+            key, value, kind = facts[fact_id]
+            entries.append(render(rng, key, value, kind, True))
+        else:
+            fact_id = len(facts)
+            facts.append(base_fact(rng, fact_id))
+            key, value, kind = facts[fact_id]
+            used.add(key_tokens(key))
+            entries.append(render(rng, key, value, kind, False))
+        labels.append(fact_id)
+    return entries, labels
+
+
+def exact_dedupe(entries):
+    """The previous behaviour: drop repeated (Key, Value) pairs"""
+    seen = set()
+    kept = []
+    for i, entry in enumerate(entries):
+        pair = (entry['Key'], entry['Value'])
+        if pair not in seen:
+            seen.add(pair)
+            kept.append(i)
+    return kept
+
+
+def score(kept, labels):
+    """(duplicates left, distinct facts lost)"""
+    facts = len(set(labels))
+    kept_facts = len({labels[i] for i in kept})
+    return len(kept) - kept_facts, facts - kept_facts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--entries', type=int, default=100000)
+    parser.add_argument('--duplicate-rate', type=float, default=0.3)
+    parser.add_argument('--sibling-rate', type=float, default=0.05, help="distinct facts sharing a value")
+    parser.add_argument('--sizes', type=int, nargs='*', default=[25000, 50000, 100000],
+                        help="input sizes for the scaling table")
+    parser.add_argument('--key-threshold', type=float, default=0.8)
+    parser.add_argument('--value-threshold', type=float, default=0.8)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    deduplicator = EntryDeduplicator(key_threshold=args.key_threshold, value_threshold=args.value_threshold)
+    for first, second in NEGATIVE_PAIRS:
+        pair = [{'Category': 'Check', 'Key': key, 'Value': value, 'Comments': ''} for key, value in (first, second)]
+        kept = deduplicator.dedupe(pair)
+        status = 'kept apart' if len(kept) == 2 else 'MERGED'
+        print(f"  {status:>10}: {first[0]}: {first[1]} / {second[0]}: {second[1]}")
+        assert len(kept) == 2, f"distinct facts merged: {first} / {second}"
+    print()
+
+    entries, labels = make_entries(args.entries, args.duplicate_rate, args.seed, args.sibling_rate)
+    facts = len(set(labels))
+    print(f"{len(entries)} entries, {facts} distinct facts, {len(entries) - facts} restatements\n")
+    print(f"{'method':>8} {'kept':>8} {'dups left':>10} {'facts lost':>11} {'seconds':>8} {'us/entry':>9}")
+
+    start = time.perf_counter()
+    kept = exact_dedupe(entries)
+    seconds = time.perf_counter() - start
+    left, lost = score(kept, labels)
+    print(f"{'exact':>8} {len(kept):>8} {left:>10} {lost:>11} {seconds:>8.2f} {seconds / len(entries) * 1e6:>9.1f}")
+
+    start = time.perf_counter()
+    roots = deduplicator.clusters(entries)
+    seconds = time.perf_counter() - start
+    kept = [i for i, root in enumerate(roots) if root == i]
+    left, lost = score(kept, labels)
+    print(f"{'fuzzy':>8} {len(kept):>8} {left:>10} {lost:>11} {seconds:>8.2f} {seconds / len(entries) * 1e6:>9.1f}")
+
+    if args.sizes:
+        print(f"\n{'entries':>8} {'seconds':>8} {'us/entry':>9}")
+        for size in args.sizes:
+            sample, _ = make_entries(size, args.duplicate_rate, args.seed, args.sibling_rate)
+            start = time.perf_counter()
+            deduplicator.clusters(sample)
+            seconds = time.perf_counter() - start
+            print(f"{size:>8} {seconds:>8.2f} {seconds / size * 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
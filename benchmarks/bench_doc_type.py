@@ -0,0 +1,96 @@
+"""
+Benchmark: local document-type classifier vs the LLM doc-type call (agreement and latency saved)
+Usage: python -m benchmarks.bench_doc_type [--mock] [documents ...]
+Documents may be PDFs or plain-text files; the labelled samples in benchmarks/data/doc_types.jsonl are
+always included. The reference label is the LLM's answer (GROQ_API_KEY / GROQ_BASE_URL, or --mock for
+a local mock_groq_server, whose labels are keyword guesses).
+"""
+
+import os
+import json
+import time
+import argparse
+import statistics
+
+from benchmarks.bench_hybrid import load_text
+from doc_classifier import DOC_CLASSIFIER
+from extract_data_ai import AIDocumentExtractor
+from mock_groq_server import start_mock_server
+from rate_limiter import RateLimitScheduler
+from dotenv import load_dotenv
+
+SAMPLES = os.path.join(os.path.dirname(__file__), 'data', 'doc_types.jsonl')
+
+
+def load_documents(paths):
+    """(name, text, expected label or None) for the bundled samples and any extra documents"""
+    documents = []
+    with open(SAMPLES, 'r', encoding='utf-8') as file:
+        for i, line in enumerate(file):
+            sample = json.loads(line)
+            documents.append((f"sample {i + 1}", sample['text'], sample['label']))
+    for path in paths:
+        documents.append((os.path.basename(path), load_text(path), None))
+    return documents
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('documents', nargs='*', default=['Data Input.pdf'])
+    parser.add_argument('--mock', action='store_true', help="answer doc-type prompts from a local mock server")
+    parser.add_argument('--latency', default='lognormal:0.4,0.3', help="mock latency spec")
+    args = parser.parse_args()
+
+    load_dotenv()
+    # Measure real round trips, not response-cache hits
+    os.environ.pop('LLM_CACHE_PATH', None)
+    server = None
+    if args.mock:
+        server = start_mock_server(latency=args.latency)
+        extractor = AIDocumentExtractor('', groq_api_key='mock', base_url=server.base_url,
+                                        scheduler=RateLimitScheduler(rpm=0, tpm=0))
+    else:
+        extractor = AIDocumentExtractor('')
+
+    rows = []
+    print(f"{'document':>16} {'expected':>20} {'local':>20} {'conf':>5} {'LLM':>22} {'agree':>6} "
+          f"{'local us':>9} {'LLM ms':>7}")
+    for name, text, expected in load_documents(args.documents):
+        start = time.perf_counter()
+        local, confidence = DOC_CLASSIFIER.classify(text)
+        local_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        llm = extractor._identify_document_type(text)
+        llm_seconds = time.perf_counter() - start
+
+        reference = DOC_CLASSIFIER.canonical_label(llm)
+        agree = None if local is None else local == reference
+        rows.append((local, agree, local_seconds, llm_seconds, expected))
+        print(f"{name:>16} {expected or '-':>20} {local or '(fold)':>20} {confidence:>5.2f} {llm[:22]:>22} "
+              f"{'-' if agree is None else 'yes' if agree else 'NO':>6} {local_seconds * 1e6:>9.0f} "
+              f"{llm_seconds * 1000:>7.0f}")
+
+    confident = [row for row in rows if row[0] is not None]
+    agreed = sum(1 for row in confident if row[1])
+    llm_mean = statistics.mean(row[3] for row in rows)
+    local_mean = statistics.mean(row[2] for row in rows)
+    print(f"\nclassified locally: {len(confident)}/{len(rows)} "
+          f"(the rest fold the type question into the first chunk prompt)")
+    if confident:
+        print(f"agreement with the LLM label when confident: {agreed}/{len(confident)} "
+              f"({agreed / len(confident):.0%})")
+    labelled = [row for row in rows if row[4] is not None]
+    if labelled:
+        correct = sum(1 for row in labelled
+                      if row[0] == row[4] or (row[0] is None and row[4] not in DOC_CLASSIFIER.types))
+        print(f"matches the bundled sample labels (unknown types must fold): {correct}/{len(labelled)}")
+    # Both local answers and folded ones skip the separate round trip
+    print(f"doc-type round trip skipped per document: {llm_mean * 1000:.0f} ms LLM call "
+          f"vs {local_mean * 1e6:.0f} us local classification")
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
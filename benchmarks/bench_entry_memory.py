@@ -0,0 +1,98 @@
+"""
+Benchmark: memory and speed of entry dicts vs slotted Entry objects vs a columnar EntryBatch
+Usage: python -m benchmarks.bench_entry_memory [--rows 200000] [--profile rules|ai]
+Every container is fed the same freshly built strings (as JSON parsing or str.format produce them);
+'rules' rows repeat a few hundred comment templates, 'ai' rows carry a unique comment each.
+"""
+
+import gc
+import time
+import random
+import argparse
+import tracemalloc
+
+from entries import Entry, EntryBatch, category_counts
+from excel_export import entry_rows
+
+CATEGORIES = ['Personal Information', 'Career History', 'Education', 'Certifications', 'Technical Skills',
+              'Financial Information', 'Contact Details', 'Dates', 'Numerical Data', 'Entities']
+
+
+def raw_rows(count: int, profile: str, seed: int):
+    """(category, key, value, comments) tuples of new string objects, like a parser hands them over"""
+    rng = random.Random(seed)
+    keys = [f"{word} {n}" for n, word in enumerate(['Name', 'Date', 'Company', 'Salary', 'Degree', 'Score',
+                                                   'Rating', 'City', 'Role', 'Skill'] * 12)]
+    for i in range(count):
+        category = CATEGORIES[rng.randrange(len(CATEGORIES))]
+        key = keys[rng.randrange(len(keys))]
+        # Slicing and formatting make new objects, as json.loads / str.format do for every row
+        value = f"{rng.randrange(10 ** 6)} {key[:4]}"
+        if profile == 'ai':
+            comments = f"Mentioned in paragraph {i} alongside {key.lower()} details"
+        else:
+            comments = f"Extracted by rule {rng.randrange(300)} from the document text"
+        yield ''.join(category), ''.join(key), value, comments
+
+
+def build_dicts(rows):
+    return [{'Category': c, 'Key': k, 'Value': v, 'Comments': m} for c, k, v, m in rows]
+
+
+def build_entries(rows):
+    return [Entry(c, k, v, m) for c, k, v, m in rows]
+
+
+def build_batch(rows):
+    batch = EntryBatch()
+    for c, k, v, m in rows:
+        batch.append(c, k, v, m)
+    return batch
+
+
+def measure(build, args):
+    """(retained bytes, build seconds, category-count seconds, row-streaming seconds)"""
+    # Memory from a traced build, timings from an untraced one (tracing slows allocation several-fold)
+    gc.collect()
+    tracemalloc.start()
+    container = build(raw_rows(args.rows, args.profile, args.seed))
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del container
+    gc.collect()
+
+    start = time.perf_counter()
+    container = build(raw_rows(args.rows, args.profile, args.seed))
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    counts = category_counts(container)
+    count_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rows = sum(1 for _ in entry_rows(container))
+    rows_seconds = time.perf_counter() - start
+    assert rows == args.rows and sum(counts.values()) == args.rows
+    return retained, build_seconds, count_seconds, rows_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--profile', choices=['rules', 'ai'], default='rules')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{args.rows} rows, {args.profile} profile\n")
+    print(f"{'container':>16} {'MiB':>8} {'B/row':>7} {'build s':>8} {'count s':>8} {'rows s':>7}")
+    baseline = None
+    for name, build in (('list of dicts', build_dicts), ('list of Entry', build_entries),
+                        ('EntryBatch', build_batch)):
+        retained, build_seconds, count_seconds, rows_seconds = measure(build, args)
+        baseline = baseline or retained
+        print(f"{name:>16} {retained / 2 ** 20:>8.1f} {retained / args.rows:>7.0f} {build_seconds:>8.2f} "
+              f"{count_seconds:>8.3f} {rows_seconds:>7.2f}   ({retained / baseline:.0%} of dicts)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark: entry store ingest throughput and query latency across many documents
+Usage: python -m benchmarks.bench_entry_store [--documents 10000] [--entries 25] [--queries 200]
+Fills a temporary store with synthetic resume-like documents, then times exact lookups, full-text search,
+document fetches and listings.
+"""
+
+import os
+import time
+import random
+import argparse
+import tempfile
+import statistics
+
+from entry_store import EntryStore
+
+COMPANIES = ['Infosys', 'Tata Consultancy Services', 'Wipro', 'Accenture', 'Deloitte', 'Amazon Web Services',
+             'Google', 'Microsoft', 'IBM', 'Capgemini', 'Oracle', 'Cognizant', 'HCL Technologies', 'SAP']
+CITIES = ['Jaipur', 'Mumbai', 'Bengaluru', 'Pune', 'Hyderabad', 'Chennai', 'Delhi', 'Kolkata', 'London', 'Austin']
+SKILLS = ['Python', 'SQL', 'Power BI', 'Tableau', 'AWS', 'Azure', 'Spark', 'Kubernetes', 'Excel', 'Java',
+          'Machine Learning', 'Data Visualization', 'Terraform', 'Docker', 'Snowflake', 'Airflow']
+CERTIFICATIONS = ['AWS Solutions Architect', 'Azure Data Engineer', 'Google Cloud Professional', 'PMP',
+                  'Scrum Master', 'Tableau Desktop Specialist', 'CISSP', 'Six Sigma Green Belt']
+FIRST = ['Vijay', 'Priya', 'Arjun', 'Meera', 'Rahul', 'Ananya', 'Karan', 'Sneha', 'Rohan', 'Divya', 'Aditya']
+LAST = ['Kumar', 'Sharma', 'Patel', 'Reddy', 'Iyer', 'Singh', 'Gupta', 'Nair', 'Mehta', 'Joshi']
+
+
+def synthetic_document(rng: random.Random, entries: int):
+    """Category/Key/Value/Comments rows shaped like the extractor's output"""
+    first, last = rng.choice(FIRST), rng.choice(LAST)
+    company = rng.choice(COMPANIES)
+    rows = [
+        {'Category': 'Personal Information', 'Key': 'First Name', 'Value': first, 'Comments': ''},
+        {'Category': 'Personal Information', 'Key': 'Last Name', 'Value': last, 'Comments': ''},
+        {'Category': 'Personal Information', 'Key': 'Birth City', 'Value': rng.choice(CITIES),
+         'Comments': 'Born and raised there before moving for university'},
+        {'Category': 'Career', 'Key': 'Current Company', 'Value': company,
+         'Comments': f"Joined {company} in {rng.randint(2010, 2024)} as a {rng.choice(SKILLS)} specialist"},
+        {'Category': 'Career', 'Key': 'Current Salary', 'Value': f"{rng.randint(6, 40)},00,000 INR", 'Comments': ''},
+    ]
+    while len(rows) < entries:
+        if rng.random() < 0.6:
+            skill = rng.choice(SKILLS)
+            rows.append({'Category': 'Skills', 'Key': f"Skill {len(rows)}", 'Value': skill,
+                         'Comments': f"Rated {rng.randint(5, 10)}/10, used daily in {rng.choice(COMPANIES)} projects"})
+        else:
+            rows.append({'Category': 'Certifications', 'Key': rng.choice(CERTIFICATIONS),
+                         'Value': str(rng.randint(2012, 2025)),
+                         'Comments': f"Scored {rng.randint(70, 100)}% on the first attempt"})
+    return f"{first}_{last}_{rng.randrange(10 ** 6)}.pdf", rows[:entries]
+
+
+def timings(fn, queries):
+    """Per-query latency in ms"""
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(name: str, samples, hits=None):
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    extra = f" {hits:>8.1f}" if hits is not None else f" {'-':>8}"
+    print(f"{name:>28} {statistics.median(ordered):>8.2f} {p95:>8.2f} {ordered[-1]:>8.2f}{extra}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--documents', type=int, default=10000)
+    parser.add_argument('--entries', type=int, default=25, help="entries per document")
+    parser.add_argument('--queries', type=int, default=200, help="queries per kind")
+    parser.add_argument('--limit', type=int, default=50, help="result limit per query")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EntryStore(os.path.join(tmp, 'entries.sqlite3'))
+        start = time.perf_counter()
+        for i in range(args.documents):
+            name, rows = synthetic_document(rng, args.entries)
+            store.add_document(name, rows, engine='ai', content_sha256=f"{i:064x}", doc_type='Personal Resume')
+        ingest = time.perf_counter() - start
+        stats = store.stats()
+        print(f"ingested {stats['documents']} documents / {stats['entries']} entries in {ingest:.1f}s "
+              f"({stats['documents'] / ingest:.0f} docs/s, {stats['entries'] / ingest:.0f} entries/s), "
+              f"{stats['bytes'] / 2 ** 20:.1f} MiB, fts={stats['fts']}\n")
+
+        print(f"{'query':>28} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'avg hits':>8}")
+        hits = []
+
+        def counted(fn):
+            def run(query):
+                hits.append(len(fn(query)))
+            return run
+
+        kinds = [
+            ('find key+value', lambda q: store.find_entries(key='Current Company', value=q, limit=args.limit),
+             COMPANIES),
+            ('find value', lambda q: store.find_entries(value=q, limit=args.limit), SKILLS),
+            ('search one word', lambda q: store.search(q, limit=args.limit), [c.split()[0] for c in CITIES]),
+            ('search phrase words', lambda q: store.search(q, limit=args.limit), CERTIFICATIONS),
+            ('search prefix', lambda q: store.search(q, limit=args.limit), [s[:3] for s in SKILLS]),
+            ('get document', store.get_document, range(1, args.documents + 1)),
+            ('list documents', lambda q: store.list_documents(args.limit, offset=q), range(0, args.documents, 97)),
+        ]
+        for name, fn, pool in kinds:
+            pool = list(pool)
+            queries = [rng.choice(pool) for _ in range(args.queries)]
+            hits.clear()
+            samples = timings(counted(fn) if name.startswith(('find', 'search')) else fn, queries)
+            report(name, samples, statistics.mean(hits) if hits else None)
+
+
+if __name__ == "__main__":
+    main()
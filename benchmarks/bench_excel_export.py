@@ -0,0 +1,115 @@
+"""
+Benchmark: legacy openpyxl export vs the streaming write-only exporter
+Usage: python -m benchmarks.bench_excel_export [--rows 1000 10000 50000]
+Each run happens in a fresh process so peak RSS is attributable to one method.
+"""
+
+import os
+import time
+import argparse
+import tempfile
+import tracemalloc
+import multiprocessing
+from openpyxl import Workbook
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+
+from excel_export import entry_rows, write_entries_xlsx
+
+try:
+    import resource
+except ImportError:  # Windows: no getrusage; the Python heap peak from tracemalloc stands in for RSS
+    resource = None
+
+
+def synthetic_entries(count: int):
+    """Entries shaped like extractor output"""
+    categories = ['Personal Information', 'Career History', 'Education', 'Certifications', 'Technical Skills']
+    for i in range(count):
+        yield {
+            'Category': categories[i % len(categories)],
+            'Key': f'Field {i % 97}',
+            'Value': f'Value number {i} with some text',
+            'Comments': 'Contextual comment explaining the significance of this data point'
+        }
+
+
+def legacy_export(entries, output_path: str):
+    """The per-cell styling export the extractors used before excel_export"""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Extracted Data"
+    ws.append(['Category', 'Key', 'Value', 'Comments'])
+
+    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    header_font = Font(bold=True, color="FFFFFF", size=11)
+    for cell in ws[1]:
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+
+    for entry in entries:
+        ws.append([entry.get('Category', ''), entry.get('Key', ''),
+                   entry.get('Value', ''), entry.get('Comments', '')])
+
+    thin_border = Border(left=Side(style='thin'), right=Side(style='thin'),
+                         top=Side(style='thin'), bottom=Side(style='thin'))
+    for row in ws.iter_rows(min_row=2, max_row=ws.max_row):
+        for cell in row:
+            cell.border = thin_border
+            cell.alignment = Alignment(vertical="top", wrap_text=True)
+
+    ws.column_dimensions['A'].width = 22
+    ws.column_dimensions['B'].width = 40
+    ws.column_dimensions['C'].width = 35
+    ws.column_dimensions['D'].width = 70
+    ws.freeze_panes = 'A2'
+    wb.save(output_path)
+
+
+def _max_rss_kb() -> float:
+    if resource is None:
+        return tracemalloc.get_traced_memory()[1] / 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _run(method: str, rows: int, output_path: str, queue):
+    if resource is None:
+        tracemalloc.start()
+    baseline = _max_rss_kb()
+    start = time.perf_counter()
+    if method == 'legacy':
+        legacy_export(synthetic_entries(rows), output_path)
+    else:
+        write_entries_xlsx(entry_rows(synthetic_entries(rows)), output_path)
+    seconds = time.perf_counter() - start
+    peak = _max_rss_kb()
+    queue.put((seconds, baseline, peak))
+
+
+def measure(method: str, rows: int, output_path: str):
+    """(seconds, peak RSS in MB, RSS growth in MB) for one export in a child process"""
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    process = ctx.Process(target=_run, args=(method, rows, output_path, queue))
+    process.start()
+    seconds, baseline, peak = queue.get()
+    process.join()
+    return seconds, peak / 1024, (peak - baseline) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 50000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'method':>10} {'rows/s':>10} {'peak RSS MB':>12} {'growth MB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            for method in ('legacy', 'streaming'):
+                path = os.path.join(tmp, f'{method}_{rows}.xlsx')
+                seconds, peak, growth = measure(method, rows, path)
+                print(f"{rows:>8} {method:>10} {rows / seconds:>10.0f} {peak:>12.1f} {growth:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
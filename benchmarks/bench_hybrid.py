@@ -0,0 +1,48 @@
+"""
+Benchmark: LLM input tokens for full-text AI extraction vs hybrid (rules first, AI on the residual)
+Usage: python -m benchmarks.bench_hybrid [--threshold 0.8] [documents ...]
+Documents may be PDFs or plain-text files; no API calls are made.
+"""
+
+import os
+import time
+import argparse
+
+from chunking import estimate_tokens
+from extract_data_enhanced import ENHANCED_RULES
+from hybrid_extract import residual_text
+from pdf_text import extract_pdf_text
+
+DEFAULT_DOCUMENTS = [os.path.join(os.path.dirname(__file__), 'data', 'narrative.txt'), 'Data Input.pdf']
+
+
+def load_text(path: str) -> str:
+    if path.lower().endswith('.pdf'):
+        return extract_pdf_text(path)
+    with open(path, 'r', encoding='utf-8') as file:
+        return file.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('documents', nargs='*', default=DEFAULT_DOCUMENTS)
+    parser.add_argument('--threshold', type=float, default=0.8, help="segment coverage needed to skip the LLM")
+    args = parser.parse_args()
+
+    print(f"{'document':>16} {'rules':>6} {'segments':>9} {'sent':>5} {'full tok':>9} "
+          f"{'hybrid tok':>11} {'saved':>7} {'rule ms':>8}")
+    for path in args.documents:
+        text = load_text(path)
+        start = time.perf_counter()
+        matches = ENHANCED_RULES.matches(text)
+        residual, segments, kept = residual_text(text, sorted({match.span() for _, match in matches}),
+                                                 args.threshold)
+        elapsed = (time.perf_counter() - start) * 1000
+        full = estimate_tokens(text)
+        hybrid = estimate_tokens(residual)
+        print(f"{os.path.basename(path)[:16]:>16} {len(matches):>6} {segments:>9} {kept:>5} {full:>9} "
+              f"{hybrid:>11} {(full - hybrid) / max(1, full):>7.1%} {elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark: re-extracting a revised document with and without the per-chunk result store
+Usage: python -m benchmarks.bench_incremental [--pages 150] [--changed 2] [--chunk-tokens 1500]
+Writes an N-page narrative PDF, extracts it, edits a few pages and extracts the revision with the mock LLM.
+Finally checks that a chunk whose answer failed to parse is sent to the LLM again on the next run.
+"""
+
+import os
+import time
+import random
+import argparse
+import tempfile
+
+from benchmarks.corpus import layout_pages, load_template, narrative_page, write_pdf
+from benchmarks.mock_llm import MockLLMClient
+from chunk_store import ChunkStore
+from extract_data_ai import AIDocumentExtractor
+from llm_cache import LLMResponseCache
+from rate_limiter import RateLimitScheduler
+
+AMENDMENT = ("By amendment, the parties agree that the revised schedule replaces the original terms "
+             "for every obligation falling due after the effective date of this revision. ")
+
+
+def extract(path: str, store, chunk_tokens: int, latency: float, cache=None, truncate: int = 0):
+    client = MockLLMClient(latency, truncate=truncate)
+    extractor = AIDocumentExtractor(path, client=client, cache=cache, chunk_store=store, chunk_tokens=chunk_tokens,
+                                    scheduler=RateLimitScheduler(rpm=0, tpm=0), max_concurrency=4)
+    extractor.extract_text_from_pdf()
+    start = time.perf_counter()
+    entries = extractor.analyze_document_with_ai()
+    return entries, extractor.chunk_report, client.calls, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, default=150)
+    parser.add_argument('--changed', type=int, default=2, help="pages edited in the revision")
+    parser.add_argument('--chunk-tokens', type=int, default=1500)
+    parser.add_argument('--latency', type=float, default=0.05, help="mock LLM latency per call (s)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    template = load_template()
+    texts = [narrative_page(template, rng) for _ in range(args.pages)]
+    revised = list(texts)
+    for index in rng.sample(range(args.pages), min(args.changed, args.pages)):
+        revised[index] = AMENDMENT + revised[index]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        original_pdf = os.path.join(tmp, 'original.pdf')
+        revised_pdf = os.path.join(tmp, 'revised.pdf')
+        write_pdf(layout_pages(texts), original_pdf)
+        write_pdf(layout_pages(revised), revised_pdf)
+        store = ChunkStore(os.path.join(tmp, 'chunks.sqlite3'))
+
+        print(f"{args.pages} pages, {args.changed} edited, budget {args.chunk_tokens} tokens, "
+              f"mock latency {args.latency * 1000:.0f} ms\n")
+        print(f"{'run':>22} {'chunks':>7} {'reused':>7} {'LLM calls':>10} {'entries':>8} {'seconds':>8}")
+        for name, path, run_store in (('original', original_pdf, store),
+                                      ('revision, no store', revised_pdf, None),
+                                      ('revision, chunk store', revised_pdf, store)):
+            entries, report, calls, seconds = extract(path, run_store, args.chunk_tokens, args.latency)
+            print(f"{name:>22} {report['total']:>7} {report['reused']:>7} {calls:>10} {len(entries):>8} "
+                  f"{seconds:>8.2f}")
+
+        # A truncated answer must be neither stored nor served from the response cache on the next run
+        recovery_pdf = os.path.join(tmp, 'recovery.pdf')
+        write_pdf(layout_pages(texts[:4]), recovery_pdf)
+        recovery_store = ChunkStore(os.path.join(tmp, 'recovery_chunks.sqlite3'))
+        cache = LLMResponseCache(os.path.join(tmp, 'responses.sqlite3'))
+        _, first, _, _ = extract(recovery_pdf, recovery_store, args.chunk_tokens, 0.0, cache, truncate=1)
+        _, second, calls, _ = extract(recovery_pdf, recovery_store, args.chunk_tokens, 0.0, cache)
+        assert calls == 1 and second['reused'] == second['total'] - 1, (calls, second)
+        print(f"\nunparseable chunk retried: 1 of {first['total']} chunks re-sent, {calls} LLM call on the next run")
+
+
+if __name__ == "__main__":
+    main()
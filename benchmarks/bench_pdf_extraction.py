@@ -0,0 +1,60 @@
+"""
+Benchmark: serial vs process-pool PDF text extraction across page counts
+Usage: python -m benchmarks.bench_pdf_extraction [--pages 3 24 96 240] [--workers N]
+"""
+
+import os
+import time
+import argparse
+import tempfile
+import PyPDF2
+
+from pdf_text import extract_pdf_text
+
+
+def make_repeated_pdf(source_path: str, page_count: int, output_path: str):
+    """Build a PDF of page_count pages by cycling through the source document's pages"""
+    reader = PyPDF2.PdfReader(source_path)
+    writer = PyPDF2.PdfWriter()
+    for i in range(page_count):
+        writer.add_page(reader.pages[i % len(reader.pages)])
+    with open(output_path, 'wb') as file:
+        writer.write(file)
+
+
+def time_call(fn, repeat: int) -> float:
+    """Best wall-clock time of `repeat` runs"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--source', default='Data Input.pdf')
+    parser.add_argument('--pages', type=int, nargs='+', default=[3, 24, 96, 240])
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'pages':>7} {'serial (s)':>12} {'parallel (s)':>13} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.pages:
+            path = os.path.join(tmp, f'bench_{pages}.pdf')
+            make_repeated_pdf(args.source, pages, path)
+
+            serial = time_call(lambda: extract_pdf_text(path, workers=1), args.repeat)
+            parallel = time_call(
+                lambda: extract_pdf_text(path, workers=args.workers, parallel_threshold=0), args.repeat
+            )
+            assert extract_pdf_text(path, workers=1) == extract_pdf_text(
+                path, workers=args.workers, parallel_threshold=0
+            ), "parallel output differs from serial"
+            print(f"{pages:>7} {serial:>12.3f} {parallel:>13.3f} {serial / parallel:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark: concurrent jobs against a rate-limited mock server, with and without the RateLimitScheduler
+Usage: python -m benchmarks.bench_rate_limiter [--jobs 6] [--calls 8] [--tpm 120000]
+The mock_groq_server enforces a tokens-per-minute budget, answers 429 with retry-after when it is exceeded,
+and starts with an exhausted budget, as if another process had just used the minute.
+"""
+
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from chunking import estimate_tokens
+from groq_client import build_client
+from mock_groq_server import start_mock_server
+from rate_limiter import RateLimitScheduler
+
+MODEL = "llama-3.3-70b-versatile"
+MAX_TOKENS = 100
+PROMPT = "Document text:\nExtract every field from this contract clause. " * 25
+
+
+def run_jobs(jobs: int, calls: int, per_job_concurrency: int, send):
+    """Run jobs x calls requests; returns (failures, wall seconds, per-job finish times)"""
+    failures = []
+    finished = {}
+    started = time.perf_counter()
+
+    def job(job_id: int):
+        def one(_):
+            try:
+                send(f"job-{job_id}", PROMPT)
+            except Exception as e:
+                failures.append(type(e).__name__)
+        with ThreadPoolExecutor(max_workers=per_job_concurrency) as executor:
+            list(executor.map(one, range(calls)))
+        finished[job_id] = time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        list(executor.map(job, range(jobs)))
+    return failures, time.perf_counter() - started, finished
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=6)
+    parser.add_argument('--calls', type=int, default=8, help="calls per job")
+    parser.add_argument('--concurrency', type=int, default=4, help="concurrent calls per job")
+    parser.add_argument('--tpm', type=int, default=120000)
+    parser.add_argument('--latency', default='0.05', help="mock latency spec, e.g. lognormal:0.05,0.5")
+    args = parser.parse_args()
+
+    server = start_mock_server(tpm=args.tpm, latency=args.latency)
+    client = build_client("bench", server.base_url, pool_size=64)
+
+    def direct(retries):
+        completions = client.with_options(max_retries=retries).chat.completions
+        return lambda job, prompt: completions.create(
+            model=MODEL, messages=[{"role": "user", "content": prompt}], max_tokens=MAX_TOKENS)
+
+    scheduler = RateLimitScheduler(rpm=0, tpm=args.tpm, base_delay=0.25)
+    raw = client.with_options(max_retries=0).chat.completions.with_raw_response
+
+    def scheduled(job, prompt):
+        return scheduler.call(job, estimate_tokens(prompt) + MAX_TOKENS, lambda: raw.create(
+            model=MODEL, messages=[{"role": "user", "content": prompt}], max_tokens=MAX_TOKENS))
+
+    total = args.jobs * args.calls
+    print(f"{args.jobs} jobs x {args.calls} calls, mock limit {args.tpm} TPM ({args.tpm / 60:.0f} tokens/s)\n")
+    print(f"{'mode':>16} {'ok':>5} {'failed':>7} {'429s':>6} {'wall (s)':>9} {'tokens/s':>9} {'job spread (s)':>15}")
+    for name, send in (('no retries', direct(0)), ('client retries', direct(2)), ('scheduler', scheduled)):
+        server.reset(exhausted=True)
+        failures, wall, finished = run_jobs(args.jobs, args.calls, args.concurrency, send)
+        ok = total - len(failures)
+        spread = max(finished.values()) - min(finished.values())
+        print(f"{name:>16} {ok:>5} {len(failures):>7} {server.stats['rate_limited']:>6} {wall:>9.2f} "
+              f"{server.stats['tokens'] / wall:>9.0f} {spread:>15.2f}")
+
+    print(f"\nscheduler stats: {scheduler.stats}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
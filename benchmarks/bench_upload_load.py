@@ -0,0 +1,111 @@
+"""
+Load test: concurrent /upload jobs through the real web app and AI pipeline, against mock_groq_server
+Usage: python -m benchmarks.bench_upload_load [--uploads 20] [--concurrency 8] [--pages 5] [--latency lognormal:0.3,0.5]
+       python -m benchmarks.bench_upload_load --engine race --deadline 5
+Each upload is a distinct synthetic PDF, so the response cache cannot short-circuit the LLM calls.
+"First result" is the earliest downloadable workbook: the provisional rule result when racing.
+"""
+
+import io
+import os
+import time
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.corpus import make_corpus_pdf
+from benchmarks.run_all import percentile
+from mock_groq_server import start_mock_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--uploads', type=int, default=20)
+    parser.add_argument('--concurrency', type=int, default=8, help="simultaneous clients")
+    parser.add_argument('--pages', type=int, default=5)
+    parser.add_argument('--job-workers', type=int, default=4)
+    parser.add_argument('--latency', default='lognormal:0.3,0.5', help="mock latency distribution")
+    parser.add_argument('--error-rate', type=float, default=0.02)
+    parser.add_argument('--rate-limit-rate', type=float, default=0.02)
+    parser.add_argument('--tpm', type=int, default=0, help="mock TPM budget, also given to the scheduler")
+    parser.add_argument('--tokens-per-second', type=float, default=0.0)
+    parser.add_argument('--engine', choices=['ai', 'race'], default='ai')
+    parser.add_argument('--deadline', type=float, default=20.0, help="race deadline per upload (s)")
+    args = parser.parse_args()
+
+    server = start_mock_server(latency=args.latency, error_rate=args.error_rate,
+                               rate_limit_rate=args.rate_limit_rate, retry_after=0.5, tpm=args.tpm,
+                               tokens_per_second=args.tokens_per_second)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # The app reads its configuration at import time
+        os.environ.update({
+            'GROQ_API_KEY': 'mock',
+            'GROQ_BASE_URL': server.base_url,
+            'GROQ_RPM': '0',
+            'GROQ_TPM': str(args.tpm),
+            'JOB_WORKERS': str(args.job_workers),
+            'JOB_DB_PATH': os.path.join(tmp, 'jobs.sqlite3'),
+            'RESULT_DB_PATH': os.path.join(tmp, 'results.sqlite3'),
+            'LLM_CACHE_PATH': os.path.join(tmp, 'cache.sqlite3'),
+            'CHUNK_STORE_PATH': os.path.join(tmp, 'chunks.sqlite3'),
+            'ENTRY_DB_PATH': os.path.join(tmp, 'entries.sqlite3'),
+            'DEMO_PRECOMPUTE': '0',
+        })
+        from app import app
+
+        documents = []
+        for i in range(args.uploads):
+            path = make_corpus_pdf(os.path.join(tmp, f'upload_{i}.pdf'), args.pages, seed=i)
+            with open(path, 'rb') as file:
+                documents.append(file.read())
+
+        def upload(i: int):
+            client = app.test_client()
+            start = time.perf_counter()
+            response = client.post('/upload', data={'file': (io.BytesIO(documents[i]), f'upload_{i}.pdf'),
+                                                    'engine': args.engine, 'deadline': str(args.deadline)},
+                                   content_type='multipart/form-data')
+            accepted = time.perf_counter() - start
+            job_url = response.get_json()['status_url']
+            first = None
+            while True:
+                job = client.get(job_url).get_json()
+                if first is None and job.get('download_url'):
+                    first = time.perf_counter() - start
+                if job['status'] in ('done', 'failed'):
+                    break
+                time.sleep(0.05)
+            total = time.perf_counter() - start
+            if job['status'] == 'done':
+                assert client.get(job['download_url']).status_code == 200
+            return job['status'], accepted, total, first or total, job.get('race_outcome')
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            outcomes = list(executor.map(upload, range(args.uploads)))
+        wall = time.perf_counter() - started
+
+    done = [outcome for outcome in outcomes if outcome[0] == 'done']
+    totals = [outcome[2] for outcome in done] or [0.0]
+    firsts = [outcome[3] for outcome in done] or [0.0]
+    accepts = [outcome[1] for outcome in outcomes]
+    print(f"\n{args.uploads} uploads x {args.pages} pages, {args.concurrency} clients, "
+          f"{args.job_workers} job workers, mock latency {args.latency}, engine {args.engine}")
+    print(f"  done {len(done)}, failed {len(outcomes) - len(done)} in {wall:.1f}s "
+          f"({len(done) / wall:.2f} docs/s)")
+    print(f"  /upload accept p50 {percentile(accepts, 0.5) * 1000:.0f} ms, "
+          f"p95 {percentile(accepts, 0.95) * 1000:.0f} ms")
+    print(f"  first result p50 {percentile(firsts, 0.5):.2f}s, p95 {percentile(firsts, 0.95):.2f}s")
+    print(f"  end-to-end p50 {percentile(totals, 0.5):.2f}s, p95 {percentile(totals, 0.95):.2f}s")
+    if args.engine == 'race':
+        races = {}
+        for outcome in done:
+            races[outcome[4]] = races.get(outcome[4], 0) + 1
+        print(f"  race outcomes: {races}")
+    print(f"  mock server: {server.stats}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
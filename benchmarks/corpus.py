@@ -0,0 +1,135 @@
+"""
+Synthetic PDF corpus for benchmarks
+Resume-narrative pages in the style of Data Input.pdf with varied facts, written by a dependency-free PDF writer
+Usage: python -m benchmarks.corpus --pages 1 10 100 500 --output-dir corpus/
+"""
+
+import os
+import random
+import argparse
+import textwrap
+from typing import List
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), 'data', 'narrative.txt')
+
+FIRST_NAMES = ['Vijay', 'Anita', 'Rahul', 'Meera', 'Arjun', 'Priya', 'Karan', 'Sneha', 'Rohan', 'Divya']
+LAST_NAMES = ['Kumar', 'Sharma', 'Patel', 'Iyer', 'Reddy', 'Gupta', 'Nair', 'Mehta', 'Rao', 'Joshi']
+MONTHS = ['January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September',
+          'October', 'November', 'December']
+
+# Page geometry for 10pt Helvetica on A4
+_LINE_WIDTH = 95
+_LINES_PER_PAGE = 62
+
+
+def load_template() -> str:
+    with open(TEMPLATE_PATH, 'r', encoding='utf-8') as file:
+        return file.read()
+
+
+def narrative_page(template: str, rng: random.Random) -> str:
+    """One page of narrative: the template with its name, birth date, scores and salaries varied"""
+    year = rng.randint(1975, 1998)
+    month = rng.randrange(12)
+    day = rng.randint(1, 28)
+    replacements = {
+        'Vijay Kumar': f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        'March 15, 1989': f"{MONTHS[month]} {day}, {year}",
+        '1989-03-15': f"{year}-{month + 1:02d}-{day:02d}",
+        '35 years old': f"{2024 - year} years old",
+        '2,800,000 INR': f"{rng.randint(12, 48) * 100:,},000 INR",
+        '92.5%': f"{rng.randint(700, 990) / 10}%",
+        'CGPA of 8.7': f"CGPA of {rng.randint(60, 99) / 10}",
+        '920 out of 1000': f"{rng.randint(700, 1000)} out of 1000",
+        '875 points': f"{rng.randint(700, 1000)} points",
+        '98% score': f"{rng.randint(80, 100)}% score",
+    }
+    page = template
+    for old, new in replacements.items():
+        page = page.replace(old, new)
+    return page
+
+
+def _escape(line: str) -> str:
+    line = line.encode('latin-1', 'replace').decode('latin-1')
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def layout_pages(texts: List[str]) -> List[List[str]]:
+    """Wrap each text and break it into page-sized groups of lines; every text starts a new page"""
+    pages = []
+    for text in texts:
+        lines = []
+        for paragraph in text.split('\n'):
+            lines.extend(textwrap.wrap(paragraph, _LINE_WIDTH) or [''])
+        for start in range(0, len(lines), _LINES_PER_PAGE):
+            pages.append(lines[start:start + _LINES_PER_PAGE])
+    return pages
+
+
+def write_pdf(pages: List[List[str]], path: str):
+    """Minimal PDF 1.4 writer: one Helvetica text stream per page"""
+    objects = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(b'')  # filled in once the page tree exists
+    tree = add(b'')
+    font = add(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>')
+
+    page_ids = []
+    for lines in pages:
+        stream = ['BT', '/F1 10 Tf', '12 TL', '50 800 Td']
+        stream += [f"({_escape(line)}) Tj T*" for line in lines]
+        stream.append('ET')
+        content = '\n'.join(stream).encode('latin-1')
+        content_id = add(b'<< /Length %d >>\nstream\n' % len(content) + content + b'\nendstream')
+        page_ids.append(add(
+            b'<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 %d 0 R >> >> '
+            b'/Contents %d 0 R >>' % (tree, font, content_id)
+        ))
+
+    kids = b' '.join(b'%d 0 R' % page_id for page_id in page_ids)
+    objects[tree - 1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (kids, len(page_ids))
+    objects[catalog - 1] = b'<< /Type /Catalog /Pages %d 0 R >>' % tree
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for offset in offsets:
+        out += b'%010d 00000 n \n' % offset
+    out += b'trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, catalog, xref)
+
+    with open(path, 'wb') as file:
+        file.write(out)
+
+
+def make_corpus_pdf(path: str, pages: int, seed: int = 0) -> str:
+    """Write a `pages`-page narrative PDF (one varied narrative per page) and return its path"""
+    rng = random.Random(seed)
+    template = load_template()
+    write_pdf(layout_pages([narrative_page(template, rng) for _ in range(pages)]), path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 10, 100, 500])
+    parser.add_argument('--output-dir', default='corpus')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for pages in args.pages:
+        path = make_corpus_pdf(os.path.join(args.output_dir, f'narrative_{pages}p.pdf'), pages, args.seed)
+        print(f"✓ {path} ({os.path.getsize(path) / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
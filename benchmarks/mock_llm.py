@@ -0,0 +1,55 @@
+"""
+In-process stand-in for the Groq client used by pipeline benchmarks
+Same deterministic answers as mock_groq_server, after a fixed latency and without any network
+"""
+
+import time
+import threading
+from types import SimpleNamespace
+
+from chunking import estimate_tokens
+from mock_groq_server import mock_completion
+
+
+class _RawResponse:
+    def __init__(self, response):
+        self.headers = {}
+        self._response = response
+
+    def parse(self):
+        return self._response
+
+
+class MockLLMClient:
+    """Implements the slice of the Groq client that AIDocumentExtractor uses"""
+
+    def __init__(self, latency: float = 0.02, truncate: int = 0):
+        self.latency = latency
+        self.calls = 0
+        # The first `truncate` chunk answers are cut off mid-JSON, as a max_tokens stop would leave them
+        self.truncate = truncate
+        self._lock = threading.Lock()
+        completions = SimpleNamespace(create=self._create)
+        completions.with_raw_response = SimpleNamespace(create=lambda **kwargs: _RawResponse(self._create(**kwargs)))
+        self.chat = SimpleNamespace(completions=completions)
+
+    def with_options(self, **options):
+        return self
+
+    def _create(self, model: str, messages, **kwargs):
+        self.calls += 1
+        time.sleep(self.latency)
+        prompt = messages[0]['content']
+        content = mock_completion(prompt)
+        if 'Document text:' in prompt:
+            with self._lock:
+                truncate, self.truncate = self.truncate > 0, max(0, self.truncate - 1)
+            if truncate:
+                content = content[:len(content) // 2]
+        prompt_tokens = estimate_tokens(prompt)
+        completion_tokens = estimate_tokens(content)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(role='assistant', content=content))],
+            usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                                  total_tokens=prompt_tokens + completion_tokens)
+        )
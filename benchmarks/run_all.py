@@ -0,0 +1,165 @@
+"""
+Benchmark suite: every pipeline stage over synthetic corpora of increasing size, written as JSON
+Usage: python -m benchmarks.run_all [--pages 1 10 100 500] [--repeat 5] [--output benchmark_results.json]
+Stages: pdf_text, regex_basic, regex_enhanced, chunking, excel_export, pipeline_mock_llm
+Latency percentiles come from timed runs; peak_memory_mb is the Python heap peak of one extra traced run.
+"""
+
+import io
+import os
+import sys
+import json
+import math
+import time
+import platform
+import argparse
+import tempfile
+import tracemalloc
+import contextlib
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+try:
+    import resource
+except ImportError:  # Windows: no getrusage; stage results still carry the tracemalloc heap peak
+    resource = None
+
+from benchmarks.corpus import make_corpus_pdf
+from benchmarks.mock_llm import MockLLMClient
+from chunking import TokenChunker
+from excel_export import entry_rows, write_entries_xlsx
+from extract_data import DocumentExtractor
+from extract_data_enhanced import EnhancedDocumentExtractor
+from pdf_text import extract_pdf_text
+from rate_limiter import RateLimitScheduler
+
+STAGES = ['pdf_text', 'regex_basic', 'regex_enhanced', 'chunking', 'excel_export', 'pipeline_mock_llm']
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Timed runs followed by one traced run for peak memory; stdout from fn is discarded"""
+    sink = io.StringIO()
+    samples = []
+    with contextlib.redirect_stdout(sink):
+        fn()  # warm-up: imports, caches, pool start-up
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        try:
+            fn()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'runs': repeat,
+        'mean_s': sum(samples) / len(samples),
+        'p50_s': percentile(samples, 0.50),
+        'p95_s': percentile(samples, 0.95),
+        'min_s': min(samples),
+        'peak_memory_mb': peak / (1024 * 1024)
+    }
+
+
+def _regex(extractor_class, text: str):
+    extractor = extractor_class('')
+    extractor.raw_text = text
+    return extractor.identify_key_value_pairs()
+
+
+def _pipeline(path: str, latency: float):
+    from extract_data_ai import AIDocumentExtractor
+    extractor = AIDocumentExtractor(path, client=MockLLMClient(latency),
+                                    scheduler=RateLimitScheduler(rpm=0, tpm=0), cache=None)
+    extractor.extract_text_from_pdf()
+    extractor.analyze_document_with_ai()
+    write_entries_xlsx(entry_rows(extractor.structured_data), io.BytesIO())
+
+
+def bench_document(path: str, pages: int, stages: List[str], repeat: int, latency: float) -> List[Dict[str, Any]]:
+    text = extract_pdf_text(path)
+    entries = _regex(EnhancedDocumentExtractor, text)
+    # Rules report each fact once per document, so the workbook is scaled to ~100 rows per page
+    rows = 100 * pages
+    export_entries = (entries * (rows // max(1, len(entries)) + 1))[:rows]
+
+    cases = {
+        'pdf_text': (lambda: extract_pdf_text(path), pages, 'pages/s'),
+        'regex_basic': (lambda: _regex(DocumentExtractor, text), pages, 'pages/s'),
+        'regex_enhanced': (lambda: _regex(EnhancedDocumentExtractor, text), pages, 'pages/s'),
+        'chunking': (lambda: TokenChunker().split(text), len(text) / (1024 * 1024), 'MB/s'),
+        'excel_export': (lambda: write_entries_xlsx(entry_rows(export_entries), io.BytesIO()), rows, 'rows/s'),
+        'pipeline_mock_llm': (lambda: _pipeline(path, latency), pages, 'pages/s'),
+    }
+
+    results = []
+    for stage in stages:
+        fn, work, unit = cases[stage]
+        stats = measure(fn, repeat)
+        result = {
+            'benchmark': stage,
+            'pages': pages,
+            'characters': len(text),
+            **stats,
+            'throughput': work / stats['p50_s'] if stats['p50_s'] else None,
+            'throughput_unit': unit
+        }
+        if stage == 'excel_export':
+            result['rows'] = rows
+        results.append(result)
+        print(f"  {stage:>18} {pages:>5}p  p50 {stats['p50_s'] * 1000:>9.2f} ms  p95 {stats['p95_s'] * 1000:>9.2f} ms  "
+              f"{result['throughput']:>10.1f} {unit:<7} peak {stats['peak_memory_mb']:>8.3f} MB")
+    return results
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 10, 100, 500])
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=0.02, help="mock LLM latency per call (s)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='benchmark_results.json')
+    args = parser.parse_args(argv)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'repeat': args.repeat,
+            'mock_llm_latency_s': args.latency
+        },
+        'results': []
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.pages:
+            path = make_corpus_pdf(os.path.join(tmp, f'narrative_{pages}p.pdf'), pages, args.seed)
+            print(f"📄 {pages} pages ({os.path.getsize(path) / 1024:.0f} KB)")
+            report['results'].extend(bench_document(path, pages, args.stages, args.repeat, args.latency))
+
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    report['meta']['max_rss_mb'] = None
+    if resource is not None:
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        report['meta']['max_rss_mb'] = maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2)
+    print(f"\n✓ {len(report['results'])} results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
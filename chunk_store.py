@@ -0,0 +1,101 @@
+"""
+Chunk Result Store
+Per-chunk extraction results and chunk layouts in SQLite, so a revised document only re-extracts what changed
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from entries import json_default
+
+
+class ChunkStore:
+    """
+    Two content-addressed tables shared by every worker through one SQLite file:
+    results maps a chunk key (chunk fingerprint plus prompt context) to its parsed entries, and
+    layouts records which text units (by fingerprint) each stored chunk was packed from, indexed
+    by its first unit, so the next plan of a revised document can pack the same chunks again.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 30 * 24 * 3600):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS chunk_results (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS chunk_layouts (
+                    start TEXT NOT NULL,
+                    units TEXT NOT NULL,
+                    created REAL NOT NULL,
+                    PRIMARY KEY (start, units)
+                )
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Stored result of a chunk, or None"""
+        row = self._connect().execute(
+            "SELECT value, created FROM chunk_results WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or time.time() - row[1] > self.ttl_seconds:
+            return None
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Dict[str, Any], units: Tuple[str, ...] = None, namespace: str = ''):
+        """Store a chunk's result and, if given, the unit layout it was packed from"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO chunk_results (key, value, created) VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False, default=json_default), now)
+            )
+            if units:
+                conn.execute(
+                    "INSERT OR REPLACE INTO chunk_layouts (start, units, created) VALUES (?, ?, ?)",
+                    (namespace + units[0], ' '.join(units), now)
+                )
+            cutoff = now - self.ttl_seconds
+            conn.execute("DELETE FROM chunk_results WHERE created < ?", (cutoff,))
+            conn.execute("DELETE FROM chunk_layouts WHERE created < ?", (cutoff,))
+
+    def layouts(self, starts: Iterable[str], namespace: str = '') -> Dict[str, List[Tuple[str, ...]]]:
+        """Known layouts by first unit fingerprint, for the given candidate first units"""
+        starts = [namespace + start for start in set(starts)]
+        found: Dict[str, List[Tuple[str, ...]]] = {}
+        conn = self._connect()
+        # Stay under SQLite's bound-parameter limit
+        for offset in range(0, len(starts), 500):
+            batch = starts[offset:offset + 500]
+            rows = conn.execute(
+                f"SELECT start, units FROM chunk_layouts WHERE start IN ({','.join('?' * len(batch))})", batch
+            )
+            for start, units in rows:
+                found.setdefault(start[len(namespace):], []).append(tuple(units.split(' ')))
+        return found
+
+
+def chunk_store_from_env() -> Optional[ChunkStore]:
+    """Build a store from CHUNK_STORE_* environment variables (disabled when CHUNK_STORE_PATH is unset)"""
+    path = os.environ.get("CHUNK_STORE_PATH")
+    if not path:
+        return None
+    return ChunkStore(path, ttl_seconds=float(os.environ.get("CHUNK_STORE_TTL_SECONDS", str(30 * 24 * 3600))))
@@ -0,0 +1,161 @@
+"""
+Token-Aware Chunking
+Packs document text into LLM-sized chunks by estimated token count, cutting at paragraph and sentence boundaries
+"""
+
+import os
+import re
+import hashlib
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+# Approximates BPE tokenizers: short words are one token, long words one per ~6 characters, punctuation one each
+_TOKEN_RE = re.compile(r"\w{1,6}|[^\w\s]")
+
+# A blank (or whitespace-only) line ends a paragraph; PDF text pads its lines with spaces
+_PARAGRAPH_END = re.compile(r"\n[ \t]*\n\s*")
+_SENTENCE_END = re.compile(r'[.!?]["\')\]]?\s+')
+_LINE_END = re.compile(r"\n")
+
+
+def estimate_tokens(text: str) -> int:
+    """Fast local token estimate (no tokenizer download, within ~15% of Llama counts on English text)"""
+    return len(_TOKEN_RE.findall(text))
+
+
+def fingerprint(text: str) -> str:
+    """Whitespace-insensitive 128-bit content hash, so PDF re-rendering noise does not count as an edit"""
+    return hashlib.sha256(' '.join(text.split()).encode('utf-8')).hexdigest()[:32]
+
+
+def _pieces(text: str, boundary: re.Pattern) -> Iterator[str]:
+    """Split text after every boundary match; the pieces concatenate back to text"""
+    start = 0
+    for match in boundary.finditer(text):
+        yield text[start:match.end()]
+        start = match.end()
+    if start < len(text):
+        yield text[start:]
+
+
+def _is_heading(paragraph: str) -> bool:
+    """A paragraph opening with a short unpunctuated line, e.g. 'Professional Experience'"""
+    lines = paragraph.strip().split('\n', 1)
+    first = lines[0].strip()
+    return len(lines) > 1 and 0 < len(first) <= 60 and first[-1] not in '.,;:!?'
+
+
+class TokenChunker:
+    """Greedy linear-time packer of text into chunks of at most `budget` estimated tokens"""
+
+    def __init__(self, budget: int = None, section_fill: float = 0.85):
+        if budget is None:
+            budget = int(os.environ.get("CHUNK_TOKEN_BUDGET", "1500"))
+        self.budget = max(1, budget)
+        # Once a chunk is this full, a new section starts a new chunk rather than being split across two
+        self.section_fill = section_fill
+
+    def _hard_split(self, text: str) -> Iterator[Tuple[str, int]]:
+        """Cut a sentence longer than the budget at token boundaries"""
+        start = 0
+        count = 0
+        for match in _TOKEN_RE.finditer(text):
+            if count == self.budget:
+                yield text[start:match.start()], count
+                start = match.start()
+                count = 0
+            count += 1
+        yield text[start:], count
+
+    def _fit(self, text: str, boundaries: Tuple[re.Pattern, ...]) -> Iterator[Tuple[str, int]]:
+        """Pieces of text within the budget, using the coarsest boundary that makes them fit"""
+        tokens = estimate_tokens(text)
+        if tokens <= self.budget:
+            yield text, tokens
+        elif not boundaries:
+            yield from self._hard_split(text)
+        else:
+            for piece in _pieces(text, boundaries[0]):
+                yield from self._fit(piece, boundaries[1:])
+
+    def _units(self, text: str) -> Iterator[Tuple[str, int, bool]]:
+        """(text, tokens, starts_section) units no larger than the budget: paragraphs, else sentences, else lines"""
+        for paragraph in _pieces(text, _PARAGRAPH_END):
+            heading = _is_heading(paragraph)
+            for part, tokens in self._fit(paragraph, (_SENTENCE_END, _LINE_END)):
+                yield part, tokens, heading
+                heading = False
+
+    def iter_chunks(self, texts: Iterable[str]) -> Iterator[str]:
+        """Pack a stream of consecutive text pieces (e.g. pages or blocks) into chunks as they arrive"""
+        buffer = []
+        size = 0
+        for text in texts:
+            for unit, tokens, heading in self._units(text):
+                full = size + tokens > self.budget
+                if buffer and (full or (heading and size >= self.section_fill * self.budget)):
+                    chunk = "".join(buffer).strip()
+                    if chunk:
+                        yield chunk
+                    buffer = []
+                    size = 0
+                buffer.append(unit)
+                size += tokens
+
+        chunk = "".join(buffer).strip()
+        if chunk:
+            yield chunk
+
+    def split(self, text: str) -> List[str]:
+        """All chunks of text"""
+        return list(self.iter_chunks([text]))
+
+    def page_units(self, pages: Iterable[str]) -> List[Tuple[str, int, bool, str]]:
+        """(text, tokens, starts_section, fingerprint) units of each page in order; no unit spans two pages"""
+        return [(unit, tokens, heading, fingerprint(unit))
+                for page in pages for unit, tokens, heading in self._units(page)]
+
+    def pack_units(self, units: List[Tuple[str, int, bool, str]],
+                   layouts: Dict[str, List[Tuple[str, ...]]] = None) -> List[Tuple[str, Tuple[str, ...], bool]]:
+        """
+        Chunks as (text, unit fingerprints, reused layout)
+        layouts maps a unit fingerprint to the unit sequences of earlier chunks starting with it. Where the
+        units repeat one of those sequences, the chunk is packed exactly as before, so editing a page leaves
+        every other chunk (and its stored result) intact; everything else is packed as iter_chunks does.
+        """
+        layouts = layouts or {}
+        fingerprints = [unit[3] for unit in units]
+        planned = []
+        buffer = []
+        size = 0
+
+        def flush():
+            chunk = "".join(unit[0] for unit in buffer).strip()
+            if chunk:
+                planned.append((chunk, tuple(unit[3] for unit in buffer), False))
+
+        i = 0
+        while i < len(units):
+            match = ()
+            for layout in layouts.get(fingerprints[i], ()):
+                if len(layout) > len(match) and tuple(fingerprints[i:i + len(layout)]) == layout:
+                    match = layout
+            if match:
+                flush()
+                buffer = []
+                size = 0
+                planned.append(("".join(unit[0] for unit in units[i:i + len(match)]).strip(), match, True))
+                i += len(match)
+                continue
+
+            unit, tokens, heading, _ = units[i]
+            full = size + tokens > self.budget
+            if buffer and (full or (heading and size >= self.section_fill * self.budget)):
+                flush()
+                buffer = []
+                size = 0
+            buffer.append(units[i])
+            size += tokens
+            i += 1
+        flush()
+        return planned
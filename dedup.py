@@ -0,0 +1,217 @@
+"""
+Fuzzy Entry De-duplication
+Normalizes keys and values, finds near-duplicate candidates by blocking and one-permutation MinHash LSH,
+verifies them and merges with union-find, in close to linear time
+"""
+
+import os
+import re
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_MONTHS = {
+    'jan': 1, 'january': 1, 'feb': 2, 'february': 2, 'mar': 3, 'march': 3, 'apr': 4, 'april': 4, 'may': 5,
+    'jun': 6, 'june': 6, 'jul': 7, 'july': 7, 'aug': 8, 'august': 8, 'sep': 9, 'sept': 9, 'september': 9,
+    'oct': 10, 'october': 10, 'nov': 11, 'november': 11, 'dec': 12, 'december': 12
+}
+_MONTH = r'(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sept?(?:ember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?'
+# Applied to lowercased text
+_DATE_MDY = re.compile(rf'\b{_MONTH}\s+(\d{{1,2}})(?:st|nd|rd|th)?,?\s+(\d{{4}})\b')
+_DATE_DMY = re.compile(rf'\b(\d{{1,2}})(?:st|nd|rd|th)?\s+(?:of\s+)?{_MONTH},?\s+(\d{{4}})\b')
+_DATE_MY = re.compile(rf'\b{_MONTH},?\s+(\d{{4}})\b')
+_DATE_ISO = re.compile(r'\b(\d{4})[-/.](\d{1,2})[-/.](\d{1,2})\b')
+_DATE_NUMERIC = re.compile(r'\b(\d{1,2})[-/.](\d{1,2})[-/.](\d{4})\b')
+_THOUSANDS = re.compile(r'(?<=\d),(?=\d{3}\b)')
+_TRAILING_ZEROS = re.compile(r'(?<=\d)\.0+\b')
+_DIGITS = re.compile(r'\d+')
+_TOKEN = re.compile(r'[a-z0-9]+')
+
+_KEY_STOPWORDS = frozenset(['a', 'an', 'the', 'of', 'and', 'in', 'on', 'for', 'to', 'at', 'by', 'with', 's'])
+
+
+def _iso(year: str, month: int, day: str = None) -> str:
+    if not 1 <= month <= 12 or (day is not None and not 1 <= int(day) <= 31):
+        return None
+    return f"{year}-{month:02d}" if day is None else f"{year}-{month:02d}-{int(day):02d}"
+
+
+def _numeric_date(match: re.Match) -> str:
+    first, second, year = match.groups()
+    # 03/04/1989 could be either order; only rewrite when one part can only be a day
+    if int(first) > 12:
+        iso = _iso(year, int(second), first)
+    elif int(second) > 12:
+        iso = _iso(year, int(first), second)
+    else:
+        iso = None
+    return iso or match.group()
+
+
+def normalize_value(value: Any) -> str:
+    """Lowercase, single-spaced value with dates as ISO (YYYY-MM-DD / YYYY-MM) and plain numbers"""
+    text = ' '.join(str(value).lower().split())
+    if _DIGITS.search(text):
+        text = _DATE_MDY.sub(lambda m: _iso(m.group(3), _MONTHS[m.group(1)], m.group(2)) or m.group(), text)
+        text = _DATE_DMY.sub(lambda m: _iso(m.group(3), _MONTHS[m.group(2)], m.group(1)) or m.group(), text)
+        text = _DATE_MY.sub(lambda m: _iso(m.group(2), _MONTHS[m.group(1)]) or m.group(), text)
+        text = _DATE_ISO.sub(lambda m: _iso(m.group(1), int(m.group(2)), m.group(3)) or m.group(), text)
+        text = _DATE_NUMERIC.sub(_numeric_date, text)
+        text = _TRAILING_ZEROS.sub('', _THOUSANDS.sub('', text))
+    return text.strip(' .,;:')
+
+
+def key_tokens(key: Any) -> frozenset:
+    """Order-free key tokens without stopwords or plural s ('Date of Birth' == 'Birth Date')"""
+    tokens = set()
+    for token in _TOKEN.findall(str(key).lower()):
+        if token in _KEY_STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        tokens.add(token)
+    return frozenset(tokens)
+
+
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class _DisjointSet:
+    """Union-find whose root is always the earliest index, so the first occurrence of an entry survives"""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, a: int, b: int):
+        a, b = self.find(a), self.find(b)
+        if a != b:
+            if b < a:
+                a, b = b, a
+            self.parent[b] = a
+
+
+class EntryDeduplicator:
+    """
+    Two entries are duplicates when their keys name the same field (one key's tokens contain the other's,
+    token Jaccard >= key_threshold, same numbers) and their values are equal after normalization, or
+    similar (character-trigram Jaccard >= value_threshold) with identical digit runs, so near-identical
+    text merges but different numbers never do.
+    Candidates come from three blocks: normalized (key, value), normalized value, and MinHash LSH bands
+    over value trigrams (bands x rows bins); each entry is compared with at most max_block earlier
+    entries per block, which keeps the whole pass close to linear. Merges go through a union-find whose
+    root is the earliest entry; that entry is the one kept.
+    """
+
+    def __init__(self, key_threshold: float = 0.8, value_threshold: float = 0.8, bands: int = 4, rows: int = 4,
+                 min_fuzzy_chars: int = 12, max_block: int = 32):
+        self.key_threshold = key_threshold
+        self.value_threshold = value_threshold
+        self.bands = bands
+        self.rows = rows
+        self.min_fuzzy_chars = min_fuzzy_chars
+        self.max_block = max_block
+
+    def _signature(self, shingles: frozenset) -> List[int]:
+        """One-permutation MinHash: minimum hash per bin, empty bins filled from the next non-empty one"""
+        bins = self.bands * self.rows
+        signature = [None] * bins
+        for shingle in shingles:
+            h = zlib.crc32(shingle.encode('utf-8'))
+            index = h % bins
+            value = h // bins
+            current = signature[index]
+            if current is None or value < current:
+                signature[index] = value
+        for index in range(bins):
+            if signature[index] is None:
+                step = 1
+                while signature[(index + step) % bins] is None:
+                    step += 1
+                signature[index] = (step, signature[(index + step) % bins])
+        return signature
+
+    def _similar(self, a: Tuple, b: Tuple) -> bool:
+        """a and b are feature tuples: (key tokens, normalized value, digit runs, trigrams, key numbers)"""
+        # 'Skill 1' and 'Skill 2' (or 'Q1'/'Q2 Revenue') are different fields however similar the rest is
+        if a[4] != b[4] or _jaccard(a[0], b[0]) < self.key_threshold:
+            return False
+        # A word in each key that the other lacks (PMP vs AWS Certification Year) makes them different fields
+        if not (a[0] <= b[0] or b[0] <= a[0]):
+            return False
+        if a[1] == b[1]:
+            return True
+        if a[2] != b[2] or a[3] is None or b[3] is None:
+            return False
+        return _jaccard(a[3], b[3]) >= self.value_threshold
+
+    def clusters(self, entries: List[Dict[str, Any]]) -> List[int]:
+        """Cluster root (index of its first entry) for every entry"""
+        sets = _DisjointSet(len(entries))
+        blocks: Dict[Any, List[int]] = {}
+        features = []
+        for i, entry in enumerate(entries):
+            tokens = key_tokens(entry.get('Key') or entry.get('key', ''))
+            value = normalize_value(entry.get('Value') or entry.get('value', ''))
+            trigrams = None
+            if len(value) >= self.min_fuzzy_chars:
+                padded = f" {value} "
+                trigrams = frozenset(padded[j:j + 3] for j in range(len(padded) - 2))
+            key_numbers = frozenset(token for token in tokens if _DIGITS.search(token))
+            feature = (tokens, value, tuple(_DIGITS.findall(value)), trigrams, key_numbers)
+            features.append(feature)
+
+            # Exact after normalization: a dict hit, no comparison needed
+            exact = blocks.setdefault(('kv', tokens, value), [])
+            if exact:
+                sets.union(exact[0], i)
+                continue
+            exact.append(i)
+
+            block_keys = [('v', value)]
+            if trigrams is not None:
+                signature = self._signature(trigrams)
+                block_keys.extend(('lsh', band, tuple(signature[band * self.rows:(band + 1) * self.rows]))
+                                  for band in range(self.bands))
+            # Compared with the surviving first entry of each candidate's cluster, and joining only the first
+            # cluster that matches, so chains (Salary ~ Current Salary ~ Previous Salary) cannot form
+            compared = set()
+            merged = False
+            for block_key in block_keys:
+                members = blocks.setdefault(block_key, [])
+                for j in members:
+                    if merged:
+                        break
+                    root = sets.find(j)
+                    if root not in compared:
+                        compared.add(root)
+                        if self._similar(features[root], feature):
+                            sets.union(root, i)
+                            merged = True
+                if len(members) < self.max_block:
+                    members.append(i)
+        return [sets.find(i) for i in range(len(entries))]
+
+    def dedupe(self, entries: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """First entry of every near-duplicate cluster, in input order"""
+        entries = list(entries)
+        roots = self.clusters(entries)
+        return [entry for i, entry in enumerate(entries) if roots[i] == i]
+
+
+def deduplicator_from_env() -> Optional[EntryDeduplicator]:
+    """Fuzzy de-duplicator from DEDUP_* environment variables (None when DEDUP_MODE=exact)"""
+    if os.environ.get("DEDUP_MODE", "fuzzy") == "exact":
+        return None
+    return EntryDeduplicator(
+        key_threshold=float(os.environ.get("DEDUP_KEY_THRESHOLD", "0.8")),
+        value_threshold=float(os.environ.get("DEDUP_VALUE_THRESHOLD", "0.8"))
+    )
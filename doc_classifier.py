@@ -0,0 +1,125 @@
+"""
+Local Document-Type Classifier
+Keyword TF-IDF scoring over the start of a document, so common types need no LLM round trip
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+_WORD = re.compile(r'[a-z0-9]+')
+
+# Label -> (aliases an LLM might answer with, indicative terms); labels match the extraction prompt's examples
+DOCUMENT_TYPES: Dict[str, Tuple[List[str], List[str]]] = {
+    'Personal Resume': (
+        ['resume', 'cv', 'curriculum vitae', 'personal profile', 'biography', 'biodata'],
+        ['resume', 'curriculum vitae', 'professional summary', 'professional experience', 'work experience',
+         'experience', 'employment history', 'career', 'education', 'skills', 'certifications', 'certified',
+         'linkedin', 'born', 'nationality', 'university', 'bachelor', 'degree', 'internship', 'proficient',
+         'objective', 'achievements', 'gpa']
+    ),
+    'Sales Invoice': (
+        ['invoice', 'bill', 'receipt'],
+        ['invoice', 'invoice number', 'invoice date', 'bill to', 'ship to', 'due date', 'subtotal', 'vat',
+         'tax', 'total due', 'amount due', 'qty', 'quantity', 'unit price', 'payment terms', 'remit']
+    ),
+    'Legal Contract': (
+        ['contract', 'agreement', 'lease', 'terms of service', 'nda', 'memorandum of understanding'],
+        ['agreement', 'contract', 'parties', 'party', 'hereby', 'whereas', 'shall', 'governing law',
+         'termination', 'indemnify', 'in witness whereof', 'clause', 'obligations', 'confidentiality',
+         'jurisdiction', 'effective date', 'hereinafter']
+    ),
+    'Technical Report': (
+        ['report', 'paper', 'study', 'whitepaper', 'white paper', 'thesis'],
+        ['abstract', 'introduction', 'methodology', 'conclusion', 'conclusions', 'figure', 'table of contents',
+         'appendix', 'experiment', 'findings', 'recommendations', 'executive summary', 'references', 'discussion',
+         'scope']
+    ),
+    'Financial Statement': (
+        ['financial statement', 'annual report', 'balance sheet', 'income statement', 'financial report'],
+        ['balance sheet', 'income statement', 'cash flow', 'assets', 'liabilities', 'equity', 'revenue',
+         'net income', 'fiscal year', 'earnings', 'operating expenses', 'depreciation', 'shareholders']
+    ),
+    'Bank Statement': (
+        ['bank statement', 'account statement'],
+        ['account number', 'statement period', 'opening balance', 'closing balance', 'deposit', 'withdrawal',
+         'transaction', 'debit', 'credit', 'available balance', 'iban', 'sort code', 'branch']
+    ),
+    'Medical Record': (
+        ['medical', 'clinical', 'patient', 'discharge summary', 'prescription', 'health record'],
+        ['patient', 'diagnosis', 'prescription', 'dosage', 'symptoms', 'medical history', 'physician',
+         'blood pressure', 'allergies', 'treatment', 'hospital', 'clinic', 'mg', 'admitted', 'discharge']
+    ),
+    'Purchase Order': (
+        ['purchase order', 'order form', 'po'],
+        ['purchase order', 'po number', 'vendor', 'supplier', 'delivery date', 'ordered', 'requisition',
+         'ship via', 'buyer', 'order date']
+    ),
+}
+
+
+class DocumentTypeClassifier:
+    """
+    Scores each type by sum((1 + log tf) * idf) over its terms found in the first sample_chars characters
+    Terms shared by several types get a lower idf. The label is returned only when the best score is
+    at least min_score and beats the runner-up by the relative margin min_margin; otherwise None.
+    """
+
+    def __init__(self, types: Dict[str, Tuple[List[str], List[str]]] = None, min_score: float = 4.0,
+                 min_margin: float = 0.4, sample_chars: int = 4000):
+        self.types = types or DOCUMENT_TYPES
+        self.min_score = min_score
+        self.min_margin = min_margin
+        self.sample_chars = sample_chars
+
+        document_frequency = Counter(term for _, terms in self.types.values() for term in set(terms))
+        self._idf = {term: math.log(1 + len(self.types) / df) for term, df in document_frequency.items()}
+        self._labels_by_term: Dict[str, List[str]] = {}
+        for label, (_, terms) in self.types.items():
+            for term in terms:
+                self._labels_by_term.setdefault(term, []).append(label)
+        # Single words are counted from one tokenization pass, phrases with str.count (both run in C)
+        self._words = [term for term in document_frequency if ' ' not in term]
+        self._phrases = [term for term in document_frequency if ' ' in term]
+        self._aliases = sorted(((alias, label) for label, (aliases, _) in self.types.items() for alias in aliases),
+                               key=lambda item: len(item[0]), reverse=True)
+
+    def scores(self, text: str) -> Dict[str, float]:
+        """Score of every type that has at least one term in the sample"""
+        sample = ' '.join(text[:self.sample_chars].lower().split())
+        words = Counter(_WORD.findall(sample))
+        found = [(term, words[term]) for term in self._words]
+        found.extend((phrase, sample.count(phrase)) for phrase in self._phrases)
+        scores: Dict[str, float] = {}
+        for term, tf in found:
+            if not tf:
+                continue
+            weight = (1 + math.log(tf)) * self._idf[term]
+            for label in self._labels_by_term[term]:
+                scores[label] = scores.get(label, 0.0) + weight
+        return scores
+
+    def classify(self, text: str) -> Tuple[Optional[str], float]:
+        """(label, confidence); label is None when the classifier is not confident enough"""
+        ranked = sorted(self.scores(text).items(), key=lambda item: item[1], reverse=True)
+        if not ranked:
+            return None, 0.0
+        best_label, best = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+        confidence = (best - runner_up) / best
+        if best < self.min_score or confidence < self.min_margin:
+            return None, confidence
+        return best_label, confidence
+
+    def canonical_label(self, label: str) -> Optional[str]:
+        """Map a free-text label (e.g. an LLM's 'Professional CV') onto one of the known types"""
+        lowered = label.lower()
+        for alias, canonical in self._aliases:
+            if re.search(rf'\b{re.escape(alias)}\b', lowered):
+                return canonical
+        return None
+
+
+# Process-wide classifier; construction compiles the term pattern once
+DOC_CLASSIFIER = DocumentTypeClassifier()
@@ -0,0 +1,72 @@
+"""
+Engine Racing
+Runs the millisecond rule engine and the AI pipeline side by side: the rule result is published at once
+and replaced by the merged AI result if that arrives before the deadline
+"""
+
+import time
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Any, Callable, List, Optional, Tuple
+
+from metrics import METRICS, timed
+
+# Race outcomes, also the labels of the race_outcome_total counter
+MERGED = 'merged'          # AI finished in time; its entries were merged into the rule entries
+DEADLINE = 'deadline'      # AI missed the deadline; the rule result stands
+AI_FAILED = 'ai_failed'    # AI raised; the rule result stands
+AI_ONLY = 'ai_only'        # Rules found nothing, so the AI result was awaited without a deadline
+
+
+def _start(fn: Callable[[], Any]) -> Future:
+    """Run fn on a daemon thread; a run that misses the deadline cannot hold up shutdown"""
+    future = Future()
+
+    def run():
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name='race-ai', daemon=True).start()
+    return future
+
+
+def race_engines(fast: Callable[[], List[Any]], slow: Callable[[], List[Any]], deadline: float,
+                 merge: Callable[[List[Any], List[Any]], List[Any]],
+                 publish: Callable[[List[Any]], None] = None) -> Tuple[List[Any], str]:
+    """
+    Start slow() in the background, run fast() here and publish its entries, then wait for slow()
+    Returns (entries, outcome). The wait ends deadline seconds after the race started; a late AI run
+    is left to finish on its own (its responses still warm the LLM cache and chunk store) and dropped.
+    An empty fast result is not published, and then slow() is awaited without a deadline.
+    """
+    started = time.monotonic()
+    future = _start(slow)
+
+    with timed('race_fast'):
+        entries = fast()
+    if not entries:
+        ai_entries = future.result()
+        METRICS.inc('race_outcome_total', outcome=AI_ONLY)
+        return ai_entries, AI_ONLY
+
+    if publish is not None:
+        publish(entries)
+
+    remaining = max(0.0, deadline - (time.monotonic() - started))
+    outcome = MERGED
+    ai_entries: Optional[List[Any]] = None
+    with timed('race_ai_wait'):
+        try:
+            ai_entries = future.result(timeout=remaining)
+        except FutureTimeout:
+            outcome = DEADLINE
+        except Exception as e:
+            print(f"  ⚠️  AI engine failed, keeping the rule result: {e}")
+            outcome = AI_FAILED
+    METRICS.inc('race_outcome_total', outcome=outcome)
+    if ai_entries is None:
+        return entries, outcome
+    return merge(entries, ai_entries), outcome
@@ -0,0 +1,191 @@
+"""
+Compact Extraction Entries
+Slotted Category/Key/Value/Comments records with interned labels, and a columnar batch for bulk work
+"""
+
+import sys
+from array import array
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Union
+
+# Dict-style field names (the Excel headers) -> attribute names
+_FIELDS = {'Category': 'category', 'Key': 'key', 'Value': 'value', 'Comments': 'comments'}
+
+
+def _intern(text: Any) -> Any:
+    return sys.intern(text) if type(text) is str else text
+
+
+class Entry:
+    """
+    One extracted row, about half the size of the dict it replaces
+    Category and key strings are interned, so the few distinct labels are shared by every row. Reads like
+    the old dicts (entry['Key'], entry.get('Value'), dict(entry)) so existing consumers keep working.
+    """
+
+    __slots__ = ('category', 'key', 'value', 'comments')
+
+    def __init__(self, category: str, key: str, value: Any, comments: str = ''):
+        self.category = _intern(category)
+        self.key = _intern(key)
+        self.value = value
+        self.comments = comments
+
+    @classmethod
+    def from_dict(cls, item: Dict[str, Any]) -> 'Entry':
+        """Entry from a dict with Excel-style or lowercase field names"""
+        return cls(
+            item.get('Category') or item.get('category', ''),
+            item.get('Key') or item.get('key', ''),
+            item.get('Value') or item.get('value', ''),
+            item.get('Comments') or item.get('comment') or item.get('comments', '')
+        )
+
+    def __getitem__(self, name: str) -> Any:
+        try:
+            return getattr(self, _FIELDS[name])
+        except KeyError:
+            raise KeyError(name) from None
+
+    def get(self, name: str, default: Any = None) -> Any:
+        field = _FIELDS.get(name)
+        return getattr(self, field) if field else default
+
+    def __contains__(self, name: str) -> bool:
+        return name in _FIELDS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_FIELDS)
+
+    def __len__(self) -> int:
+        return len(_FIELDS)
+
+    def keys(self):
+        return _FIELDS.keys()
+
+    def values(self) -> List[Any]:
+        return [self.category, self.key, self.value, self.comments]
+
+    def items(self):
+        return zip(_FIELDS, self.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    def row(self) -> List[Any]:
+        """Category/Key/Value/Comments cells for the Excel exporter"""
+        return [self.category, self.key, self.value, self.comments]
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Entry):
+            return self.values() == other.values()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        # Rebuild through __init__ so labels are interned again in the receiving process
+        return (Entry, (self.category, self.key, self.value, self.comments))
+
+    def __repr__(self) -> str:
+        return (f"Entry(category={self.category!r}, key={self.key!r}, value={self.value!r}, "
+                f"comments={self.comments!r})")
+
+
+class EntryBatch:
+    """
+    Columnar storage for many entries (e.g. a batch run's merged output)
+    Categories, keys and comments are stored as 32-bit codes into one shared string table, values as a
+    plain list. Iterating yields Entry objects; rows() feeds the Excel exporter without building them.
+    """
+
+    __slots__ = ('_strings', '_codes', '_categories', '_keys', '_comments', '_values')
+
+    def __init__(self, entries: Iterable[Any] = ()):
+        self._strings: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self._categories = array('I')
+        self._keys = array('I')
+        self._comments = array('I')
+        self._values: List[Any] = []
+        self.extend(entries)
+
+    def _code(self, text: Any) -> int:
+        text = '' if text is None else str(text)
+        code = self._codes.get(text)
+        if code is None:
+            code = self._codes[text] = len(self._strings)
+            self._strings.append(text)
+        return code
+
+    def append(self, category: str, key: str, value: Any, comments: str = ''):
+        self._categories.append(self._code(category))
+        self._keys.append(self._code(key))
+        self._comments.append(self._code(comments))
+        self._values.append(value)
+
+    def add(self, entry: Union[Entry, Dict[str, Any]]):
+        """Append an Entry or an entry dict"""
+        if not isinstance(entry, Entry):
+            entry = Entry.from_dict(entry)
+        self.append(entry.category, entry.key, entry.value, entry.comments)
+
+    def extend(self, entries: Iterable[Any]):
+        if isinstance(entries, EntryBatch):
+            for row in entries.rows():
+                self.append(*row)
+        else:
+            for entry in entries:
+                self.add(entry)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getitem__(self, index: int) -> Entry:
+        strings = self._strings
+        return Entry(strings[self._categories[index]], strings[self._keys[index]], self._values[index],
+                     strings[self._comments[index]])
+
+    def __iter__(self) -> Iterator[Entry]:
+        strings = self._strings
+        for category, key, value, comments in zip(self._categories, self._keys, self._values, self._comments):
+            yield Entry(strings[category], strings[key], value, strings[comments])
+
+    def rows(self) -> Iterator[List[Any]]:
+        """Category/Key/Value/Comments cells, decoded straight from the columns"""
+        strings = self._strings
+        for category, key, value, comments in zip(self._categories, self._keys, self._values, self._comments):
+            yield [strings[category], strings[key], value, strings[comments]]
+
+    def category_counts(self) -> Dict[str, int]:
+        """Entries per category, counted over the integer codes"""
+        return {self._strings[code]: count for code, count in Counter(self._categories).items()}
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [entry.to_dict() for entry in self]
+
+    def __getstate__(self):
+        return (self._strings, self._categories, self._keys, self._comments, self._values)
+
+    def __setstate__(self, state):
+        self._strings, self._categories, self._keys, self._comments, self._values = state
+        self._codes = {text: code for code, text in enumerate(self._strings)}
+
+
+def category_counts(entries: Iterable[Any]) -> Dict[str, int]:
+    """Entries per category for an EntryBatch or any iterable of entries/dicts"""
+    if isinstance(entries, EntryBatch):
+        return entries.category_counts()
+    return dict(Counter(entry.category if type(entry) is Entry else entry.get('Category', 'Uncategorized')
+                        for entry in entries))
+
+
+def json_default(obj: Any) -> Any:
+    """`default=` hook for json.dump(s): entries serialize as the dicts they replace"""
+    if isinstance(obj, Entry):
+        return obj.to_dict()
+    if isinstance(obj, EntryBatch):
+        return obj.to_dicts()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
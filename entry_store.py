@@ -0,0 +1,305 @@
+"""
+Extracted Entry Store
+Documents and their Category/Key/Value/Comments rows in SQLite, with an FTS5 full-text index
+
+Usage:
+    python entry_store.py docs
+    python entry_store.py find --key "Current Company" --value "Infosys"
+    python entry_store.py search "aws certified"
+    python entry_store.py stats
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+from excel_export import entry_rows
+
+
+def like_pattern(text: str) -> str:
+    """LIKE pattern matching text anywhere, with its %, _ and \\ taken literally (use with ESCAPE '\\')"""
+    escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+
+def fts_query(text: str) -> str:
+    """Plain words to an FTS5 query: every word must match, the last one as a prefix"""
+    words = [''.join(ch if ch.isalnum() or ch == '_' else ' ' for ch in word).split() for word in text.split()]
+    terms = [term for group in words for term in group]
+    if not terms:
+        return ''
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += '*'
+    return ' AND '.join(quoted)
+
+
+class EntryStore:
+    """Persistent, queryable home of extraction results; shared by every worker through one SQLite file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS documents (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    content_sha256 TEXT,
+                    engine TEXT,
+                    doc_type TEXT,
+                    entry_count INTEGER NOT NULL,
+                    created REAL NOT NULL,
+                    metadata TEXT
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    id INTEGER PRIMARY KEY,
+                    document_id INTEGER NOT NULL,
+                    position INTEGER NOT NULL,
+                    category TEXT,
+                    key TEXT,
+                    value TEXT,
+                    comments TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_documents_sha ON documents(content_sha256, engine)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_document ON entries(document_id, position)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_key_value "
+                         "ON entries(key COLLATE NOCASE, value COLLATE NOCASE)")
+            # find_entries by value or category alone cannot use the (key, value) index
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_value ON entries(value COLLATE NOCASE)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_category ON entries(category COLLATE NOCASE)")
+            self.fts = self._create_fts(conn)
+
+    @staticmethod
+    def _create_fts(conn: sqlite3.Connection) -> bool:
+        """External-content FTS5 index kept in sync by triggers; False if this SQLite lacks FTS5"""
+        try:
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+                    category, key, value, comments,
+                    content='entries', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+                )
+            """)
+        except sqlite3.OperationalError:
+            return False
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS entries_fts_insert AFTER INSERT ON entries BEGIN
+                INSERT INTO entries_fts(rowid, category, key, value, comments)
+                VALUES (new.id, new.category, new.key, new.value, new.comments);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS entries_fts_delete AFTER DELETE ON entries BEGIN
+                INSERT INTO entries_fts(entries_fts, rowid, category, key, value, comments)
+                VALUES ('delete', old.id, old.category, old.key, old.value, old.comments);
+            END
+        """)
+        return True
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def add_document(self, name: str, entries: Iterable[Dict[str, Any]], engine: str = None,
+                     content_sha256: str = None, doc_type: str = None, metadata: Dict[str, Any] = None) -> int:
+        """
+        Store one document's entries and return its id
+        A document with the same name, content hash and engine is replaced, so re-extractions do not pile up;
+        identical bytes under another name (a copy elsewhere) are kept as a document of their own.
+        """
+        rows = [[str(value) if value is not None else '' for value in row] for row in entry_rows(entries)]
+        with self._connect() as conn:
+            if content_sha256:
+                stale = self._find(conn, name, content_sha256, engine)
+                for document_id in stale:
+                    conn.execute("DELETE FROM entries WHERE document_id = ?", (document_id,))
+                    conn.execute("DELETE FROM documents WHERE id = ?", (document_id,))
+            document_id = conn.execute(
+                "INSERT INTO documents (name, content_sha256, engine, doc_type, entry_count, created, metadata) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (name, content_sha256, engine, doc_type, len(rows), time.time(),
+                 json.dumps(metadata) if metadata else None)
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO entries (document_id, position, category, key, value, comments) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(document_id, position, *row) for position, row in enumerate(rows)]
+            )
+        return document_id
+
+    @staticmethod
+    def _find(conn: sqlite3.Connection, name: str, content_sha256: str, engine: str) -> List[int]:
+        return [row[0] for row in conn.execute(
+            "SELECT id FROM documents WHERE content_sha256 = ? AND engine IS ? AND name = ?",
+            (content_sha256, engine, name)
+        )]
+
+    def has_document(self, name: str, content_sha256: str, engine: str = None) -> bool:
+        """Whether add_document already stored this name, content and engine"""
+        return bool(self._find(self._connect(), name, content_sha256, engine))
+
+    def delete_document(self, document_id: int) -> bool:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM entries WHERE document_id = ?", (document_id,))
+            return conn.execute("DELETE FROM documents WHERE id = ?", (document_id,)).rowcount > 0
+
+    @staticmethod
+    def _document(row: sqlite3.Row) -> Dict[str, Any]:
+        document = dict(row)
+        document['metadata'] = json.loads(document['metadata']) if document['metadata'] else {}
+        return document
+
+    def list_documents(self, limit: int = 50, offset: int = 0, name: str = None) -> List[Dict[str, Any]]:
+        """Newest documents first, optionally those whose name contains `name`"""
+        sql = "SELECT * FROM documents"
+        params: List[Any] = []
+        if name:
+            sql += " WHERE name LIKE ? ESCAPE '\\'"
+            params.append(like_pattern(name))
+        sql += " ORDER BY id DESC LIMIT ? OFFSET ?"
+        params += [limit, offset]
+        return [self._document(row) for row in self._connect().execute(sql, params)]
+
+    def get_document(self, document_id: int) -> Optional[Dict[str, Any]]:
+        """A document with its entries in extraction order"""
+        conn = self._connect()
+        row = conn.execute("SELECT * FROM documents WHERE id = ?", (document_id,)).fetchone()
+        if row is None:
+            return None
+        document = self._document(row)
+        document['entries'] = [
+            {'Category': entry['category'], 'Key': entry['key'], 'Value': entry['value'],
+             'Comments': entry['comments']}
+            for entry in conn.execute(
+                "SELECT category, key, value, comments FROM entries WHERE document_id = ? ORDER BY position",
+                (document_id,)
+            )
+        ]
+        return document
+
+    def find_entries(self, key: str = None, value: str = None, category: str = None,
+                     limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        """Entries whose key/value/category equal the given ones (case-insensitive), newest documents first"""
+        clauses = []
+        params: List[Any] = []
+        for column, wanted in (('e.key', key), ('e.value', value), ('e.category', category)):
+            if wanted is not None:
+                clauses.append(f"{column} = ? COLLATE NOCASE")
+                params.append(wanted)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._connect().execute(
+            f"SELECT e.document_id, d.name AS document, e.category, e.key, e.value, e.comments "
+            f"FROM entries e JOIN documents d ON d.id = e.document_id {where} "
+            f"ORDER BY e.id DESC LIMIT ? OFFSET ?",
+            params + [limit, offset]
+        )
+        return [dict(row) for row in rows]
+
+    def search(self, query: str, limit: int = 50, raw: bool = False) -> List[Dict[str, Any]]:
+        """
+        Full-text search over category, key, value and comments, best matches first
+        Plain words must all match (the last as a prefix); raw=True passes FTS5 query syntax through.
+        """
+        conn = self._connect()
+        if not self.fts:
+            # SQLite without FTS5: substring scan, same result shape
+            pattern = like_pattern(query)
+            rows = conn.execute(
+                "SELECT e.document_id, d.name AS document, e.category, e.key, e.value, e.comments "
+                "FROM entries e JOIN documents d ON d.id = e.document_id "
+                "WHERE e.key LIKE ?1 ESCAPE '\\' OR e.value LIKE ?1 ESCAPE '\\' "
+                "OR e.comments LIKE ?1 ESCAPE '\\' OR e.category LIKE ?1 ESCAPE '\\' "
+                "ORDER BY e.document_id DESC LIMIT ?",
+                (pattern, limit)
+            )
+            return [dict(row) for row in rows]
+
+        match = query if raw else fts_query(query)
+        if not match:
+            return []
+        # Rank inside the index first; only the top rows are joined to their entries and documents
+        rows = conn.execute(
+            "SELECT e.document_id, d.name AS document, e.category, e.key, e.value, e.comments "
+            "FROM (SELECT rowid, rank FROM entries_fts WHERE entries_fts MATCH ? ORDER BY rank LIMIT ?) hits "
+            "JOIN entries e ON e.id = hits.rowid JOIN documents d ON d.id = e.document_id ORDER BY hits.rank",
+            (match, limit)
+        )
+        return [dict(row) for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        conn = self._connect()
+        documents = conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+        entries = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return {'documents': documents, 'entries': entries, 'fts': self.fts,
+                'bytes': os.path.getsize(self.path) if os.path.exists(self.path) else 0}
+
+
+def _print_entries(rows: List[Dict[str, Any]]):
+    for row in rows:
+        print(f"  [{row['document_id']}] {row['document']} | {row['category']} | {row['key']}: {row['value']}")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Query extracted entries across documents")
+    parser.add_argument('--db', default=os.environ.get("ENTRY_DB_PATH"), help="store path (default: ENTRY_DB_PATH)")
+    paged = argparse.ArgumentParser(add_help=False)
+    paged.add_argument('--limit', type=int, default=20)
+    commands = parser.add_subparsers(dest='command', required=True)
+    docs = commands.add_parser('docs', parents=[paged], help="list documents, newest first")
+    docs.add_argument('--name', help="only documents whose name contains this")
+    show = commands.add_parser('show', help="print one document's entries")
+    show.add_argument('document_id', type=int)
+    find = commands.add_parser('find', parents=[paged], help="exact (case-insensitive) key/value/category lookup")
+    find.add_argument('--key')
+    find.add_argument('--value')
+    find.add_argument('--category')
+    search = commands.add_parser('search', parents=[paged], help="full-text search")
+    search.add_argument('query')
+    commands.add_parser('stats', help="document and entry counts")
+    args = parser.parse_args(argv)
+    if not args.db:
+        parser.error("no store: pass --db or set ENTRY_DB_PATH")
+
+    store = EntryStore(args.db)
+    start = time.perf_counter()
+    if args.command == 'docs':
+        for document in store.list_documents(args.limit, name=args.name):
+            print(f"  [{document['id']}] {document['name']} ({document['entry_count']} entries, "
+                  f"{document['engine'] or '-'}, {document['doc_type'] or '-'})")
+    elif args.command == 'show':
+        document = store.get_document(args.document_id)
+        if document is None:
+            print(f"❌ Document {args.document_id} not found")
+            return 1
+        print(f"📄 {document['name']} ({document['entry_count']} entries)")
+        for entry in document['entries']:
+            print(f"  {entry['Category']} | {entry['Key']}: {entry['Value']}")
+    elif args.command == 'find':
+        if args.key is None and args.value is None and args.category is None:
+            parser.error("find needs --key, --value and/or --category")
+        _print_entries(store.find_entries(args.key, args.value, args.category, limit=args.limit))
+    elif args.command == 'search':
+        _print_entries(store.search(args.query, limit=args.limit))
+    else:
+        print(json.dumps(store.stats(), indent=2))
+    print(f"⏱️  {(time.perf_counter() - start) * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,11 +4,10 @@ Extracts structured data from unstructured PDF documents into Excel format
 """
 
 import re
-import PyPDF2
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from datetime import datetime
-from typing import Dict, List, Tuple, Any
+from excel_export import write_entries_xlsx, entry_rows
+from pdf_text import extract_pdf_text, iter_pdf_pages, iter_text_blocks
+from typing import Dict, List, Tuple, Any, Iterator
 
 
 class DocumentExtractor:
@@ -21,14 +20,18 @@ class DocumentExtractor:
         
     def extract_text_from_pdf(self) -> str:
         """Extract all text content from PDF"""
-        with open(self.pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text()
+        text = extract_pdf_text(self.pdf_path)
         self.raw_text = text
         return text
     
+    def iter_pages(self) -> Iterator[str]:
+        """Yield the text of each PDF page as it is decoded"""
+        return iter_pdf_pages(self.pdf_path)
+    
+    def iter_text_blocks(self, block_size: int = 2000) -> Iterator[str]:
+        """Yield sentence-aligned text blocks of about block_size characters"""
+        return iter_text_blocks(self.iter_pages(), block_size)
+    
     def identify_key_value_pairs(self) -> List[Dict[str, Any]]:
         """
         Intelligently identify key-value relationships in unstructured text
@@ -610,56 +613,7 @@ class DocumentExtractor:
     
     def export_to_excel(self, output_path: str):
         """Export structured data to Excel with formatting"""
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Extracted Data"
-        
-        # Define headers
-        headers = ['Category', 'Key', 'Value', 'Comments']
-        ws.append(headers)
-        
-        # Style headers
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF", size=11)
-        
-        for cell in ws[1]:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-        
-        # Add data rows
-        for entry in self.structured_data:
-            ws.append([
-                entry.get('Category', ''),
-                entry.get('Key', ''),
-                entry.get('Value', ''),
-                entry.get('Comments', '')
-            ])
-        
-        # Apply styling to data rows
-        thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-        
-        for row in ws.iter_rows(min_row=2, max_row=ws.max_row):
-            for cell in row:
-                cell.border = thin_border
-                cell.alignment = Alignment(vertical="top", wrap_text=True)
-        
-        # Adjust column widths
-        ws.column_dimensions['A'].width = 20
-        ws.column_dimensions['B'].width = 35
-        ws.column_dimensions['C'].width = 30
-        ws.column_dimensions['D'].width = 60
-        
-        # Freeze header row
-        ws.freeze_panes = 'A2'
-        
-        # Save workbook
-        wb.save(output_path)
+        write_entries_xlsx(entry_rows(self.structured_data), output_path, widths=(20, 35, 30, 60))
         print(f"✓ Excel file created: {output_path}")
         print(f"✓ Total entries extracted: {len(self.structured_data)}")
 
@@ -6,85 +6,341 @@ Uses Groq API for generalized extraction from ANY PDF document
 import os
 import re
 import json
-import PyPDF2
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from typing import Dict, List, Any
+import uuid
+from collections import deque
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
+from entries import Entry
+from excel_export import write_entries_xlsx, entry_rows
+from pdf_text import extract_pdf_pages, iter_pdf_pages, iter_text_blocks
+from typing import Dict, List, Any, Iterator, Callable, Optional
 from groq import Groq
+from llm_cache import LLMResponseCache, cache_from_env
+from groq_client import get_shared_client
+from chunking import TokenChunker, estimate_tokens, fingerprint
+from chunk_store import ChunkStore, chunk_store_from_env
+from rate_limiter import RateLimitScheduler, get_shared_scheduler
+from metrics import METRICS, timed
+from doc_classifier import DOC_CLASSIFIER
+from dedup import EntryDeduplicator, deduplicator_from_env
 
 
 class AIDocumentExtractor:
     """Intelligent document extractor using Groq AI for any PDF type"""
     
-    def __init__(self, pdf_path: str, groq_api_key: str = None):
+    MODEL = "llama-3.3-70b-versatile"
+    
+    # Part of every chunk store key; bump when the chunk prompt or entry normalization changes
+    CHUNK_RESULT_VERSION = 1
+    
+    def __init__(self, pdf_path: str, groq_api_key: str = None, max_concurrency: int = None,
+                 base_url: str = None, cache: LLMResponseCache = None,
+                 progress_callback: Callable[[str, Dict[str, Any]], None] = None, client: Groq = None,
+                 chunk_tokens: int = None, scheduler: RateLimitScheduler = None, doc_type_mode: str = None,
+                 chunk_store: ChunkStore = None, deduplicator: EntryDeduplicator = None):
         self.pdf_path = pdf_path
         self.raw_text = ""
+        self.pages = []
         self.structured_data = []
+        self.doc_type = None
+        
+        # 'auto': local classifier, else ask for the type inside the first chunk's prompt; 'llm': separate call
+        self.doc_type_mode = doc_type_mode or os.environ.get("DOC_TYPE_MODE", "auto")
+        
+        # Receives (event, data) as pipeline stages finish, e.g. to stream progress to a browser
+        self.progress_callback = progress_callback
+        
+        # Number of chunks sent to Groq in parallel (1 = strictly sequential)
+        if max_concurrency is None:
+            max_concurrency = int(os.environ.get("GROQ_MAX_CONCURRENCY", "4"))
+        self.max_concurrency = max(1, max_concurrency)
         
-        # Initialize Groq client
-        api_key = groq_api_key or os.environ.get("GROQ_API_KEY")
-        if not api_key:
-            raise ValueError("Groq API key required. Set GROQ_API_KEY environment variable or pass as parameter.")
+        # Chunks are packed up to CHUNK_TOKEN_BUDGET estimated tokens at paragraph/sentence boundaries
+        self.chunker = TokenChunker(chunk_tokens)
         
-        self.client = Groq(api_key=api_key)
+        # Reuse the process-wide pooled client unless one is injected
+        self.client = client if client is not None else get_shared_client(groq_api_key, base_url)
+        
+        # Every call goes through the process-wide scheduler, which owns rate limits and retries,
+        # so the client's own retry loop is switched off; calls are queued fairly per extractor
+        self.scheduler = scheduler if scheduler is not None else get_shared_scheduler()
+        self._completions = self.client.with_options(max_retries=0).chat.completions.with_raw_response
+        self._job_key = uuid.uuid4().hex
+        
+        # Optional persistent response cache (LLM_CACHE_PATH enables it from the environment)
+        self.cache = cache if cache is not None else cache_from_env()
+        
+        # Optional per-chunk result store (CHUNK_STORE_PATH): a revised document only re-extracts changed chunks
+        self.chunk_store = chunk_store if chunk_store is not None else chunk_store_from_env()
+        self.chunk_report = {'total': 0, 'reused': 0}
+        self._reused = set()
+        
+        # Near-duplicate merging after the exact (Key, Value) pass; DEDUP_MODE=exact switches it off
+        self.deduplicator = deduplicator if deduplicator is not None else deduplicator_from_env()
         
     def extract_text_from_pdf(self) -> str:
         """Extract all text content from PDF"""
-        with open(self.pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text()
+        pages = extract_pdf_pages(self.pdf_path)
+        text = "".join(pages)
+        self.pages = pages
         self.raw_text = text
+        self._emit('pages_parsed', pages=len(pages), characters=len(text))
         return text
     
-    def analyze_document_with_ai(self) -> List[Dict[str, Any]]:
+    def _emit(self, event: str, **data):
+        """Report a pipeline stage to the progress callback, if any"""
+        if self.progress_callback is not None:
+            self.progress_callback(event, data)
+    
+    def iter_pages(self) -> Iterator[str]:
+        """Yield the text of each PDF page as it is decoded"""
+        return iter_pdf_pages(self.pdf_path)
+    
+    def iter_text_blocks(self, block_size: int = 2000) -> Iterator[str]:
+        """Yield sentence-aligned text blocks of about block_size characters"""
+        return iter_text_blocks(self.iter_pages(), block_size)
+    
+    def analyze_document_with_ai(self) -> List[Entry]:
         """
         Use Groq AI to intelligently analyze and extract structured data
         Works with ANY type of document
         """
         print("\n🤖 Using AI to analyze document...")
         
-        # Step 1: Identify document type and structure
-        doc_type = self._identify_document_type()
-        print(f"✓ Document type identified: {doc_type}")
+        # Step 1: Identify document type and structure (None: the first chunk reports it)
+        doc_type = self._resolve_document_type(self.raw_text)
         
         # Step 2: Extract structured data based on document type
         structured_data = self._extract_structured_data(doc_type)
         print(f"✓ Extracted {len(structured_data)} data entries")
         
+        if self.cache is not None:
+            stats = self.cache.stats()
+            print(f"✓ Response cache: {stats['hits']} hits, {stats['misses']} misses")
+        
+        self.structured_data = structured_data
+        return structured_data
+    
+    def analyze_document_streaming(self, block_size: int = 2000) -> List[Entry]:
+        """
+        Analyze the document while pages are still being decoded
+        Document type is identified from the first block; chunks are dispatched as soon as they fill
+        """
+        print("\n🤖 Using AI to analyze document (streaming)...")
+        blocks = self.iter_text_blocks(block_size)
+        
+        # Step 1: Identify document type as soon as the first ~block_size characters exist
+        sample = next(blocks, "")
+        doc_type = self._resolve_document_type(sample)
+        
+        # Step 2: Dispatch chunks while later pages are still being decoded,
+        # keeping at most max_concurrency chunks in flight so memory stays bounded
+        all_data = []
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            for i, chunk in enumerate(self.chunker.iter_chunks(chain([sample], blocks))):
+                pending.append(executor.submit(self._extract_chunk, doc_type, chunk, i, None))
+                while len(pending) > self.max_concurrency:
+                    all_data.extend(pending.popleft().result())
+            while pending:
+                all_data.extend(pending.popleft().result())
+        
+        with timed('dedup'):
+            structured_data = self._remove_duplicates(all_data)
+        print(f"✓ Extracted {len(structured_data)} data entries")
+        
         self.structured_data = structured_data
         return structured_data
     
-    def _identify_document_type(self) -> str:
+    def _resolve_document_type(self, sample: str) -> str:
+        """Document type from the local classifier when it is confident, else the LLM; None means fold it"""
+        with timed('doc_type_classify'):
+            doc_type, _ = DOC_CLASSIFIER.classify(sample)
+        if doc_type is not None and self.doc_type_mode != 'llm':
+            source = 'local'
+        elif self.doc_type_mode == 'llm':
+            doc_type, source = self._identify_document_type(sample), 'llm'
+        else:
+            # Unsure: the first chunk's prompt asks for the type too, saving a round trip
+            print("✓ Document type left to the first chunk (local classifier unsure)")
+            METRICS.inc('doc_type_total', source='folded')
+            return None
+        METRICS.inc('doc_type_total', source=source)
+        self._set_document_type(doc_type, source)
+        return doc_type
+    
+    def _set_document_type(self, doc_type: str, source: str):
+        self.doc_type = doc_type
+        print(f"✓ Document type identified: {doc_type} ({source})")
+        self._emit('doc_type', doc_type=doc_type, source=source)
+    
+    def _identify_document_type(self, sample: str = None) -> str:
         """Use AI to identify the type of document"""
+        if sample is None:
+            sample = self.raw_text
         prompt = f"""Analyze this document text and identify its type (e.g., resume, invoice, contract, report, personal profile, etc.).
 
 Document text:
-{self.raw_text[:2000]}...
+{sample[:2000]}...
 
 Respond with ONLY the document type in 2-3 words. Examples: "Personal Resume", "Sales Invoice", "Legal Contract", "Technical Report"."""
 
-        response = self.client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.1,
-            max_tokens=50
+        with timed('doc_type_call'):
+            return self._chat(prompt, temperature=0.1, max_tokens=50).strip()
+    
+    def _chat(self, prompt: str, temperature: float, max_tokens: int, remember: bool = True) -> str:
+        """
+        Send a single-prompt chat completion, served from the response cache when possible
+        With remember=False the answer is not cached; the caller stores it with _remember once it parses
+        """
+        key = None
+        if self.cache is not None:
+            key = LLMResponseCache.make_key(self.MODEL, prompt, temperature, max_tokens)
+            cached = self.cache.get(key)
+            METRICS.inc('llm_cache_lookups_total', result='hit' if cached is not None else 'miss')
+            if cached is not None:
+                return cached
+        
+        # Reserve the prompt plus the largest possible answer; unused tokens are returned afterwards
+        response = self.scheduler.call(
+            self._job_key,
+            estimate_tokens(prompt) + max_tokens,
+            lambda: self._completions.create(
+                model=self.MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
         )
+        content = response.choices[0].message.content
         
-        return response.choices[0].message.content.strip()
+        if remember:
+            self._remember(prompt, temperature, max_tokens, content)
+        return content
+    
+    def _remember(self, prompt: str, temperature: float, max_tokens: int, content: Optional[str]):
+        """Cache an answer for the request, or drop the cached one when content is None"""
+        if self.cache is None:
+            return
+        key = LLMResponseCache.make_key(self.MODEL, prompt, temperature, max_tokens)
+        if content is None:
+            self.cache.delete(key)
+        else:
+            self.cache.put(key, content)
     
-    def _extract_structured_data(self, doc_type: str) -> List[Dict[str, Any]]:
+    def _extract_structured_data(self, doc_type: str) -> List[Entry]:
         """Use AI to extract structured key-value pairs from document"""
         
-        # Split text into chunks if too long
-        chunks = self._split_text_into_chunks(self.raw_text, max_length=6000)
+        # Split text into chunks that fit the token budget, repeating stored chunk layouts where possible
+        planned = self._plan_chunks()
+        total = len(planned)
+        self._reused = set()
+        workers = min(self.max_concurrency, total)
+        self._emit('chunks_planned', total=total, layouts_reused=sum(1 for _, _, reused in planned if reused))
+        
+        # Dispatch chunks concurrently; map() yields results in chunk order
+        if workers > 1:
+            print(f"  Dispatching {total} chunks with concurrency {workers}...")
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(
+                    lambda args: self._extract_chunk(doc_type, args[1][0], args[0], total, args[1][1]),
+                    enumerate(planned)
+                ))
+        else:
+            results = [self._extract_chunk(doc_type, chunk, i, total, units)
+                       for i, (chunk, units, _) in enumerate(planned)]
+        
+        self.chunk_report = {'total': total, 'reused': len(self._reused)}
+        if self.chunk_store is not None:
+            print(f"  ♻️  Reused {len(self._reused)}/{total} chunks from earlier extractions")
+        
         all_data = []
+        for chunk_data in results:
+            all_data.extend(chunk_data)
         
-        for i, chunk in enumerate(chunks):
-            print(f"  Processing chunk {i+1}/{len(chunks)}...")
-            
-            prompt = f"""You are an expert data extraction system. Extract ALL key information from this {doc_type} document.
+        # Remove duplicates
+        with timed('dedup'):
+            all_data = self._remove_duplicates(all_data)
+        
+        return all_data
+    
+    def _plan_chunks(self) -> List[tuple]:
+        """(chunk, unit fingerprints, reused layout) for raw_text, packed page by page when pages are known"""
+        # Callers may replace raw_text (e.g. the hybrid engine's residual); then it is one "page"
+        pages = self.pages if self.pages and "".join(self.pages) == self.raw_text else [self.raw_text]
+        units = self.chunker.page_units(pages)
+        layouts = {}
+        if self.chunk_store is not None:
+            layouts = self.chunk_store.layouts((unit[3] for unit in units), self._layout_namespace())
+        return self.chunker.pack_units(units, layouts)
+    
+    def _layout_namespace(self) -> str:
+        # Layouts packed under another budget may not fit this one
+        return f"{self.chunker.budget}:"
+    
+    def _chunk_key(self, doc_type: str, chunk: str, identify: bool) -> str:
+        """Store key of a chunk's result: its fingerprint plus everything else that shapes the prompt"""
+        return fingerprint(f"{self.CHUNK_RESULT_VERSION}|{self.MODEL}|{doc_type}|{identify}|{chunk}")
+    
+    def _extract_chunk(self, doc_type: str, chunk: str, i: int, total: int = None,
+                       units: tuple = None) -> List[Entry]:
+        """Return a chunk's normalized entries, from the chunk store or by sending it to the AI"""
+        identify = doc_type is None and i == 0
+        key = self._chunk_key(doc_type, chunk, identify) if self.chunk_store is not None else None
+        stored = self.chunk_store.get(key) if key is not None else None
+        if stored is not None:
+            entries = [Entry.from_dict(item) for item in stored['entries']]
+            if identify and stored.get('document_type'):
+                self._set_document_type(stored['document_type'], 'folded')
+            self._reused.add(i)
+            METRICS.inc('chunks_total', source='reused')
+        else:
+            entries = self._request_chunk(doc_type, chunk, i, total)
+            METRICS.inc('chunks_total', source='extracted')
+            if entries is None:
+                # Unparseable answer: fall back to regex, and do not store it so the next run retries
+                entries = self._fallback_extraction(chunk)
+            elif key is not None:
+                value = {'entries': entries}
+                if identify:
+                    value['document_type'] = self.doc_type
+                self.chunk_store.put(key, value, units, self._layout_namespace())
+        self._emit('chunk_done', index=i, total=total, count=len(entries), entries=entries,
+                   reused=stored is not None)
+        return entries
+    
+    def _request_chunk(self, doc_type: str, chunk: str, i: int, total: int = None) -> List[Entry]:
+        """Prompt the AI with one chunk and parse its JSON answer (None if it cannot be parsed)"""
+        print(f"  Processing chunk {i+1}/{total}..." if total else f"  Processing chunk {i+1}...")
+        
+        # Without a known type, the first chunk also classifies the document (other chunks run concurrently)
+        identify = doc_type is None and i == 0
+        subject = f"this {doc_type} document" if doc_type else "this document"
+        if identify:
+            answer_format = """Return a JSON object with this EXACT structure (use these exact key names):
+{
+  "document_type": "The document type in 2-3 words, e.g. Personal Resume, Sales Invoice, Legal Contract",
+  "entries": [
+    {
+      "Category": "Category Name",
+      "Key": "Field Name",
+      "Value": "Extracted Value",
+      "Comments": "Brief explanation of significance"
+    }
+  ]
+}"""
+        else:
+            answer_format = """Return a JSON array with this EXACT structure (use these exact key names):
+[
+  {
+    "Category": "Category Name",
+    "Key": "Field Name",
+    "Value": "Extracted Value",
+    "Comments": "Brief explanation of significance"
+  }
+]"""
+        
+        prompt = f"""You are an expert data extraction system. Extract ALL key information from {subject}.
 
 Document text:
 {chunk}
@@ -96,29 +352,19 @@ Instructions:
 4. Add a brief comment explaining the significance of each data point
 5. Preserve original wording - do NOT paraphrase
 
-Return a JSON array with this EXACT structure (use these exact key names):
-[
-  {{
-    "Category": "Category Name",
-    "Key": "Field Name",
-    "Value": "Extracted Value",
-    "Comments": "Brief explanation of significance"
-  }}
-]
+{answer_format}
 
 IMPORTANT: Use "Category", "Key", "Value", "Comments" (with capital letters).
 Extract EVERYTHING - leave nothing out. Be thorough and comprehensive."""
 
-            response = self.client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.2,
-                max_tokens=4000
-            )
-            
-            # Parse JSON response
-            try:
-                content = response.choices[0].message.content.strip()
+        # Cached only once it parses, so a truncated or non-JSON answer is asked again next time
+        with timed('chunk_call'):
+            answer = self._chat(prompt, temperature=0.2, max_tokens=4000, remember=False)
+        content = answer.strip()
+        
+        # Parse JSON response
+        try:
+            with timed('json_parse'):
                 # Extract JSON from markdown code blocks if present
                 if "```json" in content:
                     content = content.split("```json")[1].split("```")[0].strip()
@@ -126,78 +372,47 @@ Extract EVERYTHING - leave nothing out. Be thorough and comprehensive."""
                     content = content.split("```")[1].split("```")[0].strip()
                 
                 chunk_data = json.loads(content)
-                
-                # Normalize keys to match Excel export format
-                normalized_data = []
-                for item in chunk_data:
-                    normalized_item = {
-                        'Category': item.get('Category') or item.get('category', 'Uncategorized'),
-                        'Key': item.get('Key') or item.get('key', 'Unknown'),
-                        'Value': item.get('Value') or item.get('value', ''),
-                        'Comments': item.get('Comments') or item.get('comment') or item.get('comments', '')
-                    }
-                    normalized_data.append(normalized_item)
-                
-                all_data.extend(normalized_data)
-                print(f"    ✓ Extracted {len(normalized_data)} entries from chunk {i+1}")
-                
-            except json.JSONDecodeError as e:
-                print(f"  Warning: Could not parse AI response for chunk {i+1}: {e}")
-                print(f"  Response was: {content[:200]}...")
-                # Fallback: try to extract data manually
-                fallback_data = self._fallback_extraction(chunk)
-                all_data.extend(fallback_data)
-        
-        # Remove duplicates
-        all_data = self._remove_duplicates(all_data)
-        
-        return all_data
-    
-    def _split_text_into_chunks(self, text: str, max_length: int = 6000) -> List[str]:
-        """Split text into manageable chunks for AI processing"""
-        if len(text) <= max_length:
-            return [text]
-        
-        chunks = []
-        sentences = text.split('. ')
-        current_chunk = ""
-        
-        for sentence in sentences:
-            if len(current_chunk) + len(sentence) < max_length:
-                current_chunk += sentence + ". "
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                current_chunk = sentence + ". "
-        
-        if current_chunk:
-            chunks.append(current_chunk.strip())
-        
-        return chunks
+            
+            if isinstance(chunk_data, dict):
+                if identify and chunk_data.get('document_type'):
+                    self._set_document_type(str(chunk_data['document_type']).strip(), 'folded')
+                chunk_data = chunk_data.get('entries') or []
+            
+            # Normalize keys to match Excel export format
+            normalized_data = []
+            for item in chunk_data:
+                normalized_item = Entry(
+                    item.get('Category') or item.get('category', 'Uncategorized'),
+                    item.get('Key') or item.get('key', 'Unknown'),
+                    item.get('Value') or item.get('value', ''),
+                    item.get('Comments') or item.get('comment') or item.get('comments', '')
+                )
+                normalized_data.append(normalized_item)
+            
+            self._remember(prompt, 0.2, 4000, answer)
+            print(f"    ✓ Extracted {len(normalized_data)} entries from chunk {i+1}")
+            return normalized_data
+            
+        except (json.JSONDecodeError, TypeError, AttributeError) as e:
+            print(f"  Warning: Could not parse AI response for chunk {i+1}: {e}")
+            print(f"  Response was: {content[:200]}...")
+            # Also evicts an unparseable answer cached before answers were checked
+            self._remember(prompt, 0.2, 4000, None)
+            return None
     
-    def _fallback_extraction(self, text: str) -> List[Dict[str, Any]]:
+    def _fallback_extraction(self, text: str) -> List[Entry]:
         """Fallback extraction using regex patterns if AI parsing fails"""
         data = []
         
         # Extract dates
         dates = re.findall(r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b|\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{1,2},? \d{4}\b', text)
         for date in dates[:5]:  # Limit to first 5
-            data.append({
-                "Category": "Dates",
-                "Key": "Date Found",
-                "Value": date,
-                "Comments": "Date extracted from document"
-            })
+            data.append(Entry("Dates", "Date Found", date, "Date extracted from document"))
         
         # Extract numbers with context
         numbers = re.findall(r'\b\d+(?:,\d{3})*(?:\.\d+)?\b', text)
         for num in numbers[:10]:  # Limit to first 10
-            data.append({
-                "Category": "Numerical Data",
-                "Key": "Number Found",
-                "Value": num,
-                "Comments": "Numerical value from document"
-            })
+            data.append(Entry("Numerical Data", "Number Found", num, "Numerical value from document"))
         
         return data
     
@@ -215,60 +430,19 @@ Extract EVERYTHING - leave nothing out. Be thorough and comprehensive."""
                 seen.add(key_value)
                 unique_data.append(entry)
         
+        # Overlapping chunks restate facts in other words and formats ('Birth Date: 1989-03-15')
+        if self.deduplicator is not None and len(unique_data) > 1:
+            exact = len(unique_data)
+            unique_data = self.deduplicator.dedupe(unique_data)
+            METRICS.inc('entries_deduplicated_total', exact - len(unique_data))
+            if exact > len(unique_data):
+                print(f"✓ Merged {exact - len(unique_data)} near-duplicate entries")
+        
         return unique_data
     
     def export_to_excel(self, output_path: str):
         """Export structured data to Excel with professional formatting"""
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Extracted Data"
-        
-        # Define headers
-        headers = ['Category', 'Key', 'Value', 'Comments']
-        ws.append(headers)
-        
-        # Style headers
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF", size=11)
-        
-        for cell in ws[1]:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-        
-        # Add data rows
-        for entry in self.structured_data:
-            ws.append([
-                entry.get('category', ''),
-                entry.get('key', ''),
-                entry.get('value', ''),
-                entry.get('comment', '')
-            ])
-        
-        # Apply styling
-        thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-        
-        for row in ws.iter_rows(min_row=2, max_row=ws.max_row):
-            for cell in row:
-                cell.border = thin_border
-                cell.alignment = Alignment(vertical="top", wrap_text=True)
-        
-        # Adjust column widths
-        ws.column_dimensions['A'].width = 22
-        ws.column_dimensions['B'].width = 40
-        ws.column_dimensions['C'].width = 35
-        ws.column_dimensions['D'].width = 70
-        
-        # Freeze header row
-        ws.freeze_panes = 'A2'
-        
-        # Save workbook
-        wb.save(output_path)
+        write_entries_xlsx(entry_rows(self.structured_data), output_path, widths=(22, 40, 35, 70))
         print(f"✓ Excel file created: {output_path}")
         print(f"✓ Total entries extracted: {len(self.structured_data)}")
 
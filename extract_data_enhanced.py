@@ -3,11 +3,169 @@ AI-Powered Document Structuring & Data Extraction - Enhanced Version
 Extracts ALL structured data from unstructured PDF documents into Excel format
 """
 
-import re
-import PyPDF2
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from typing import Dict, List, Any
+from entries import Entry
+from excel_export import write_entries_xlsx, entry_rows
+from pdf_text import extract_pdf_text, iter_pdf_pages, iter_text_blocks
+from rule_engine import Rule, RuleSet
+from metrics import timed
+from typing import List, Iterator
+
+
+# Rule table: (pattern, category, key, value template, comment template), evaluated in this order.
+# Templates use str.format over the match: {1}, {2}, ... are the capture groups.
+ENHANCED_RULES = RuleSet([
+    # Personal Information
+    Rule(r'([A-Z][a-z]+\s+[A-Z][a-z]+)\s+was born', 'Personal Information', 'Full Name', '{1}',
+         'Primary identifier for the individual'),
+    Rule(r'born on\s+([A-Z][a-z]+\s+\d{1,2},\s+\d{4})', 'Personal Information', 'Date of Birth', '{1}',
+         'Original format as stated in document'),
+    Rule(r'formatted as\s+(\d{4}-\d{2}-\d{2})', 'Personal Information', 'Date of Birth (ISO Format)', '{1}',
+         'ISO 8601 format for easy parsing and database storage'),
+    Rule(r'making him\s+(\d+)\s+years old as of\s+(\d{4})', 'Personal Information', 'Age', '{1}',
+         'Age as of {2}; key demographic marker for analytical purposes'),
+    Rule(r'in\s+(Jaipur,\s+Rajasthan)', 'Personal Information', 'Birthplace', '{1}',
+         'Provides valuable regional profiling context'),
+    Rule(r'Pink City of India', 'Personal Information', 'Birthplace Cultural Reference', 'Pink City of India',
+         'Cultural and historical reference to Jaipur, Rajasthan'),
+    Rule(r'his\s+([A-Z]\+)\s+blood group', 'Personal Information', 'Blood Group', '{1}',
+         'Noted for emergency contact purposes'),
+    Rule(r'As an\s+([A-Z][a-z]+)\s+national', 'Personal Information', 'Nationality', '{1}',
+         'Important for understanding work authorization and visa requirements across different employment opportunities'),
+
+    # Career History
+    Rule(r'professional journey began on\s+(July\s+1,\s+2012)', 'Career History', 'Career Start Date', '{1}',
+         'Beginning of professional career journey'),
+    Rule(r'joined his first company as a\s+(Junior Developer)', 'Career History', 'First Position', '{1}',
+         'Entry-level role in technology sector'),
+    Rule(r'with an annual salary of\s+(350,000\s+INR)', 'Career History', 'Starting Salary', '{1}',
+         'Initial compensation package at career start'),
+    Rule(r'current role at\s+(Resse Analytics)', 'Career History', 'Current Company', '{1}',
+         'Present employer'),
+    Rule(r'beginning on\s+(June\s+15,\s+2021)', 'Career History', 'Current Role Start Date', '{1}',
+         'Date of joining current organization'),
+    Rule(r'serves as a\s+(Senior Data Engineer)', 'Career History', 'Current Position', '{1}',
+         'Senior-level technical role demonstrating career progression'),
+    Rule(r'earning\s+(2,800,000\s+INR)\s+annually', 'Career History', 'Current Annual Salary', '{1}',
+         'Current annual compensation package'),
+    Rule(r'he worked at\s+(LakeCorp Solutions)', 'Career History', 'Previous Company', '{1}',
+         'Former employer before current role'),
+    Rule(r'from\s+(February\s+1,\s+2018),\s+to\s+(2021)', 'Career History', 'Previous Company Start Date', '{1}',
+         'Date of joining previous organization'),
+    Rule(r'from\s+(February\s+1,\s+2018),\s+to\s+(2021)', 'Career History', 'Previous Company End Year', '{2}',
+         'Year of departure from previous organization'),
+    Rule(r'starting as a\s+(Data Analyst)', 'Career History', 'Previous Starting Position', '{1}',
+         'Initial role at previous company'),
+    Rule(r'earning a promotion in\s+(2019)', 'Career History', 'Promotion Year at Previous Company', '{1}',
+         'Year of career advancement at previous organization'),
+    Rule(r'over his\s+(twelve)-year career span', 'Career History', 'Total Career Duration', '{1} years',
+         'Total professional experience from 2012 to 2024'),
+    Rule(r'current peak salary of\s+(2,800,000\s+INR)', 'Career History', 'Peak Salary Achievement', '{1}',
+         'Highest compensation achieved in career to date'),
+    Rule(r'represents a substantial\s+(eight)-\s*fold increase', 'Career History', 'Salary Growth Multiple',
+         '{1}-fold increase',
+         'Represents substantial career progression and value appreciation from starting salary to current peak'),
+
+    # Education
+    Rule(r'high school education at\s+(St\.\s+Xavier\'s School)', 'Education', 'High School Name', '{1}',
+         'Secondary education institution'),
+    Rule(r'St\.\s+Xavier\'s School,\s+(Jaipur)', 'Education', 'High School Location', '{1}',
+         'City where secondary education was completed'),
+    Rule(r'completed his\s+(12th)\s+standard in\s+(2007)', 'Education', 'High School Grade Level', '{1} Standard',
+         'Final year of secondary education in Indian education system'),
+    Rule(r'completed his\s+(12th)\s+standard in\s+(2007)', 'Education', 'High School Completion Year', '{2}',
+         'Year of board examination completion'),
+    Rule(r'achieving an outstanding\s+(92\.5)%\s+overall score in his board examinations', 'Education',
+         'High School Board Exam Score', '{1}%',
+         'Outstanding performance in board examinations; demonstrates academic excellence'),
+    Rule(r'core subjects included\s+(Mathematics),\s+(Physics),\s+(Chemistry),\s+and\s+(Computer Science)',
+         'Education', 'High School Core Subjects', '{1}, {2}, {3}, {4}',
+         'Demonstrates early aptitude for technical disciplines and STEM fields'),
+    Rule(r'pursued his\s+(B\.Tech)\s+in\s+(Computer Science)', 'Education', 'Undergraduate Degree', '{1}',
+         'Bachelor of Technology degree'),
+    Rule(r'pursued his\s+(B\.Tech)\s+in\s+(Computer Science)', 'Education', 'Undergraduate Specialization', '{2}',
+         'Specialization in technology domain'),
+    Rule(r'at the prestigious\s+(IIT Delhi)', 'Education', 'Undergraduate Institution', '{1}',
+         'Prestigious Indian Institute of Technology; one of India\'s premier engineering institutions'),
+    Rule(r'graduating with honors in\s+(2011)', 'Education', 'Undergraduate Graduation Year', '{1}',
+         'Year of degree completion with honors distinction'),
+    Rule(r'with a CGPA of\s+(8\.7)\s+on a\s+(10)-point scale', 'Education', 'Undergraduate CGPA', '{1}/{2}',
+         'Strong academic performance; graduated with honors'),
+    Rule(r'ranking\s+(15)th\s+among\s+(120)\s+students in his class', 'Education', 'Undergraduate Class Rank',
+         '{1} out of {2}',
+         'Top percentile performance in competitive cohort; demonstrates consistent academic excellence'),
+    Rule(r'earned his\s+(M\.Tech)\s+in\s+(Data Science)', 'Education', 'Graduate Degree', '{1}',
+         'Master of Technology degree'),
+    Rule(r'earned his\s+(M\.Tech)\s+in\s+(Data Science)', 'Education', 'Graduate Specialization', '{2}',
+         'Advanced specialization in emerging technology field'),
+    Rule(r'His academic excellence continued at\s+(IIT Bombay)', 'Education', 'Graduate Institution', '{1}',
+         'Premier Indian Institute of Technology; renowned for advanced research and education'),
+    Rule(r'in Data Science in\s+(2013)', 'Education', 'Graduate Graduation Year', '{1}',
+         'Year of postgraduate degree completion'),
+    Rule(r'achieving an exceptional CGPA of\s+(9\.2)', 'Education', 'Graduate CGPA', '{1}',
+         'Exceptional academic performance in postgraduate studies; demonstrates mastery of advanced concepts'),
+    Rule(r'scoring\s+(95)\s+out of\s+(100)\s+for his final year thesis project', 'Education',
+         'Graduate Thesis Score', '{1}/{2}',
+         'Outstanding performance in final year research project; demonstrates research capabilities'),
+
+    # Certifications
+    Rule(r'commitment to continuous learning', 'Certifications', 'Professional Development Approach',
+         'Commitment to continuous learning',
+         'Demonstrates dedication to staying current with industry trends and technologies'),
+    Rule(r'passed the\s+(AWS Solutions Architect)\s+exam', 'Certifications', 'AWS Certification Name', '{1}',
+         'Cloud architecture certification from Amazon Web Services'),
+    Rule(r'AWS Solutions Architect exam in\s+(2019)', 'Certifications', 'AWS Certification Year', '{1}',
+         'Year of certification achievement'),
+    Rule(r'with a score of\s+(920)\s+out of\s+(1000)', 'Certifications', 'AWS Certification Score', '{1}/{2}',
+         'High performance score demonstrating strong cloud architecture knowledge and expertise'),
+    Rule(r'followed by the\s+(Azure Data Engineer)\s+certification', 'Certifications', 'Azure Certification Name',
+         '{1}', 'Data engineering certification from Microsoft Azure'),
+    Rule(r'Azure Data Engineer certification in\s+(2020)', 'Certifications', 'Azure Certification Year', '{1}',
+         'Year of certification achievement'),
+    Rule(r'with\s+(875)\s+points', 'Certifications', 'Azure Certification Score', '{1} points',
+         'Strong performance in Azure data engineering assessment'),
+    Rule(r'His\s+(Project Management Professional)\s+certification', 'Certifications', 'PMP Certification Name',
+         '{1}', 'Project management professional certification; globally recognized credential'),
+    Rule(r'Project Management Professional certification, obtained in\s+(2021)', 'Certifications',
+         'PMP Certification Year', '{1}', 'Year of certification achievement'),
+    Rule(r'was achieved with an\s+"(Above Target)"\s+rating from\s+(PMI)', 'Certifications',
+         'PMP Certification Rating', '{1}', 'Highest performance tier from {2} (Project Management Institute)'),
+    Rule(r'while his\s+(SAFe Agilist)\s+certification', 'Certifications', 'SAFe Certification Name', '{1}',
+         'Scaled Agile Framework certification for enterprise agility'),
+    Rule(r'earned him an outstanding\s+(98)%\s+score', 'Certifications', 'SAFe Certification Score', '{1}%',
+         'Outstanding performance demonstrating mastery of agile methodologies at scale'),
+
+    # Technical Skills
+    Rule(r'In terms of technical proficiency', 'Technical Skills', 'Skills Assessment Approach',
+         'Self-rated proficiency across various technical domains',
+         'Comprehensive self-assessment demonstrating awareness of capabilities and experience levels'),
+    Rule(r'SQL expertise at a perfect\s+(10)\s+out of\s+(10)', 'Technical Skills', 'SQL Proficiency Rating',
+         '{1}/{2}', 'Perfect rating indicating mastery level expertise'),
+    Rule(r'reflecting his daily usage since\s+(2012)', 'Technical Skills', 'SQL Experience Duration',
+         'Daily usage since {1}',
+         'Over 12 years of continuous daily usage; foundational skill for data engineering role'),
+    Rule(r'His Python proficiency scores\s+(9)\s+out of\s+(10)', 'Technical Skills', 'Python Proficiency Rating',
+         '{1}/{2}', 'Near-perfect rating indicating expert-level proficiency'),
+    Rule(r'backed by over\s+(seven)\s+years of practical experience', 'Technical Skills',
+         'Python Experience Duration', 'Over {1} years',
+         'Extensive practical experience in Python programming and development'),
+    Rule(r'while his machine learning capabilities rate\s+(8)\s+out of\s+(10)', 'Technical Skills',
+         'Machine Learning Proficiency Rating', '{1}/{2}',
+         'Strong proficiency in machine learning concepts and implementation'),
+    Rule(r'representing\s+(five)\s+years of hands-on implementation', 'Technical Skills',
+         'Machine Learning Experience Duration', '{1} years',
+         'Substantial hands-on implementation experience in machine learning projects'),
+    Rule(r'His cloud platform expertise, including AWS and Azure certifications, also rates\s+(9)\s+out of\s+(10)',
+         'Technical Skills', 'Cloud Platform Proficiency Rating (AWS & Azure)', '{1}/{2}',
+         'Expert-level proficiency in cloud platforms; backed by professional certifications'),
+    Rule(r'with more than\s+(four)\s+years of experience', 'Technical Skills', 'Cloud Platform Experience Duration',
+         'More than {1} years',
+         'Extensive experience with AWS and Azure cloud platforms; certified professional'),
+    Rule(r'and his data visualization skills in Power BI and Tableau score\s+(8)\s+out of\s+(10)',
+         'Technical Skills', 'Data Visualization Proficiency Rating (Power BI & Tableau)', '{1}/{2}',
+         'Expert-level proficiency in business intelligence and data visualization tools; establishing him as an expert in the field'),
+    Rule(r'Power BI and Tableau', 'Technical Skills', 'Data Visualization Tools', 'Power BI, Tableau',
+         'Primary business intelligence and data visualization platforms used for creating insights and dashboards'),
+])
 
 
 class EnhancedDocumentExtractor:
@@ -20,735 +178,51 @@ class EnhancedDocumentExtractor:
         
     def extract_text_from_pdf(self) -> str:
         """Extract all text content from PDF"""
-        with open(self.pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text()
+        text = extract_pdf_text(self.pdf_path)
         self.raw_text = text
         return text
     
-    def identify_key_value_pairs(self) -> List[Dict[str, Any]]:
+    def iter_pages(self) -> Iterator[str]:
+        """Yield the text of each PDF page as it is decoded"""
+        return iter_pdf_pages(self.pdf_path)
+    
+    def iter_text_blocks(self, block_size: int = 2000) -> Iterator[str]:
+        """Yield sentence-aligned text blocks of about block_size characters"""
+        return iter_text_blocks(self.iter_pages(), block_size)
+    
+    def identify_key_value_pairs(self) -> List[Entry]:
         """
         Intelligently identify ALL key-value relationships in unstructured text
         Ensures 100% data capture with no omissions
         """
-        text = self.raw_text
-        data_entries = []
-        
-        # Extract all sections
-        data_entries.extend(self._extract_personal_info(text))
-        data_entries.extend(self._extract_career_info(text))
-        data_entries.extend(self._extract_education_info(text))
-        data_entries.extend(self._extract_certification_info(text))
-        data_entries.extend(self._extract_skills_info(text))
+        # Evaluate the whole rule table in one pass over the text
+        with timed('rule_scan'):
+            data_entries = ENHANCED_RULES.scan(self.raw_text)
         
         self.structured_data = data_entries
         return data_entries
     
-    def _extract_personal_info(self, text: str) -> List[Dict]:
-        """Extract ALL personal information with complete context"""
-        entries = []
-        
-        # Full Name
-        name_match = re.search(r'([A-Z][a-z]+\s+[A-Z][a-z]+)\s+was born', text)
-        if name_match:
-            entries.append({
-                'Category': 'Personal Information',
-                'Key': 'Full Name',
-                'Value': name_match.group(1),
-                'Comments': 'Primary identifier for the individual'
-            })
-        
-        # Date of Birth (Natural Format)
-        birth_match = re.search(r'born on\s+([A-Z][a-z]+\s+\d{1,2},\s+\d{4})', text)
-        if birth_match:
-            entries.append({
-                'Category': 'Personal Information',
-                'Key': 'Date of Birth',
-                'Value': birth_match.group(1),
-                'Comments': 'Original format as stated in document'
-            })
-        
-        # Date of Birth (ISO Format)
-        iso_match = re.search(r'formatted as\s+(\d{4}-\d{2}-\d{2})', text)
-        if iso_match:
-            entries.append({
-                'Category': 'Personal Information',
-                'Key': 'Date of Birth (ISO Format)',
-                'Value': iso_match.group(1),
-                'Comments': 'ISO 8601 format for easy parsing and database storage'
-            })
-        
-        # Age
-        age_match = re.search(r'making him\s+(\d+)\s+years old as of\s+(\d{4})', text)
-        if age_match:
-            entries.append({
-                'Category': 'Personal Information',
-                'Key': 'Age',
-                'Value': age_match.group(1),
-                'Comments': f'Age as of {age_match.group(2)}; key demographic marker for analytical purposes'
-            })
-        
-        # Birthplace
-        birthplace_match = re.search(r'in\s+(Jaipur,\s+Rajasthan)', text)
-        if birthplace_match:
-            entries.append({
-                'Category': 'Personal Information',
-                'Key': 'Birthplace',
-                'Value': birthplace_match.group(1),
-                'Comments': 'Provides valuable regional profiling context'
-            })
-        
-        # Birthplace Description
-        if 'Pink City of India' in text:
-            entries.append({
-                'Category': 'Personal Information',
-                'Key': 'Birthplace Cultural Reference',
-                'Value': 'Pink City of India',
-                'Comments': 'Cultural and historical reference to Jaipur, Rajasthan'
-            })
-        
-        # Blood Group
-        blood_match = re.search(r'his\s+([A-Z]\+)\s+blood group', text)
-        if blood_match:
-            entries.append({
-                'Category': 'Personal Information',
-                'Key': 'Blood Group',
-                'Value': blood_match.group(1),
-                'Comments': 'Noted for emergency contact purposes'
-            })
-        
-        # Nationality
-        nationality_match = re.search(r'As an\s+([A-Z][a-z]+)\s+national', text)
-        if nationality_match:
-            entries.append({
-                'Category': 'Personal Information',
-                'Key': 'Nationality',
-                'Value': nationality_match.group(1),
-                'Comments': 'Important for understanding work authorization and visa requirements across different employment opportunities'
-            })
-        
-        return entries
-
-    def _extract_career_info(self, text: str) -> List[Dict]:
-        """Extract ALL career and employment information"""
-        entries = []
-        
-        # First Job Start Date
-        first_job_date = re.search(r'professional journey began on\s+(July\s+1,\s+2012)', text)
-        if first_job_date:
-            entries.append({
-                'Category': 'Career History',
-                'Key': 'Career Start Date',
-                'Value': first_job_date.group(1),
-                'Comments': 'Beginning of professional career journey'
-            })
-        
-        # First Position
-        first_position = re.search(r'joined his first company as a\s+(Junior Developer)', text)
-        if first_position:
-            entries.append({
-                'Category': 'Career History',
-                'Key': 'First Position',
-                'Value': first_position.group(1),
-                'Comments': 'Entry-level role in technology sector'
-            })
-        
-        # First Salary
-        first_salary = re.search(r'with an annual salary of\s+(350,000\s+INR)', text)
-        if first_salary:
-            entries.append({
-                'Category': 'Career History',
-                'Key': 'Starting Salary',
-                'Value': first_salary.group(1),
-                'Comments': 'Initial compensation package at career start'
-            })
-        
-        # Current Company
-        current_company = re.search(r'current role at\s+(Resse Analytics)', text)
-        if current_company:
-            entries.append({
-                'Category': 'Career History',
-                'Key': 'Current Company',
-                'Value': current_company.group(1),
-                'Comments': 'Present employer'
-            })
-        
-        # Current Role Start Date
-        current_start = re.search(r'beginning on\s+(June\s+15,\s+2021)', text)
-        if current_start:
-            entries.append({
-                'Category': 'Career History',
-                'Key': 'Current Role Start Date',
-                'Value': current_start.group(1),
-                'Comments': 'Date of joining current organization'
-            })
-        
-        # Current Position
-        current_position = re.search(r'serves as a\s+(Senior Data Engineer)', text)
-        if current_position:
-            entries.append({
-                'Category': 'Career History',
-                'Key': 'Current Position',
-                'Value': current_position.group(1),
-                'Comments': 'Senior-level technical role demonstrating career progression'
-            })
-        
-        # Current Salary
-        current_salary = re.search(r'earning\s+(2,800,000\s+INR)\s+annually', text)
-        if current_salary:
-            entries.append({
-                'Category': 'Career History',
-                'Key': 'Current Annual Salary',
-                'Value': current_salary.group(1),
-                'Comments': 'Current annual compensation package'
-            })
-        
-        # Previous Company
-        prev_company = re.search(r'he worked at\s+(LakeCorp Solutions)', text)
-        if prev_company:
-            entries.append({
-                'Category': 'Career History',
-                'Key': 'Previous Company',
-                'Value': prev_company.group(1),
-                'Comments': 'Former employer before current role'
-            })
-        
-        # Previous Company Duration
-        prev_duration = re.search(r'from\s+(February\s+1,\s+2018),\s+to\s+(2021)', text)
-        if prev_duration:
-            entries.append({
-                'Category': 'Career History',
-                'Key': 'Previous Company Start Date',
-                'Value': prev_duration.group(1),
-                'Comments': 'Date of joining previous organization'
-            })
-            entries.append({
-                'Category': 'Career History',
-                'Key': 'Previous Company End Year',
-                'Value': prev_duration.group(2),
-                'Comments': 'Year of departure from previous organization'
-            })
-        
-        # Previous Position
-        prev_position = re.search(r'starting as a\s+(Data Analyst)', text)
-        if prev_position:
-            entries.append({
-                'Category': 'Career History',
-                'Key': 'Previous Starting Position',
-                'Value': prev_position.group(1),
-                'Comments': 'Initial role at previous company'
-            })
-        
-        # Promotion Year
-        promo_year = re.search(r'earning a promotion in\s+(2019)', text)
-        if promo_year:
-            entries.append({
-                'Category': 'Career History',
-                'Key': 'Promotion Year at Previous Company',
-                'Value': promo_year.group(1),
-                'Comments': 'Year of career advancement at previous organization'
-            })
-        
-        # Career Span
-        career_span = re.search(r'over his\s+(twelve)-year career span', text)
-        if career_span:
-            entries.append({
-                'Category': 'Career History',
-                'Key': 'Total Career Duration',
-                'Value': f'{career_span.group(1)} years',
-                'Comments': 'Total professional experience from 2012 to 2024'
-            })
-        
-        # Peak Salary
-        peak_salary = re.search(r'current peak salary of\s+(2,800,000\s+INR)', text)
-        if peak_salary:
-            entries.append({
-                'Category': 'Career History',
-                'Key': 'Peak Salary Achievement',
-                'Value': peak_salary.group(1),
-                'Comments': 'Highest compensation achieved in career to date'
-            })
-        
-        # Salary Growth Multiple
-        growth_multiple = re.search(r'represents a substantial\s+(eight)-\s*fold increase', text)
-        if growth_multiple:
-            entries.append({
-                'Category': 'Career History',
-                'Key': 'Salary Growth Multiple',
-                'Value': f'{growth_multiple.group(1)}-fold increase',
-                'Comments': 'Represents substantial career progression and value appreciation from starting salary to current peak'
-            })
-        
-        return entries
-
-    def _extract_education_info(self, text: str) -> List[Dict]:
-        """Extract ALL educational background information"""
-        entries = []
-        
-        # High School Name
-        hs_name = re.search(r'high school education at\s+(St\.\s+Xavier\'s School)', text)
-        if hs_name:
-            entries.append({
-                'Category': 'Education',
-                'Key': 'High School Name',
-                'Value': hs_name.group(1),
-                'Comments': 'Secondary education institution'
-            })
-        
-        # High School Location
-        hs_location = re.search(r'St\.\s+Xavier\'s School,\s+(Jaipur)', text)
-        if hs_location:
-            entries.append({
-                'Category': 'Education',
-                'Key': 'High School Location',
-                'Value': hs_location.group(1),
-                'Comments': 'City where secondary education was completed'
-            })
-        
-        # High School Completion
-        hs_completion = re.search(r'completed his\s+(12th)\s+standard in\s+(2007)', text)
-        if hs_completion:
-            entries.append({
-                'Category': 'Education',
-                'Key': 'High School Grade Level',
-                'Value': f'{hs_completion.group(1)} Standard',
-                'Comments': 'Final year of secondary education in Indian education system'
-            })
-            entries.append({
-                'Category': 'Education',
-                'Key': 'High School Completion Year',
-                'Value': hs_completion.group(2),
-                'Comments': 'Year of board examination completion'
-            })
-        
-        # High School Score
-        hs_score = re.search(r'achieving an outstanding\s+(92\.5)%\s+overall score in his board examinations', text)
-        if hs_score:
-            entries.append({
-                'Category': 'Education',
-                'Key': 'High School Board Exam Score',
-                'Value': f'{hs_score.group(1)}%',
-                'Comments': 'Outstanding performance in board examinations; demonstrates academic excellence'
-            })
-        
-        # High School Subjects
-        hs_subjects = re.search(r'core subjects included\s+(Mathematics),\s+(Physics),\s+(Chemistry),\s+and\s+(Computer Science)', text)
-        if hs_subjects:
-            subjects = ', '.join(hs_subjects.groups())
-            entries.append({
-                'Category': 'Education',
-                'Key': 'High School Core Subjects',
-                'Value': subjects,
-                'Comments': 'Demonstrates early aptitude for technical disciplines and STEM fields'
-            })
-        
-        # B.Tech Degree
-        btech_degree = re.search(r'pursued his\s+(B\.Tech)\s+in\s+(Computer Science)', text)
-        if btech_degree:
-            entries.append({
-                'Category': 'Education',
-                'Key': 'Undergraduate Degree',
-                'Value': btech_degree.group(1),
-                'Comments': 'Bachelor of Technology degree'
-            })
-            entries.append({
-                'Category': 'Education',
-                'Key': 'Undergraduate Specialization',
-                'Value': btech_degree.group(2),
-                'Comments': 'Specialization in technology domain'
-            })
-        
-        # B.Tech Institution
-        btech_inst = re.search(r'at the prestigious\s+(IIT Delhi)', text)
-        if btech_inst:
-            entries.append({
-                'Category': 'Education',
-                'Key': 'Undergraduate Institution',
-                'Value': btech_inst.group(1),
-                'Comments': 'Prestigious Indian Institute of Technology; one of India\'s premier engineering institutions'
-            })
-        
-        # B.Tech Graduation
-        btech_grad = re.search(r'graduating with honors in\s+(2011)', text)
-        if btech_grad:
-            entries.append({
-                'Category': 'Education',
-                'Key': 'Undergraduate Graduation Year',
-                'Value': btech_grad.group(1),
-                'Comments': 'Year of degree completion with honors distinction'
-            })
-        
-        # B.Tech CGPA
-        btech_cgpa = re.search(r'with a CGPA of\s+(8\.7)\s+on a\s+(10)-point scale', text)
-        if btech_cgpa:
-            entries.append({
-                'Category': 'Education',
-                'Key': 'Undergraduate CGPA',
-                'Value': f'{btech_cgpa.group(1)}/{btech_cgpa.group(2)}',
-                'Comments': 'Strong academic performance; graduated with honors'
-            })
-        
-        # B.Tech Class Rank
-        btech_rank = re.search(r'ranking\s+(15)th\s+among\s+(120)\s+students in his class', text)
-        if btech_rank:
-            entries.append({
-                'Category': 'Education',
-                'Key': 'Undergraduate Class Rank',
-                'Value': f'{btech_rank.group(1)} out of {btech_rank.group(2)}',
-                'Comments': 'Top percentile performance in competitive cohort; demonstrates consistent academic excellence'
-            })
-        
-        # M.Tech Degree
-        mtech_degree = re.search(r'earned his\s+(M\.Tech)\s+in\s+(Data Science)', text)
-        if mtech_degree:
-            entries.append({
-                'Category': 'Education',
-                'Key': 'Graduate Degree',
-                'Value': mtech_degree.group(1),
-                'Comments': 'Master of Technology degree'
-            })
-            entries.append({
-                'Category': 'Education',
-                'Key': 'Graduate Specialization',
-                'Value': mtech_degree.group(2),
-                'Comments': 'Advanced specialization in emerging technology field'
-            })
-        
-        # M.Tech Institution
-        mtech_inst = re.search(r'His academic excellence continued at\s+(IIT Bombay)', text)
-        if mtech_inst:
-            entries.append({
-                'Category': 'Education',
-                'Key': 'Graduate Institution',
-                'Value': mtech_inst.group(1),
-                'Comments': 'Premier Indian Institute of Technology; renowned for advanced research and education'
-            })
-        
-        # M.Tech Graduation Year
-        mtech_year = re.search(r'in Data Science in\s+(2013)', text)
-        if mtech_year:
-            entries.append({
-                'Category': 'Education',
-                'Key': 'Graduate Graduation Year',
-                'Value': mtech_year.group(1),
-                'Comments': 'Year of postgraduate degree completion'
-            })
-        
-        # M.Tech CGPA
-        mtech_cgpa = re.search(r'achieving an exceptional CGPA of\s+(9\.2)', text)
-        if mtech_cgpa:
-            entries.append({
-                'Category': 'Education',
-                'Key': 'Graduate CGPA',
-                'Value': mtech_cgpa.group(1),
-                'Comments': 'Exceptional academic performance in postgraduate studies; demonstrates mastery of advanced concepts'
-            })
-        
-        # M.Tech Thesis Score
-        mtech_thesis = re.search(r'scoring\s+(95)\s+out of\s+(100)\s+for his final year thesis project', text)
-        if mtech_thesis:
-            entries.append({
-                'Category': 'Education',
-                'Key': 'Graduate Thesis Score',
-                'Value': f'{mtech_thesis.group(1)}/{mtech_thesis.group(2)}',
-                'Comments': 'Outstanding performance in final year research project; demonstrates research capabilities'
-            })
-        
-        return entries
-
-    def _extract_certification_info(self, text: str) -> List[Dict]:
-        """Extract ALL professional certification information"""
-        entries = []
-        
-        # Continuous Learning Commitment
-        if 'commitment to continuous learning' in text:
-            entries.append({
-                'Category': 'Certifications',
-                'Key': 'Professional Development Approach',
-                'Value': 'Commitment to continuous learning',
-                'Comments': 'Demonstrates dedication to staying current with industry trends and technologies'
-            })
-        
-        # AWS Certification
-        aws_cert = re.search(r'passed the\s+(AWS Solutions Architect)\s+exam', text)
-        if aws_cert:
-            entries.append({
-                'Category': 'Certifications',
-                'Key': 'AWS Certification Name',
-                'Value': aws_cert.group(1),
-                'Comments': 'Cloud architecture certification from Amazon Web Services'
-            })
-        
-        # AWS Year
-        aws_year = re.search(r'AWS Solutions Architect exam in\s+(2019)', text)
-        if aws_year:
-            entries.append({
-                'Category': 'Certifications',
-                'Key': 'AWS Certification Year',
-                'Value': aws_year.group(1),
-                'Comments': 'Year of certification achievement'
-            })
-        
-        # AWS Score
-        aws_score = re.search(r'with a score of\s+(920)\s+out of\s+(1000)', text)
-        if aws_score:
-            entries.append({
-                'Category': 'Certifications',
-                'Key': 'AWS Certification Score',
-                'Value': f'{aws_score.group(1)}/{aws_score.group(2)}',
-                'Comments': 'High performance score demonstrating strong cloud architecture knowledge and expertise'
-            })
-        
-        # Azure Certification
-        azure_cert = re.search(r'followed by the\s+(Azure Data Engineer)\s+certification', text)
-        if azure_cert:
-            entries.append({
-                'Category': 'Certifications',
-                'Key': 'Azure Certification Name',
-                'Value': azure_cert.group(1),
-                'Comments': 'Data engineering certification from Microsoft Azure'
-            })
-        
-        # Azure Year
-        azure_year = re.search(r'Azure Data Engineer certification in\s+(2020)', text)
-        if azure_year:
-            entries.append({
-                'Category': 'Certifications',
-                'Key': 'Azure Certification Year',
-                'Value': azure_year.group(1),
-                'Comments': 'Year of certification achievement'
-            })
-        
-        # Azure Score
-        azure_score = re.search(r'with\s+(875)\s+points', text)
-        if azure_score:
-            entries.append({
-                'Category': 'Certifications',
-                'Key': 'Azure Certification Score',
-                'Value': f'{azure_score.group(1)} points',
-                'Comments': 'Strong performance in Azure data engineering assessment'
-            })
-        
-        # PMP Certification
-        pmp_cert = re.search(r'His\s+(Project Management Professional)\s+certification', text)
-        if pmp_cert:
-            entries.append({
-                'Category': 'Certifications',
-                'Key': 'PMP Certification Name',
-                'Value': pmp_cert.group(1),
-                'Comments': 'Project management professional certification; globally recognized credential'
-            })
-        
-        # PMP Year
-        pmp_year = re.search(r'Project Management Professional certification, obtained in\s+(2021)', text)
-        if pmp_year:
-            entries.append({
-                'Category': 'Certifications',
-                'Key': 'PMP Certification Year',
-                'Value': pmp_year.group(1),
-                'Comments': 'Year of certification achievement'
-            })
-        
-        # PMP Rating
-        pmp_rating = re.search(r'was achieved with an\s+"(Above Target)"\s+rating from\s+(PMI)', text)
-        if pmp_rating:
-            entries.append({
-                'Category': 'Certifications',
-                'Key': 'PMP Certification Rating',
-                'Value': pmp_rating.group(1),
-                'Comments': f'Highest performance tier from {pmp_rating.group(2)} (Project Management Institute)'
-            })
-        
-        # SAFe Certification
-        safe_cert = re.search(r'while his\s+(SAFe Agilist)\s+certification', text)
-        if safe_cert:
-            entries.append({
-                'Category': 'Certifications',
-                'Key': 'SAFe Certification Name',
-                'Value': safe_cert.group(1),
-                'Comments': 'Scaled Agile Framework certification for enterprise agility'
-            })
-        
-        # SAFe Score
-        safe_score = re.search(r'earned him an outstanding\s+(98)%\s+score', text)
-        if safe_score:
-            entries.append({
-                'Category': 'Certifications',
-                'Key': 'SAFe Certification Score',
-                'Value': f'{safe_score.group(1)}%',
-                'Comments': 'Outstanding performance demonstrating mastery of agile methodologies at scale'
-            })
-        
-        return entries
-
-    def _extract_skills_info(self, text: str) -> List[Dict]:
-        """Extract ALL technical skills and proficiency information"""
-        entries = []
-        
-        # Technical Proficiency Overview
-        if 'In terms of technical proficiency' in text:
-            entries.append({
-                'Category': 'Technical Skills',
-                'Key': 'Skills Assessment Approach',
-                'Value': 'Self-rated proficiency across various technical domains',
-                'Comments': 'Comprehensive self-assessment demonstrating awareness of capabilities and experience levels'
-            })
-        
-        # SQL Proficiency
-        sql_rating = re.search(r'SQL expertise at a perfect\s+(10)\s+out of\s+(10)', text)
-        if sql_rating:
-            entries.append({
-                'Category': 'Technical Skills',
-                'Key': 'SQL Proficiency Rating',
-                'Value': f'{sql_rating.group(1)}/{sql_rating.group(2)}',
-                'Comments': 'Perfect rating indicating mastery level expertise'
-            })
-        
-        # SQL Experience
-        sql_exp = re.search(r'reflecting his daily usage since\s+(2012)', text)
-        if sql_exp:
-            entries.append({
-                'Category': 'Technical Skills',
-                'Key': 'SQL Experience Duration',
-                'Value': f'Daily usage since {sql_exp.group(1)}',
-                'Comments': 'Over 12 years of continuous daily usage; foundational skill for data engineering role'
-            })
-        
-        # Python Proficiency
-        python_rating = re.search(r'His Python proficiency scores\s+(9)\s+out of\s+(10)', text)
-        if python_rating:
-            entries.append({
-                'Category': 'Technical Skills',
-                'Key': 'Python Proficiency Rating',
-                'Value': f'{python_rating.group(1)}/{python_rating.group(2)}',
-                'Comments': 'Near-perfect rating indicating expert-level proficiency'
-            })
-        
-        # Python Experience
-        python_exp = re.search(r'backed by over\s+(seven)\s+years of practical experience', text)
-        if python_exp:
-            entries.append({
-                'Category': 'Technical Skills',
-                'Key': 'Python Experience Duration',
-                'Value': f'Over {python_exp.group(1)} years',
-                'Comments': 'Extensive practical experience in Python programming and development'
-            })
-        
-        # Machine Learning Proficiency
-        ml_rating = re.search(r'while his machine learning capabilities rate\s+(8)\s+out of\s+(10)', text)
-        if ml_rating:
-            entries.append({
-                'Category': 'Technical Skills',
-                'Key': 'Machine Learning Proficiency Rating',
-                'Value': f'{ml_rating.group(1)}/{ml_rating.group(2)}',
-                'Comments': 'Strong proficiency in machine learning concepts and implementation'
-            })
-        
-        # Machine Learning Experience
-        ml_exp = re.search(r'representing\s+(five)\s+years of hands-on implementation', text)
-        if ml_exp:
-            entries.append({
-                'Category': 'Technical Skills',
-                'Key': 'Machine Learning Experience Duration',
-                'Value': f'{ml_exp.group(1)} years',
-                'Comments': 'Substantial hands-on implementation experience in machine learning projects'
-            })
-        
-        # Cloud Platform Proficiency
-        cloud_rating = re.search(r'His cloud platform expertise, including AWS and Azure certifications, also rates\s+(9)\s+out of\s+(10)', text)
-        if cloud_rating:
-            entries.append({
-                'Category': 'Technical Skills',
-                'Key': 'Cloud Platform Proficiency Rating (AWS & Azure)',
-                'Value': f'{cloud_rating.group(1)}/{cloud_rating.group(2)}',
-                'Comments': 'Expert-level proficiency in cloud platforms; backed by professional certifications'
-            })
-        
-        # Cloud Platform Experience
-        cloud_exp = re.search(r'with more than\s+(four)\s+years of experience', text)
-        if cloud_exp:
-            entries.append({
-                'Category': 'Technical Skills',
-                'Key': 'Cloud Platform Experience Duration',
-                'Value': f'More than {cloud_exp.group(1)} years',
-                'Comments': 'Extensive experience with AWS and Azure cloud platforms; certified professional'
-            })
-        
-        # Data Visualization Proficiency
-        viz_rating = re.search(r'and his data visualization skills in Power BI and Tableau score\s+(8)\s+out of\s+(10)', text)
-        if viz_rating:
-            entries.append({
-                'Category': 'Technical Skills',
-                'Key': 'Data Visualization Proficiency Rating (Power BI & Tableau)',
-                'Value': f'{viz_rating.group(1)}/{viz_rating.group(2)}',
-                'Comments': 'Expert-level proficiency in business intelligence and data visualization tools; establishing him as an expert in the field'
-            })
-        
-        # Data Visualization Tools
-        if 'Power BI and Tableau' in text:
-            entries.append({
-                'Category': 'Technical Skills',
-                'Key': 'Data Visualization Tools',
-                'Value': 'Power BI, Tableau',
-                'Comments': 'Primary business intelligence and data visualization platforms used for creating insights and dashboards'
-            })
-        
-        return entries
-
+    def identify_key_value_pairs_streaming(self, block_size: int = 2000) -> List[Entry]:
+        """
+        Identify key-value pairs while pages are still being decoded
+        Only one sentence-aligned block is held in memory at a time; the first match of each rule wins
+        """
+        # First match of each rule, keyed by its position in the rule table
+        found = {}
+        rule_index = {id(rule): i for i, rule in enumerate(ENHANCED_RULES.rules)}
+        for block in self.iter_text_blocks(block_size):
+            for rule, match in ENHANCED_RULES.matches(block):
+                index = rule_index[id(rule)]
+                if index not in found:
+                    found[index] = ENHANCED_RULES.build_entry(rule, match)
+        
+        data_entries = [found[index] for index in sorted(found)]
+        self.structured_data = data_entries
+        return data_entries
+    
     def export_to_excel(self, output_path: str):
         """Export structured data to Excel with professional formatting"""
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Extracted Data"
-        
-        # Define headers
-        headers = ['Category', 'Key', 'Value', 'Comments']
-        ws.append(headers)
-        
-        # Style headers
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF", size=11)
-        
-        for cell in ws[1]:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-        
-        # Add data rows
-        for entry in self.structured_data:
-            ws.append([
-                entry.get('Category', ''),
-                entry.get('Key', ''),
-                entry.get('Value', ''),
-                entry.get('Comments', '')
-            ])
-        
-        # Apply styling to data rows
-        thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-        
-        for row in ws.iter_rows(min_row=2, max_row=ws.max_row):
-            for cell in row:
-                cell.border = thin_border
-                cell.alignment = Alignment(vertical="top", wrap_text=True)
-        
-        # Adjust column widths
-        ws.column_dimensions['A'].width = 22
-        ws.column_dimensions['B'].width = 40
-        ws.column_dimensions['C'].width = 35
-        ws.column_dimensions['D'].width = 70
-        
-        # Freeze header row
-        ws.freeze_panes = 'A2'
-        
-        # Save workbook
-        wb.save(output_path)
+        write_entries_xlsx(entry_rows(self.structured_data), output_path, widths=(22, 40, 35, 70))
         print(f"✓ Excel file created: {output_path}")
         print(f"✓ Total entries extracted: {len(self.structured_data)}")
 
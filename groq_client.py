@@ -0,0 +1,74 @@
+"""
+Shared Groq Client
+One pooled, keep-alive HTTP client per process so requests reuse warm TLS connections
+"""
+
+import os
+import threading
+from typing import Dict, Tuple
+
+import httpx
+from groq import Groq
+
+
+_clients: Dict[Tuple, Groq] = {}
+_lock = threading.Lock()
+
+
+def pool_settings() -> Dict[str, float]:
+    """Connection pool and timeout settings from the environment"""
+    return {
+        'pool_size': int(os.environ.get("GROQ_POOL_SIZE", "16")),
+        'keepalive_expiry': float(os.environ.get("GROQ_KEEPALIVE_SECONDS", "60")),
+        'connect_timeout': float(os.environ.get("GROQ_CONNECT_TIMEOUT", "10")),
+        'timeout': float(os.environ.get("GROQ_TIMEOUT", "120")),
+        'max_retries': int(os.environ.get("GROQ_MAX_RETRIES", "2")),
+    }
+
+
+def build_client(api_key: str, base_url: str = None, pool_size: int = 16, keepalive_expiry: float = 60,
+                 connect_timeout: float = 10, timeout: float = 120, max_retries: int = 2) -> Groq:
+    """A Groq client backed by its own keep-alive connection pool"""
+    http_client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=pool_size,
+            keepalive_expiry=keepalive_expiry
+        ),
+        timeout=httpx.Timeout(timeout, connect=connect_timeout)
+    )
+    return Groq(
+        api_key=api_key,
+        base_url=base_url,
+        http_client=http_client,
+        timeout=httpx.Timeout(timeout, connect=connect_timeout),
+        max_retries=max_retries
+    )
+
+
+def get_shared_client(api_key: str = None, base_url: str = None) -> Groq:
+    """
+    Process-wide client for this key and endpoint, created on first use
+    Keyed by pid as well, so a forked worker never reuses its parent's sockets
+    """
+    api_key = api_key or os.environ.get("GROQ_API_KEY")
+    if not api_key:
+        raise ValueError("Groq API key required. Set GROQ_API_KEY environment variable or pass as parameter.")
+    # GROQ_BASE_URL lets tests point the client at a local mock endpoint
+    base_url = base_url or os.environ.get("GROQ_BASE_URL") or None
+
+    key = (os.getpid(), api_key, base_url)
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = build_client(api_key, base_url, **pool_settings())
+            _clients[key] = client
+        return client
+
+
+def close_shared_clients():
+    """Close every pooled connection (e.g. at shutdown or between tests)"""
+    with _lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
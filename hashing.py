@@ -0,0 +1,15 @@
+"""
+File Hashing
+Content digests used to recognize the same document across uploads, batch runs and caches
+"""
+
+import hashlib
+
+
+def file_sha256(path: str) -> str:
+    """Hex SHA-256 of a file's bytes, read in 1 MB blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
@@ -0,0 +1,142 @@
+"""
+Hybrid Document Extraction
+Runs the deterministic rule table first and sends only the sentences it did not cover to the AI extractor
+"""
+
+import re
+from typing import Dict, List, Any, Tuple
+
+from chunking import estimate_tokens
+from dedup import deduplicator_from_env
+from excel_export import write_entries_xlsx, entry_rows
+from extract_data_enhanced import ENHANCED_RULES
+from pdf_text import extract_pdf_text
+
+
+# A sentence, or a line for list-like text such as resumes; whitespace stays attached so text is rebuilt exactly
+_SEGMENT = re.compile(r'.+?(?:[.!?]["\')\]]?(?=\s)|\n|$)\s*', re.S)
+
+# Tokens that carry facts: numbers and capitalized words (names, places, titles, acronyms)
+_FACT = re.compile(r'\d[\d,.%]*|\b[A-Z][\w+&.-]*')
+
+
+def coverage_mask(text: str, spans: List[Tuple[int, int]]) -> bytearray:
+    """1 for every character inside a rule match, else 0"""
+    mask = bytearray(len(text))
+    for start, end in spans:
+        mask[start:end] = b'\x01' * (end - start)
+    return mask
+
+
+def segment_coverage(text: str, start: int, end: int, mask: bytearray) -> float:
+    """
+    Share of a segment's facts that lie inside rule matches
+    The opening word is skipped (it is capitalized anyway); segments without facts fall back to character coverage
+    """
+    body = text[start:end]
+    first = start + len(body) - len(body.lstrip())
+    facts = [fact for fact in _FACT.finditer(text, start, end) if fact.start() != first]
+    if not facts:
+        return sum(mask[start:end]) / max(1, len(body.strip()))
+    covered = sum(1 for fact in facts if all(mask[fact.start():fact.end()]))
+    return covered / len(facts)
+
+
+def residual_text(text: str, spans: List[Tuple[int, int]], threshold: float = 0.8) -> Tuple[str, int, int]:
+    """Text without the segments whose coverage reaches threshold; returns (residual, segments, segments_kept)"""
+    mask = coverage_mask(text, spans)
+    kept = []
+    total = 0
+    for segment in _SEGMENT.finditer(text):
+        if not segment.group().strip():
+            continue
+        total += 1
+        if segment_coverage(text, segment.start(), segment.end(), mask) < threshold:
+            kept.append(segment.group())
+    return "".join(kept), total, len(kept)
+
+
+def _normalize(value: Any) -> str:
+    return " ".join(str(value).lower().split())
+
+
+def merge_entries(rule_entries: List[Dict], ai_entries: List[Dict]) -> List[Dict]:
+    """Rule entries win; AI entries restating a rule entry or an earlier AI entry (key and value alike) are dropped"""
+    # Read per call like the other DEDUP_* users; None (DEDUP_MODE=exact) compares key/value pairs only
+    deduplicator = deduplicator_from_env()
+    if deduplicator is None:
+        seen_pairs = {(_normalize(entry['Key']), _normalize(entry['Value'])) for entry in rule_entries}
+        merged = list(rule_entries)
+        for entry in ai_entries:
+            pair = (_normalize(entry.get('Key', '')), _normalize(entry.get('Value', '')))
+            if pair not in seen_pairs:
+                seen_pairs.add(pair)
+                merged.append(entry)
+        return merged
+
+    # Rule entries come first, so a cluster holding one is rooted at it and its AI restatements are dropped
+    combined = list(rule_entries) + list(ai_entries)
+    roots = deduplicator.clusters(combined)
+    merged = list(rule_entries)
+    merged.extend(combined[i] for i in range(len(rule_entries), len(combined)) if roots[i] == i)
+    return merged
+
+
+class HybridDocumentExtractor:
+    """Regex rules for the facts they know, the LLM for everything else"""
+
+    def __init__(self, pdf_path: str, coverage_threshold: float = 0.8, **ai_options):
+        self.pdf_path = pdf_path
+        self.coverage_threshold = coverage_threshold
+        # Passed through to AIDocumentExtractor (groq_api_key, cache, client, progress_callback, ...)
+        self.ai_options = ai_options
+        self.raw_text = ""
+        self.structured_data = []
+        self.token_report = {}
+        self.doc_type = None
+
+    def extract_text_from_pdf(self) -> str:
+        """Extract all text content from PDF"""
+        self.raw_text = extract_pdf_text(self.pdf_path)
+        return self.raw_text
+
+    def analyze_document(self) -> List[Dict[str, Any]]:
+        """Rule entries plus AI entries for the uncovered text, merged without duplicates"""
+        print("\n🔀 Hybrid extraction: rules first, AI for the rest...")
+        matches = ENHANCED_RULES.matches(self.raw_text)
+        rule_entries = [ENHANCED_RULES.build_entry(rule, match) for rule, match in matches]
+        spans = sorted({match.span() for _, match in matches})
+
+        residual, segments, kept = residual_text(self.raw_text, spans, self.coverage_threshold)
+        document_tokens = estimate_tokens(self.raw_text)
+        llm_tokens = estimate_tokens(residual)
+        self.token_report = {
+            'document_tokens': document_tokens,
+            'llm_tokens': llm_tokens,
+            'saved_tokens': document_tokens - llm_tokens,
+            'saved_ratio': (document_tokens - llm_tokens) / document_tokens if document_tokens else 0.0,
+            'segments': segments,
+            'segments_sent': kept,
+            'rule_entries': len(rule_entries)
+        }
+        print(f"✓ Rules extracted {len(rule_entries)} entries and covered {segments - kept}/{segments} segments")
+        print(f"✓ LLM input: {llm_tokens} of {document_tokens} tokens "
+              f"({self.token_report['saved_ratio']:.0%} saved)")
+
+        ai_entries = []
+        if residual.strip():
+            from extract_data_ai import AIDocumentExtractor
+            ai = AIDocumentExtractor(self.pdf_path, **self.ai_options)
+            ai.raw_text = residual
+            ai_entries = ai.analyze_document_with_ai()
+            self.doc_type = ai.doc_type
+
+        self.structured_data = merge_entries(rule_entries, ai_entries)
+        self.token_report['ai_entries'] = len(self.structured_data) - len(rule_entries)
+        return self.structured_data
+
+    def export_to_excel(self, output_path: str):
+        """Export structured data to Excel with professional formatting"""
+        write_entries_xlsx(entry_rows(self.structured_data), output_path, widths=(22, 40, 35, 70))
+        print(f"✓ Excel file created: {output_path}")
+        print(f"✓ Total entries extracted: {len(self.structured_data)}")
@@ -0,0 +1,262 @@
+"""
+Background Extraction Jobs
+SQLite-backed job store plus an in-process worker pool for the web application
+"""
+
+import json
+import time
+import uuid
+import sqlite3
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from entries import json_default
+from metrics import METRICS, timed
+
+
+# Events after which a job produces no further progress
+TERMINAL_EVENTS = ('done', 'failed')
+
+# Progress event carrying a provisional result; it is also kept as the running job's result
+PARTIAL_EVENT = 'partial'
+
+
+class JobStore:
+    """
+    Job state in a local SQLite file, readable from every web worker process
+    Jobs untouched for ttl_seconds are deleted with their events when new jobs are created
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 24 * 3600):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    filename TEXT,
+                    created REAL NOT NULL,
+                    started REAL,
+                    finished REAL,
+                    result TEXT,
+                    error TEXT,
+                    content_key TEXT
+                )
+            """)
+            # Stores created before upload coalescing lack the column
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if 'content_key' not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN content_key TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_content_key ON jobs(content_key, created)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS job_events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT NOT NULL,
+                    event TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    created REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_job_events_job ON job_events(job_id, id)")
+
+    def _connect(self) -> sqlite3.Connection:
+        """One connection per thread; WAL lets readers in other processes proceed during writes"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def create(self, filename: str, content_key: str = None) -> str:
+        job_id = uuid.uuid4().hex
+        with self._connect() as conn:
+            self._insert(conn, job_id, filename, content_key)
+        return job_id
+
+    def _insert(self, conn: sqlite3.Connection, job_id: str, filename: str, content_key: Optional[str]):
+        now = time.time()
+        self._prune(conn, now)
+        conn.execute(
+            "INSERT INTO jobs (id, status, filename, created, content_key) VALUES (?, 'queued', ?, ?, ?)",
+            (job_id, filename, now, content_key)
+        )
+
+    def _prune(self, conn: sqlite3.Connection, now: float):
+        """Delete jobs finished (or, if lost with their worker, created) more than ttl_seconds ago"""
+        if not self.ttl_seconds:
+            return
+        expired = conn.execute(
+            "SELECT id FROM jobs WHERE COALESCE(finished, created) < ?", (now - self.ttl_seconds,)
+        ).fetchall()
+        if expired:
+            ids = [(row['id'],) for row in expired]
+            conn.executemany("DELETE FROM job_events WHERE job_id = ?", ids)
+            conn.executemany("DELETE FROM jobs WHERE id = ?", ids)
+
+    def compact_events(self, job_id: str):
+        """Drop per-chunk entries from a finished job's progress events; its result already holds them all"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, data FROM job_events WHERE job_id = ? AND event NOT IN (?, ?)",
+                (job_id,) + TERMINAL_EVENTS
+            ).fetchall()
+            updates = []
+            for row in rows:
+                data = json.loads(row['data'])
+                if isinstance(data, dict) and 'entries' in data:
+                    del data['entries']
+                    updates.append((json.dumps(data, default=json_default), row['id']))
+            conn.executemany("UPDATE job_events SET data = ? WHERE id = ?", updates)
+
+    def find_or_create(self, filename: str, content_key: str, inflight_seconds: float = 1800,
+                       reusable: Callable[[Dict[str, Any]], bool] = None) -> Tuple[str, Optional[str]]:
+        """
+        Atomically join an existing job for the same content or create a new one
+        Returns (job_id, None) for a new job, or (job_id, 'inflight' | 'done') for a shared one.
+        Queued or running jobs older than inflight_seconds are presumed lost with their worker
+        process; done jobs are shared only while reusable(result) holds. Failed jobs never are.
+        """
+        conn = self._connect()
+        # BEGIN IMMEDIATE takes the write lock up front, so two workers cannot both miss and create
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                "SELECT id, status, created, result FROM jobs "
+                "WHERE content_key = ? AND status != 'failed' ORDER BY created DESC",
+                (content_key,)
+            ).fetchall()
+            now = time.time()
+            for row in rows:
+                if row['status'] in ('queued', 'running'):
+                    if now - row['created'] <= inflight_seconds:
+                        conn.commit()
+                        return row['id'], 'inflight'
+                elif reusable is None or reusable(json.loads(row['result'])):
+                    conn.commit()
+                    return row['id'], 'done'
+            job_id = uuid.uuid4().hex
+            self._insert(conn, job_id, filename, content_key)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        return job_id, None
+
+    def mark_running(self, job_id: str):
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET status = 'running', started = ? WHERE id = ?", (time.time(), job_id))
+
+    def mark_done(self, job_id: str, result: Dict[str, Any]):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'done', finished = ?, result = ? WHERE id = ?",
+                (time.time(), json.dumps(result, default=json_default), job_id)
+            )
+
+    def set_partial_result(self, job_id: str, result: Dict[str, Any]):
+        """Result readable while the job is still running; mark_done replaces it"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET result = ? WHERE id = ? AND status = 'running'",
+                (json.dumps(result, default=json_default), job_id)
+            )
+
+    def mark_failed(self, job_id: str, error: str):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', finished = ?, error = ? WHERE id = ?",
+                (time.time(), error, job_id)
+            )
+
+    def add_event(self, job_id: str, event: str, data: Dict[str, Any]):
+        """Append a progress event to the job's event log"""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO job_events (job_id, event, data, created) VALUES (?, ?, ?, ?)",
+                (job_id, event, json.dumps(data, default=json_default), time.time())
+            )
+
+    def events_since(self, job_id: str, after_id: int = 0) -> List[Dict[str, Any]]:
+        """Progress events of a job with an id greater than after_id, oldest first"""
+        rows = self._connect().execute(
+            "SELECT id, event, data FROM job_events WHERE job_id = ? AND id > ? ORDER BY id",
+            (job_id, after_id)
+        ).fetchall()
+        return [{'id': row['id'], 'event': row['event'], 'data': json.loads(row['data'])} for row in rows]
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+
+class JobQueue:
+    """Runs submitted jobs on a background thread pool and records their state in a JobStore"""
+
+    def __init__(self, store: JobStore, workers: int = 2):
+        self.store = store
+        self.workers = max(1, workers)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Created lazily so a pre-forking server never inherits a pool without its threads
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='extract-job')
+            return self._executor
+
+    def submit(self, filename: str, fn: Callable[..., Dict[str, Any]], *args) -> str:
+        """
+        Queue fn(*args, progress=callback) and return the new job id immediately
+        fn reports stages through progress(event, data); they are stored in the job's event log
+        """
+        job_id = self.store.create(filename)
+        self._get_executor().submit(self._run, job_id, fn, args)
+        return job_id
+
+    def submit_coalesced(self, content_key: str, filename: str, fn: Callable[..., Dict[str, Any]], *args,
+                         inflight_seconds: float = 1800,
+                         reusable: Callable[[Dict[str, Any]], bool] = None) -> Tuple[str, Optional[str]]:
+        """
+        Like submit, but identical content (same content_key) shares one job
+        Returns (job_id, shared) where shared is None when fn was queued, else 'inflight' or 'done'
+        """
+        job_id, shared = self.store.find_or_create(filename, content_key, inflight_seconds, reusable)
+        if shared is None:
+            self._get_executor().submit(self._run, job_id, fn, args)
+        return job_id, shared
+
+    def _run(self, job_id: str, fn: Callable[..., Dict[str, Any]], args: tuple):
+        self.store.mark_running(job_id)
+        self.store.add_event(job_id, 'started', {})
+
+        def progress(event: str, data: Dict[str, Any]):
+            if event == PARTIAL_EVENT:
+                self.store.set_partial_result(job_id, data)
+            self.store.add_event(job_id, event, data)
+
+        try:
+            with timed('job_total'):
+                result = fn(*args, progress=progress)
+        except Exception as e:
+            METRICS.inc('extraction_jobs_total', status='failed')
+            print(f"  ❌ Job {job_id} failed: {e}")
+            traceback.print_exc()
+            self.store.mark_failed(job_id, str(e))
+            self.store.add_event(job_id, 'failed', {'error': f"Extraction failed: {e}"})
+        else:
+            METRICS.inc('extraction_jobs_total', status='done')
+            self.store.mark_done(job_id, result)
+            self.store.add_event(job_id, 'done', result)
+        self.store.compact_events(job_id)
+
@@ -0,0 +1,142 @@
+"""
+Persistent LLM Response Cache
+Content-addressed SQLite store for Groq chat completions with LRU/size eviction and TTLs
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, Optional
+
+
+class LLMResponseCache:
+    """Disk-backed cache of LLM responses keyed by a hash of the request"""
+
+    def __init__(self, path: str, max_entries: int = 10000, max_bytes: int = 256 * 1024 * 1024,
+                 ttl_seconds: float = 7 * 24 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        # One shared connection guarded by a lock; WAL lets several processes share the file
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)")
+
+    @staticmethod
+    def make_key(model: str, prompt: str, temperature: float, max_tokens: int) -> str:
+        """Build the content address for a chat completion request"""
+        payload = json.dumps([model, prompt, temperature, max_tokens], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None on a miss"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, created = row
+            if self.ttl_seconds and now - created > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: str):
+        """Store a response and evict old entries if the cache is over budget"""
+        now = time.time()
+        size = len(value.encode('utf-8'))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now)
+            )
+            self._evict(now)
+
+    def delete(self, key: str):
+        """Forget the response for key"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def _evict(self, now: float):
+        """Drop expired entries, then least recently used ones until within limits"""
+        if self.ttl_seconds:
+            self._conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl_seconds,))
+
+        count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        # Walk from least recently used and delete until both limits hold
+        doomed = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_access ASC"):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            count -= 1
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+    def clear(self):
+        """Remove every cached response"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters for this process plus current cache size"""
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': count,
+            'bytes': total
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def cache_from_env(default_path: str = None) -> Optional[LLMResponseCache]:
+    """Cache from LLM_CACHE_* environment variables; falls back to default_path, disabled without either path"""
+    path = os.environ.get("LLM_CACHE_PATH") or default_path
+    if not path:
+        return None
+    return LLMResponseCache(
+        path,
+        max_entries=int(os.environ.get("LLM_CACHE_MAX_ENTRIES", "10000")),
+        max_bytes=int(os.environ.get("LLM_CACHE_MAX_BYTES", str(256 * 1024 * 1024))),
+        ttl_seconds=float(os.environ.get("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+    )
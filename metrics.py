@@ -0,0 +1,193 @@
+"""
+Pipeline Metrics
+In-process histograms and counters for per-stage timings, exportable as Prometheus text or JSON
+"""
+
+import time
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+
+# Upper bounds (seconds) of the histogram buckets; a final +Inf bucket is implied
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+STAGE_SECONDS = 'extraction_stage_seconds'
+
+_HELP = {
+    STAGE_SECONDS: 'Wall-clock seconds spent in each pipeline stage',
+    'llm_requests_total': 'Groq API requests by outcome',
+    'llm_cache_lookups_total': 'Response cache lookups by result',
+    'extraction_jobs_total': 'Background extraction jobs by final status',
+    'extracted_entries_total': 'Entries produced by finished extractions',
+    'doc_type_total': 'Document types by source: local classifier, folded into the first chunk, or LLM call',
+    'chunks_total': 'Extraction chunks by source: reused from the chunk store or sent to the LLM',
+    'uploads_coalesced_total': 'Uploads served by an existing job for identical content',
+    'entries_deduplicated_total': 'Near-duplicate entries merged away after the exact key/value pass',
+    'race_outcome_total': 'Raced uploads by outcome: AI merged in time, deadline missed, AI failed, or AI only',
+}
+
+SeriesKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class Histogram:
+    """Fixed-bucket histogram (per-bucket counts, not cumulative)"""
+
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate by linear interpolation inside the bucket holding the q-th observation"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.bounds[index - 1] if index > 0 else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else lower
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.bounds[-1]
+
+
+def _key(name: str, labels: Dict[str, Any]) -> SeriesKey:
+    return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+
+def _label_text(labels: Tuple[Tuple[str, str], ...], extra: str = '') -> str:
+    parts = [f'{label}="{value}"' for label, value in labels]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+class MetricsRegistry:
+    """Thread-safe store of histogram and counter series, keyed by metric name and labels"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._histograms: Dict[SeriesKey, Histogram] = {}
+        self._counters: Dict[SeriesKey, float] = {}
+
+    def observe(self, name: str, value: float, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    @contextmanager
+    def timed(self, name: str, **labels) -> Iterator[None]:
+        """Observe the duration of the with-block (also when it raises)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        """JSON-serializable copy of every series; merge() accepts it back (e.g. from worker processes)"""
+        with self._lock:
+            return {
+                'histograms': [
+                    {'name': name, 'labels': dict(labels), 'bounds': list(h.bounds), 'counts': list(h.counts),
+                     'sum': h.sum, 'count': h.count}
+                    for (name, labels), h in self._histograms.items()
+                ],
+                'counters': [
+                    {'name': name, 'labels': dict(labels), 'value': value}
+                    for (name, labels), value in self._counters.items()
+                ]
+            }
+
+    def merge(self, snapshot: Dict[str, List[Dict[str, Any]]]):
+        """Add another registry's snapshot into this one"""
+        with self._lock:
+            for series in snapshot.get('histograms', []):
+                key = _key(series['name'], series['labels'])
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = Histogram(tuple(series['bounds']))
+                for index, bucket_count in enumerate(series['counts']):
+                    histogram.counts[index] += bucket_count
+                histogram.sum += series['sum']
+                histogram.count += series['count']
+            for series in snapshot.get('counters', []):
+                key = _key(series['name'], series['labels'])
+                self._counters[key] = self._counters.get(key, 0) + series['value']
+
+    def summary(self) -> Dict[str, Any]:
+        """Human-oriented JSON: per-stage count, total, mean and estimated p50/p95, plus counters"""
+        with self._lock:
+            stages = {}
+            for (name, labels), h in sorted(self._histograms.items()):
+                if name == STAGE_SECONDS:
+                    label = dict(labels)['stage']
+                else:
+                    label = name + _label_text(labels)
+                stages[label] = {
+                    'count': h.count,
+                    'total_s': round(h.sum, 6),
+                    'mean_s': round(h.sum / h.count, 6) if h.count else 0.0,
+                    'p50_s': round(h.quantile(0.50), 6),
+                    'p95_s': round(h.quantile(0.95), 6)
+                }
+            counters = {name + _label_text(labels): value for (name, labels), value in sorted(self._counters.items())}
+        return {'stages': stages, 'counters': counters}
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        with self._lock:
+            for name in sorted({name for name, _ in self._histograms}):
+                lines.append(f"# HELP {name} {_HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+                for (series_name, labels), h in sorted(self._histograms.items()):
+                    if series_name != name:
+                        continue
+                    cumulative = 0
+                    for bound, bucket_count in zip(list(h.bounds) + ['+Inf'], h.counts):
+                        cumulative += bucket_count
+                        le = 'le="%s"' % bound
+                        lines.append(f"{name}_bucket{_label_text(labels, le)} {cumulative}")
+                    lines.append(f"{name}_sum{_label_text(labels)} {h.sum}")
+                    lines.append(f"{name}_count{_label_text(labels)} {h.count}")
+            for name in sorted({name for name, _ in self._counters}):
+                lines.append(f"# HELP {name} {_HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} counter")
+                for (series_name, labels), value in sorted(self._counters.items()):
+                    if series_name == name:
+                        lines.append(f"{name}{_label_text(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry; under gunicorn each worker process reports its own series
+METRICS = MetricsRegistry()
+
+
+def timed(stage: str):
+    """with timed('pdf_parse'): ... records the block's duration under extraction_stage_seconds{stage=...}"""
+    return METRICS.timed(STAGE_SECONDS, stage=stage)
@@ -0,0 +1,282 @@
+"""
+Mock Groq Server
+Local stand-in for the Groq chat-completions API, for offline load tests of the AI pipeline
+
+Usage:
+    python mock_groq_server.py --port 8765 --latency lognormal:0.6,0.5 --error-rate 0.01 --rate-limit-rate 0.05
+    GROQ_BASE_URL=http://127.0.0.1:8765 GROQ_API_KEY=mock python extract_data_ai.py
+"""
+
+import re
+import sys
+import json
+import math
+import time
+import random
+import hashlib
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Any, Callable, Dict, List
+
+from chunking import estimate_tokens
+from rate_limiter import TokenBucket
+
+
+COMPLETIONS_PATH = '/openai/v1/chat/completions'
+MODELS_PATH = '/openai/v1/models'
+
+_PROPER_NOUN = re.compile(r'\b[A-Z][a-z]+(?:\s+(?:of\s+)?[A-Z][a-z]+)+')
+_DATE = re.compile(r'\b(?:January|February|March|April|May|June|July|August|September|October|November|December)'
+                   r'\s+\d{1,2},\s+\d{4}\b|\b\d{4}-\d{2}-\d{2}\b')
+_AMOUNT = re.compile(r'\b\d[\d,]*(?:\.\d+)?\s*(?:%|INR|USD|EUR|points|out of \d+)')
+_DOCUMENT_TYPES = [('invoice', 'Sales Invoice'), ('contract', 'Legal Contract'), ('agreement', 'Legal Contract'),
+                   ('report', 'Technical Report'), ('born', 'Personal Resume'), ('experience', 'Personal Resume')]
+_WORD = re.compile(r'\S+\s*')
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    Latency sampler from a spec: '0.3' (fixed), 'uniform:a,b', 'normal:mean,sd',
+    'lognormal:median,sigma' or 'exponential:mean'; all in seconds
+    """
+    kind, _, args = spec.partition(':')
+    if not args:
+        fixed = float(kind)
+        return lambda rng: fixed
+    params = [float(value) for value in args.split(',')]
+    if kind == 'uniform':
+        return lambda rng: rng.uniform(params[0], params[1])
+    if kind == 'normal':
+        return lambda rng: max(0.0, rng.gauss(params[0], params[1]))
+    if kind == 'lognormal':
+        return lambda rng: rng.lognormvariate(math.log(params[0]), params[1])
+    if kind == 'exponential':
+        return lambda rng: rng.expovariate(1.0 / params[0])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def mock_completion(prompt: str) -> str:
+    """
+    Deterministic answer: a document type for classification prompts, else a JSON extraction payload
+    (wrapped with a document_type when the prompt asks for one)
+    """
+    document = prompt.split('Document text:', 1)[-1].split('Instructions:', 1)[0].split('Respond with', 1)[0]
+    lowered = document.lower()
+    doc_type = next((label for word, label in _DOCUMENT_TYPES if word in lowered), 'General Document')
+    if 'identify its type' in prompt:
+        return doc_type
+
+    entries = []
+    for category, key, pattern in (('Entities', 'Name', _PROPER_NOUN), ('Dates', 'Date', _DATE),
+                                   ('Numerical Data', 'Amount', _AMOUNT)):
+        for i, value in enumerate(dict.fromkeys(pattern.findall(document))):
+            entries.append({'Category': category, 'Key': f'{key} {i + 1}', 'Value': value,
+                            'Comments': 'Mock extraction'})
+    if '"document_type"' in prompt:
+        return json.dumps({'document_type': doc_type, 'entries': entries[:60]}, indent=2)
+    return json.dumps(entries[:60], indent=2)
+
+
+class MockGroqServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the fault-injection settings, the TPM budget and counters"""
+
+    daemon_threads = True
+
+    def __init__(self, address, latency: str = '0.05', error_rate: float = 0.0, rate_limit_rate: float = 0.0,
+                 retry_after: float = 1.0, tpm: int = 0, tokens_per_second: float = 0.0, seed: int = 0):
+        super().__init__(address, _Handler)
+        self.latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.tokens_per_second = tokens_per_second
+        self.tpm = tpm
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.reset(exhausted=False)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset(self, exhausted: bool = False):
+        """Clear counters and refill (or drain) the TPM budget"""
+        with self.lock:
+            self.bucket = TokenBucket(self.tpm) if self.tpm > 0 else None
+            if self.bucket is not None and exhausted:
+                self.bucket.level = 0.0
+            self.stats = {'requests': 0, 'completed': 0, 'rate_limited': 0, 'errors': 0,
+                          'connections': 0, 'tokens': 0}
+
+    def count(self, name: str, amount: int = 1):
+        with self.lock:
+            self.stats[name] += amount
+
+    def decide(self, cost: int) -> Dict[str, Any]:
+        """Outcome of one request: injected error, injected or budget 429, or success with its latency"""
+        with self.lock:
+            self.stats['requests'] += 1
+            roll = self.rng.random()
+            latency = self.latency(self.rng)
+            headers = {}
+            if self.bucket is not None:
+                now = time.monotonic()
+                wait = self.bucket.wait_time(cost, now)
+                if wait == 0 and roll >= self.error_rate + self.rate_limit_rate:
+                    self.bucket.take(cost, now)
+                headers = {
+                    'x-ratelimit-limit-tokens': str(self.tpm),
+                    'x-ratelimit-remaining-tokens': str(max(0, int(self.bucket.level))),
+                    'x-ratelimit-reset-tokens': f"{(self.bucket.capacity - self.bucket.level) / self.bucket.rate:.2f}s"
+                }
+                if wait > 0:
+                    self.stats['rate_limited'] += 1
+                    return {'status': 429, 'retry_after': max(0.01, wait), 'headers': headers}
+
+        if roll < self.error_rate:
+            self.count('errors')
+            return {'status': self.rng.choice([500, 503]), 'latency': latency, 'headers': headers}
+        if roll < self.error_rate + self.rate_limit_rate:
+            self.count('rate_limited')
+            return {'status': 429, 'retry_after': self.retry_after, 'headers': headers}
+        return {'status': 200, 'latency': latency, 'headers': headers}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server: MockGroqServer
+
+    def setup(self):
+        super().setup()
+        self.server.count('connections')
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Dict[str, str] = None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip('/') == MODELS_PATH:
+            self._send_json(200, {'object': 'list', 'data': [{'id': 'llama-3.3-70b-versatile', 'object': 'model'}]})
+        else:
+            self._send_json(404, {'error': {'message': 'Not found'}})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length) or b'{}')
+        if self.path.rstrip('/') != COMPLETIONS_PATH:
+            self._send_json(404, {'error': {'message': 'Not found'}})
+            return
+
+        prompt = "\n".join(str(message.get('content', '')) for message in body.get('messages', []))
+        content = mock_completion(prompt)
+        prompt_tokens = estimate_tokens(prompt)
+        completion_tokens = estimate_tokens(content)
+        outcome = self.server.decide(prompt_tokens + completion_tokens)
+
+        if outcome['status'] == 429:
+            headers = dict(outcome['headers'], **{'retry-after': f"{outcome['retry_after']:.2f}"})
+            self._send_json(429, {'error': {'message': 'Rate limit reached (mock)', 'type': 'tokens',
+                                            'code': 'rate_limit_exceeded'}}, headers)
+            return
+        time.sleep(outcome['latency'])
+        if outcome['status'] != 200:
+            self._send_json(outcome['status'], {'error': {'message': 'Injected server error (mock)',
+                                                          'type': 'internal_server_error'}}, outcome['headers'])
+            return
+
+        usage = {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+                 'total_tokens': prompt_tokens + completion_tokens}
+        completion_id = 'chatcmpl-' + hashlib.sha1(prompt.encode('utf-8')).hexdigest()[:24]
+        model = body.get('model', 'llama-3.3-70b-versatile')
+
+        if body.get('stream'):
+            self._stream(completion_id, model, content, usage, outcome['headers'])
+        else:
+            if self.server.tokens_per_second:
+                time.sleep(completion_tokens / self.server.tokens_per_second)
+            self._send_json(200, {
+                'id': completion_id, 'object': 'chat.completion', 'created': int(time.time()), 'model': model,
+                'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content},
+                             'finish_reason': 'stop'}],
+                'usage': usage
+            }, outcome['headers'])
+        self.server.count('completed')
+        self.server.count('tokens', usage['total_tokens'])
+
+    def _stream(self, completion_id: str, model: str, content: str, usage: Dict[str, int],
+                headers: Dict[str, str]):
+        """Server-sent chat.completion.chunk events, paced at tokens_per_second"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.close_connection = True
+
+        def event(delta: Dict[str, Any], finish_reason: str = None, extra: Dict[str, Any] = None):
+            chunk = {'id': completion_id, 'object': 'chat.completion.chunk', 'created': int(time.time()),
+                     'model': model, 'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}]}
+            chunk.update(extra or {})
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+
+        event({'role': 'assistant', 'content': ''})
+        for piece in _WORD.findall(content):
+            if self.server.tokens_per_second:
+                time.sleep(estimate_tokens(piece) / self.server.tokens_per_second)
+            event({'content': piece})
+        event({}, 'stop', {'x_groq': {'usage': usage}})
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+def start_mock_server(host: str = '127.0.0.1', port: int = 0, **settings) -> MockGroqServer:
+    """Start a mock server on a background thread (port 0 picks a free port); see MockGroqServer for settings"""
+    server = MockGroqServer((host, port), **settings)
+    threading.Thread(target=server.serve_forever, daemon=True, name='mock-groq').start()
+    return server
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Local mock of the Groq chat-completions API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', default='0.05',
+                        help="seconds, or uniform:a,b | normal:mean,sd | lognormal:median,sigma | exponential:mean")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of requests answered 500/503")
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help="fraction of requests answered 429")
+    parser.add_argument('--retry-after', type=float, default=1.0, help="retry-after seconds on injected 429s")
+    parser.add_argument('--tpm', type=int, default=0, help="enforced tokens-per-minute budget (0 = unlimited)")
+    parser.add_argument('--tokens-per-second', type=float, default=0.0, help="generation speed (0 = instant)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    server = MockGroqServer((args.host, args.port), latency=args.latency, error_rate=args.error_rate,
+                            rate_limit_rate=args.rate_limit_rate, retry_after=args.retry_after, tpm=args.tpm,
+                            tokens_per_second=args.tokens_per_second, seed=args.seed)
+    print(f"🧪 Mock Groq API on {server.base_url} (set GROQ_BASE_URL to use it)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\n✓ {server.stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""
+Shared PDF Text Extraction Engine
+Splits page ranges across a process pool for large documents, serial for small ones
+"""
+
+import os
+import re
+import multiprocessing
+import PyPDF2
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Tuple
+from metrics import timed
+
+
+# Below this many pages the process pool start-up costs more than it saves (measured: no gain up to ~100 pages)
+PARALLEL_PAGE_THRESHOLD = int(os.environ.get("PDF_PARALLEL_PAGE_THRESHOLD", "200"))
+
+# End of a sentence: terminal punctuation, optional closing quote/bracket, then whitespace
+_SENTENCE_END = re.compile(r'[.!?]["\')\]]?\s+')
+
+
+def _default_workers() -> int:
+    return int(os.environ.get("PDF_EXTRACT_WORKERS", "0")) or os.cpu_count() or 1
+
+
+def _extract_page_range(args: Tuple[str, int, int]) -> List[str]:
+    """Worker: decode pages [start, end) of a PDF (runs in a child process)"""
+    pdf_path, start, end = args
+    with open(pdf_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        return [pdf_reader.pages[i].extract_text() or "" for i in range(start, end)]
+
+
+def _page_ranges(page_count: int, parts: int) -> List[Tuple[int, int]]:
+    """Split [0, page_count) into at most `parts` contiguous, near-equal ranges"""
+    parts = max(1, min(parts, page_count))
+    size, extra = divmod(page_count, parts)
+    ranges = []
+    start = 0
+    for i in range(parts):
+        end = start + size + (1 if i < extra else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def count_pdf_pages(pdf_path: str) -> int:
+    """Number of pages in a PDF"""
+    with open(pdf_path, 'rb') as file:
+        return len(PyPDF2.PdfReader(file).pages)
+
+
+def extract_pdf_pages(pdf_path: str, workers: int = None,
+                      parallel_threshold: int = None) -> List[str]:
+    """Extract text of every page, in page order"""
+    with timed('pdf_parse'):
+        return _extract_pdf_pages(pdf_path, workers, parallel_threshold)
+
+
+def _extract_pdf_pages(pdf_path: str, workers: int, parallel_threshold: int) -> List[str]:
+    workers = workers or _default_workers()
+    if parallel_threshold is None:
+        parallel_threshold = PARALLEL_PAGE_THRESHOLD
+
+    with open(pdf_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        page_count = len(pdf_reader.pages)
+
+        # Small files: decode in-process, the reader is already open
+        if workers <= 1 or page_count < parallel_threshold:
+            return [page.extract_text() or "" for page in pdf_reader.pages]
+
+    # Several ranges per worker keeps the pool busy when pages differ in cost
+    ranges = _page_ranges(page_count, workers * 4)
+    # Spawned, not forked: callers run in threaded web workers, and a fork would copy their held locks
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges)),
+                             mp_context=multiprocessing.get_context('spawn')) as executor:
+        results = executor.map(_extract_page_range, [(pdf_path, start, end) for start, end in ranges])
+        pages = []
+        for page_texts in results:
+            pages.extend(page_texts)
+    return pages
+
+
+def extract_pdf_text(pdf_path: str, workers: int = None, parallel_threshold: int = None) -> str:
+    """Extract the full text of a PDF as a single string"""
+    return "".join(extract_pdf_pages(pdf_path, workers=workers, parallel_threshold=parallel_threshold))
+
+
+def iter_pdf_pages(pdf_path: str) -> Iterator[str]:
+    """Yield the text of each page as soon as it is decoded"""
+    with open(pdf_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        for page in pdf_reader.pages:
+            yield page.extract_text() or ""
+
+
+def _block_cut(text: str, target: int) -> int:
+    """Index at which to end a block: the last sentence end before target, else target"""
+    cut = None
+    for match in _SENTENCE_END.finditer(text, target // 2, target):
+        cut = match.end()
+    return cut or target
+
+
+def iter_text_blocks(pages: Iterable[str], block_size: int = 2000) -> Iterator[str]:
+    """Regroup a page stream into blocks of about block_size characters ending on sentence boundaries"""
+    buffer = []
+    size = 0
+    for page in pages:
+        buffer.append(page)
+        size += len(page)
+        if size < block_size:
+            continue
+
+        text = "".join(buffer)
+        start = 0
+        while len(text) - start >= block_size:
+            cut = start + _block_cut(text[start:start + block_size], block_size)
+            yield text[start:cut]
+            start = cut
+        buffer = [text[start:]]
+        size = len(buffer[0])
+
+    if size:
+        yield "".join(buffer)
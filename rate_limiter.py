@@ -0,0 +1,288 @@
+"""
+Groq Rate-Limit Scheduler
+Shares request and token budgets between all in-flight jobs, with fair queuing, adaptive backoff and a circuit breaker
+"""
+
+import os
+import re
+import time
+import random
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Callable, Mapping, Optional
+
+from groq import APIConnectionError, APIStatusError, RateLimitError
+
+from metrics import METRICS, timed
+
+
+_DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+_UNIT_SECONDS = {'h': 3600.0, 'm': 60.0, 's': 1.0, 'ms': 0.001}
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Seconds from a rate-limit header value: '7.66s', '2m59.56s', '120ms' or a bare number"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _UNIT_SECONDS[unit] for amount, unit in parts)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling the API while repeated server failures have the circuit open"""
+
+
+class TokenBucket:
+    """Continuously refilling budget of `per_minute` units; may go into debt when usage exceeds estimates"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` can be taken (amounts above capacity only need a full bucket)"""
+        self._refill(now)
+        needed = min(amount, self.capacity) - self.level
+        return max(0.0, needed / self.rate)
+
+    def take(self, amount: float, now: float):
+        self._refill(now)
+        self.level -= amount
+
+    def observe_remaining(self, remaining: float, now: float):
+        """The provider's view of the remaining budget wins when it is lower than ours"""
+        self._refill(now)
+        self.level = min(self.level, remaining)
+
+
+class _Ticket:
+    __slots__ = ('job', 'tokens', 'granted')
+
+    def __init__(self, job: str, tokens: int):
+        self.job = job
+        self.tokens = tokens
+        self.granted = False
+
+
+class RateLimitScheduler:
+    """
+    Admits API calls within requests-per-minute and tokens-per-minute budgets
+    Waiting calls are served round-robin across jobs, so one large document cannot starve the others
+    """
+
+    def __init__(self, rpm: int = 30, tpm: int = 12000, max_retries: int = 8, base_delay: float = 1.0,
+                 max_delay: float = 60.0, failure_threshold: int = 5, cooldown: float = 30.0):
+        self.requests = TokenBucket(rpm) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm) if tpm > 0 else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+
+        self._cond = threading.Condition()
+        self._queues: "OrderedDict[str, deque]" = OrderedDict()
+        self._paused_until = 0.0
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self.stats = {'calls': 0, 'rate_limited': 0, 'retries': 0, 'failures': 0, 'waited_seconds': 0.0}
+
+    # -- admission -----------------------------------------------------------------
+
+    def _budget_wait(self, tokens: int, now: float) -> float:
+        wait = self._paused_until - now
+        if self.requests is not None:
+            wait = max(wait, self.requests.wait_time(1, now))
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.wait_time(tokens, now))
+        return max(0.0, wait)
+
+    def _dispatch(self) -> float:
+        """Grant queued tickets round-robin while the budget allows; returns how long until the next grant"""
+        while self._queues:
+            job, queue = next(iter(self._queues.items()))
+            ticket = queue[0]
+            now = time.monotonic()
+            wait = self._budget_wait(ticket.tokens, now)
+            if wait > 0:
+                return wait
+
+            if self.requests is not None:
+                self.requests.take(1, now)
+            if self.tokens is not None:
+                self.tokens.take(ticket.tokens, now)
+            ticket.granted = True
+            queue.popleft()
+
+            # The served job goes to the back of the rotation
+            del self._queues[job]
+            if queue:
+                self._queues[job] = queue
+            self._cond.notify_all()
+        return 0.0
+
+    def _acquire(self, job: str, tokens: int):
+        ticket = _Ticket(job, tokens)
+        started = time.monotonic()
+        with self._cond:
+            self._queues.setdefault(job, deque()).append(ticket)
+            while not ticket.granted:
+                wait = self._dispatch()
+                if not ticket.granted:
+                    self._cond.wait(timeout=wait or None)
+            self.stats['waited_seconds'] += time.monotonic() - started
+
+    # -- circuit breaker -----------------------------------------------------------
+
+    def _check_circuit(self) -> bool:
+        """Raises while the circuit is open; True when this call is the single half-open probe"""
+        with self._cond:
+            if self._opened_at is None:
+                return False
+            if time.monotonic() - self._opened_at < self.cooldown or self._probing:
+                raise CircuitOpenError("Groq API is failing repeatedly; not sending requests for now")
+            # Half-open: let a single probe through
+            self._probing = True
+            return True
+
+    def _end_probe(self):
+        """A probe that ended without a verdict (e.g. an unexpected exception) frees the slot for the next one"""
+        with self._cond:
+            self._probing = False
+
+    def _record_success(self):
+        with self._cond:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def _record_failure(self, probe: bool = False):
+        with self._cond:
+            self._failures += 1
+            self.stats['failures'] += 1
+            if probe or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._probing = False
+                print(f"  ⚠️  Circuit opened after {self._failures} failures; pausing for {self.cooldown:.0f}s")
+
+    def _count(self, stat: str):
+        with self._cond:
+            self.stats[stat] += 1
+
+    # -- feedback from responses ---------------------------------------------------
+
+    def _observe_headers(self, headers: Mapping[str, str]):
+        """Align local budgets with the provider's x-ratelimit-* headers"""
+        now = time.monotonic()
+        with self._cond:
+            remaining_tokens = headers.get('x-ratelimit-remaining-tokens')
+            if remaining_tokens is not None and self.tokens is not None:
+                self.tokens.observe_remaining(float(remaining_tokens), now)
+
+            remaining_requests = headers.get('x-ratelimit-remaining-requests')
+            if remaining_requests is not None and float(remaining_requests) <= 0:
+                reset = parse_duration(headers.get('x-ratelimit-reset-requests'))
+                if reset:
+                    self._paused_until = max(self._paused_until, now + reset)
+
+    def _backoff(self, attempt: int, headers: Mapping[str, str] = None) -> float:
+        """Delay before retry `attempt`: the server's retry-after if given, else jittered exponential"""
+        retry_after = None
+        if headers is not None:
+            retry_after = parse_duration(headers.get('retry-after'))
+            if retry_after is None:
+                retry_after = parse_duration(headers.get('x-ratelimit-reset-tokens'))
+        if retry_after is not None:
+            return retry_after + random.uniform(0, self.base_delay / 4)
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(ceiling / 2, ceiling)
+
+    # -- public API ----------------------------------------------------------------
+
+    def call(self, job: str, tokens: int, request: Callable[[], Any]) -> Any:
+        """
+        Run request() once budgets allow, retrying rate limits and server errors
+        request must return a raw response (with .headers and .parse()); the parsed body is returned
+        """
+        attempt = 0
+        while True:
+            probe = self._check_circuit()
+            try:
+                with timed('llm_queue_wait'):
+                    self._acquire(job, tokens)
+                try:
+                    raw = request()
+                except RateLimitError as e:
+                    # A 429 is the provider pacing us, not an outage: pause everyone, do not trip the breaker
+                    METRICS.inc('llm_requests_total', outcome='rate_limited')
+                    self._count('rate_limited')
+                    self._observe_headers(e.response.headers)
+                    delay = self._backoff(attempt, e.response.headers)
+                    with self._cond:
+                        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+                except (APIConnectionError, APIStatusError) as e:
+                    status = getattr(e, 'status_code', None)
+                    if status is not None and status < 500:
+                        # The server answered, so it is up: a bad request closes the circuit like a success
+                        METRICS.inc('llm_requests_total', outcome='client_error')
+                        self._record_success()
+                        raise
+                    METRICS.inc('llm_requests_total', outcome='server_error')
+                    self._record_failure(probe)
+                    delay = self._backoff(attempt)
+                else:
+                    METRICS.inc('llm_requests_total', outcome='ok')
+                    self._observe_headers(raw.headers)
+                    self._record_success()
+                    self._count('calls')
+                    return self._settle(raw.parse(), tokens)
+            finally:
+                if probe:
+                    self._end_probe()
+
+            attempt += 1
+            if attempt > self.max_retries:
+                raise RuntimeError(f"Groq request still failing after {self.max_retries} retries")
+            self._count('retries')
+            time.sleep(delay)
+
+    def _settle(self, response: Any, reserved: int) -> Any:
+        """Charge the difference between the reserved estimate and the tokens actually used"""
+        usage = getattr(response, 'usage', None)
+        if usage is not None and self.tokens is not None:
+            with self._cond:
+                self.tokens.take(usage.total_tokens - reserved, time.monotonic())
+        return response
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_scheduler() -> RateLimitScheduler:
+    """Process-wide scheduler configured from GROQ_RPM / GROQ_TPM (0 disables a budget)"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = RateLimitScheduler(
+                rpm=int(os.environ.get("GROQ_RPM", "30")),
+                tpm=int(os.environ.get("GROQ_TPM", "12000")),
+                max_retries=int(os.environ.get("GROQ_SCHEDULER_RETRIES", "8")),
+                failure_threshold=int(os.environ.get("GROQ_BREAKER_THRESHOLD", "5")),
+                cooldown=float(os.environ.get("GROQ_BREAKER_COOLDOWN", "30"))
+            )
+        return _shared
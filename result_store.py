@@ -0,0 +1,78 @@
+"""
+Bounded Result Store
+Generated workbooks kept as SQLite blobs under unique ids, with TTL and total-size eviction
+"""
+
+import time
+import uuid
+import sqlite3
+import threading
+from typing import Optional
+
+
+class ResultStore:
+    """Holds finished Excel files for download; shared by every web worker through one SQLite file"""
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024, ttl_seconds: float = 3600):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS results (
+                    id TEXT PRIMARY KEY,
+                    data BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    created REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_results_created ON results(created)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def put(self, data: bytes) -> str:
+        """Store a result and return its id; expired and oldest results are evicted to stay in budget"""
+        result_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO results (id, data, size, created) VALUES (?, ?, ?, ?)",
+                (result_id, sqlite3.Binary(data), len(data), now)
+            )
+            self._evict(conn, now)
+        return result_id
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        conn.execute("DELETE FROM results WHERE created < ?", (now - self.ttl_seconds,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        doomed = []
+        for result_id, size in conn.execute("SELECT id, size FROM results ORDER BY created ASC"):
+            if total <= self.max_bytes:
+                break
+            doomed.append((result_id,))
+            total -= size
+        conn.executemany("DELETE FROM results WHERE id = ?", doomed)
+
+    def exists(self, result_id: str) -> bool:
+        """Whether get(result_id) would currently return data, without loading the blob"""
+        row = self._connect().execute("SELECT created FROM results WHERE id = ?", (result_id,)).fetchone()
+        return row is not None and time.time() - row[0] <= self.ttl_seconds
+
+    def get(self, result_id: str) -> Optional[bytes]:
+        """The stored bytes, or None if the id is unknown or has expired"""
+        row = self._connect().execute(
+            "SELECT data, created FROM results WHERE id = ?", (result_id,)
+        ).fetchone()
+        if row is None or time.time() - row[1] > self.ttl_seconds:
+            return None
+        return bytes(row[0])
@@ -0,0 +1,224 @@
+"""
+Declarative Rule Engine
+Compiles a table of extraction rules once and evaluates all of them in a single pass over the text
+"""
+
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from entries import Entry
+
+
+# How far before its literal anchor a rule's match may start (for patterns with a leading capture)
+LOOKBEHIND = 256
+
+# Regex escapes that match a character class rather than a literal character
+_CLASS_ESCAPES = set('sSdDwWbBAZ0123456789')
+
+
+class Rule(NamedTuple):
+    """One extraction rule; value and comment are str.format templates over the match groups ({1}, {2}, ...)"""
+    pattern: str
+    category: str
+    key: str
+    value: str
+    comment: str
+
+
+def _literal_anchor(pattern: str) -> Tuple[Optional[str], bool]:
+    """
+    Longest literal substring every match of `pattern` must contain
+    Returns (anchor, starts_pattern); anchor is None when no safe literal exists
+    """
+    if '|' in pattern:
+        return None, False
+
+    runs = []
+    current = []
+    current_start = 0
+    depth = 0
+    i = 0
+
+    def close_run():
+        if current:
+            runs.append((''.join(current), current_start))
+            current.clear()
+
+    while i < len(pattern):
+        ch = pattern[i]
+        literal = None
+
+        if ch == '\\' and i + 1 < len(pattern):
+            nxt = pattern[i + 1]
+            i += 2
+            if nxt in _CLASS_ESCAPES:
+                close_run()
+                continue
+            literal = nxt
+        elif ch == '(':
+            close_run()
+            depth += 1
+            i += 3 if pattern.startswith('(?:', i) else 1
+            continue
+        elif ch == ')':
+            close_run()
+            depth -= 1
+            i += 1
+            continue
+        elif ch == '[':
+            close_run()
+            i = pattern.index(']', i + 2) + 1
+            continue
+        elif ch in '.^$':
+            close_run()
+            i += 1
+            continue
+        elif ch == '{':
+            close_run()
+            i = pattern.index('}', i) + 1
+            continue
+        elif ch in '?*+':
+            close_run()
+            i += 1
+            continue
+        else:
+            literal = ch
+            i += 1
+
+        # A quantifier makes the preceding character optional or repeated
+        quantifier = pattern[i] if i < len(pattern) else ''
+        if quantifier and quantifier in '?*{':
+            close_run()
+            continue
+
+        # Only literals outside groups are guaranteed to appear as written
+        if depth == 0:
+            if not current:
+                current_start = i - (2 if ch == '\\' else 1)
+            current.append(literal)
+        else:
+            close_run()
+
+        if quantifier == '+':
+            close_run()
+
+    close_run()
+    if not runs:
+        return None, False
+
+    anchor, start = max(runs, key=lambda run: len(run[0]))
+    if len(anchor) < 3:
+        return None, False
+    return anchor, start == 0
+
+
+def _trie_regex(words: List[str]) -> str:
+    """Regex matching any of `words`, factored into a trie so matching cost is independent of word count"""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Greedy optional suffix: the longest anchor starting at a position wins
+        return '(?:' + body + ')?' if '' in node else body
+
+    return build(trie)
+
+
+class RuleSet:
+    """A compiled rule table evaluated with a single literal-anchor prefilter pass"""
+
+    def __init__(self, rules: List[Rule]):
+        self.rules = list(rules)
+
+        # Rules sharing a pattern share one compiled regex and one match
+        self._patterns = {}
+        self._anchors = {}
+        for rule in self.rules:
+            if rule.pattern not in self._patterns:
+                self._patterns[rule.pattern] = re.compile(rule.pattern)
+                self._anchors[rule.pattern] = _literal_anchor(rule.pattern)
+
+        anchors = sorted({anchor for anchor, _ in self._anchors.values() if anchor})
+        self._scanner = re.compile(_trie_regex(anchors)) if anchors else None
+
+        # The scanner reports the longest anchor at a position; shorter anchors it starts with occur there too
+        self._implied = {
+            anchor: [other for other in anchors if other != anchor and anchor.startswith(other)]
+            for anchor in anchors
+        }
+
+    def _resolve(self, text: str) -> Dict[str, Optional[re.Match]]:
+        """
+        Leftmost match of every pattern (equivalent to re.search), found in one pass over the text
+        The scanner walks anchor occurrences left to right and stops once every pattern is resolved
+        """
+        results = {}
+        pending = {}
+        for pattern, (anchor, _) in self._anchors.items():
+            if anchor is None:
+                results[pattern] = self._patterns[pattern].search(text)
+            else:
+                pending.setdefault(anchor, []).append(pattern)
+        remaining = sum(len(patterns) for patterns in pending.values())
+
+        search = self._scanner.search if self._scanner else None
+        hit = search(text) if remaining else None
+        while hit and remaining:
+            start = hit.start()
+            found = hit.group()
+            for anchor in [found] + self._implied[found]:
+                waiting = pending.get(anchor)
+                if not waiting:
+                    continue
+                unresolved = []
+                for pattern in waiting:
+                    regex = self._patterns[pattern]
+                    if self._anchors[pattern][1]:
+                        # Anchor opens the pattern: a match must start exactly here
+                        match = regex.match(text, start)
+                        if not match:
+                            unresolved.append(pattern)
+                            continue
+                    else:
+                        # Anchor sits inside the pattern: the match starts shortly before it
+                        match = regex.search(text, max(0, start - LOOKBEHIND))
+                    results[pattern] = match
+                    remaining -= 1
+                pending[anchor] = unresolved
+            hit = search(text, start + 1)
+
+        return results
+
+    def matches(self, text: str) -> List[Tuple[Rule, re.Match]]:
+        """Every rule that fires on text, with its match, in rule-table order"""
+        results = self._resolve(text)
+        fired = []
+        for rule in self.rules:
+            match = results.get(rule.pattern)
+            if match:
+                fired.append((rule, match))
+        return fired
+
+    @staticmethod
+    def build_entry(rule: Rule, match: re.Match) -> Entry:
+        """Render a fired rule into a Category/Key/Value/Comments entry"""
+        groups = (match.group(0),) + match.groups()
+        # Templates without placeholders are shared as-is instead of copied into every entry
+        return Entry(
+            rule.category,
+            rule.key,
+            rule.value.format(*groups) if '{' in rule.value else rule.value,
+            rule.comment.format(*groups) if '{' in rule.comment else rule.comment
+        )
+
+    def scan(self, text: str) -> List[Entry]:
+        """Evaluate the whole rule table against text"""
+        return [self.build_entry(rule, match) for rule, match in self.matches(text)]